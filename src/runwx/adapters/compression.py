@@ -0,0 +1,66 @@
+from __future__ import annotations
+
+import bz2
+import gzip
+import io
+import lzma
+from pathlib import Path
+from typing import IO
+
+COMPRESSION_SUFFIXES = (".gz", ".bz2", ".xz", ".zst")
+
+# read compressed streams in large chunks; the text layer then splits lines
+_READ_BUFFER = 1 << 20
+
+
+def compression_of(path: str | Path) -> str | None:
+    """Return the compression suffix of `path` (".gz", ".zst", ...) or None."""
+    suffix = Path(path).suffix.lower()
+    return suffix if suffix in COMPRESSION_SUFFIXES else None
+
+
+def strip_compression_suffix(path: str | Path) -> Path:
+    """runs.csv.gz -> runs.csv, so the data format can be read off the suffix."""
+    path = Path(path)
+    return path.with_suffix("") if compression_of(path) else path
+
+
+def _open_zstd(path: Path) -> IO[bytes]:
+    try:
+        import zstandard
+    except ImportError as e:
+        raise RuntimeError("Reading .zst files requires zstandard: pip install 'runwx[zstd]'") from e
+    fh = path.open("rb")
+    try:
+        return zstandard.ZstdDecompressor().stream_reader(fh, read_size=_READ_BUFFER, closefd=True)
+    except BaseException:
+        fh.close()
+        raise
+
+
+def open_text(path: str | Path, *, encoding: str = "utf-8", newline: str | None = None) -> IO[str]:
+    """
+    Open `path` for reading text, decompressing on the fly by extension.
+
+    .gz, .bz2, .xz and .zst (with the optional zstandard package) are
+    streamed in fixed-size chunks, never decompressed to disk or fully
+    into memory; anything else is opened as a plain text file.
+    """
+    path = Path(path)
+    kind = compression_of(path)
+
+    if kind is None:
+        return path.open("r", encoding=encoding, newline=newline)
+
+    raw: IO[bytes]
+    if kind == ".gz":
+        raw = gzip.GzipFile(path, "rb")
+    elif kind == ".bz2":
+        raw = bz2.BZ2File(path, "rb")
+    elif kind == ".xz":
+        raw = lzma.LZMAFile(path, "rb")
+    else:
+        raw = _open_zstd(path)
+
+    buffered = io.BufferedReader(raw, buffer_size=_READ_BUFFER)  # type: ignore[arg-type]
+    return io.TextIOWrapper(buffered, encoding=encoding, newline=newline)
@@ -5,6 +5,7 @@ from pathlib import Path
 
 from pydantic import ValidationError
 
+from runwx.adapters.compression import open_text
 from runwx.adapters.csv.schemas import RunIn
 from runwx.domain.models import Run
 
@@ -17,7 +18,7 @@ def load_runs_csv(path: str | Path) -> list[Run]:
     path = Path(path)
     runs: list[Run] = []
 
-    with path.open("r", encoding="utf-8", newline="") as f:
+    with open_text(path, newline="") as f:
         reader = csv.DictReader(f)
 
         required = {"started_at", "duration_s", "distance_m"}
@@ -0,0 +1,36 @@
+from __future__ import annotations
+
+import csv
+from pathlib import Path
+
+from pydantic import ValidationError
+
+from runwx.adapters.compression import open_text
+from runwx.adapters.csv.schemas import StationIn
+from runwx.domain.spatial import Station
+
+
+def load_stations_csv(path: str | Path) -> list[Station]:
+    """
+    Load weather stations / grid cells from a CSV file with columns:
+      key,latitude,longitude
+    """
+    path = Path(path)
+    stations: list[Station] = []
+
+    with open_text(path, newline="") as f:
+        reader = csv.DictReader(f)
+
+        required = {"key", "latitude", "longitude"}
+        missing = required - set(reader.fieldnames or [])
+        if missing:
+            raise ValueError(f"Missing station CSV columns: {sorted(missing)}")
+
+        for row_num, row in enumerate(reader, start=2):
+            try:
+                station = StationIn.model_validate(row).to_domain()
+                stations.append(station)
+            except ValidationError as e:
+                raise ValueError(f"Invalid stations CSV row {row_num}: {e}") from e
+
+    return stations
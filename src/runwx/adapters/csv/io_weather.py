@@ -5,6 +5,7 @@ from pathlib import Path
 
 from pydantic import ValidationError
 
+from runwx.adapters.compression import open_text
 from runwx.adapters.csv.schemas import WeatherObsIn
 from runwx.domain.models import WeatherObs
 
@@ -17,7 +18,7 @@ def load_weather_csv(path: str | Path) -> list[WeatherObs]:
     path = Path(path)
     observations: list[WeatherObs] = []
 
-    with path.open("r", encoding="utf-8", newline="") as f:
+    with open_text(path, newline="") as f:
         reader = csv.DictReader(f)
 
         required = {"observed_at", "temp_c", "wind_mps", "precipitation_mm", "humidity_pct"}
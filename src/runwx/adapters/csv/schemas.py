@@ -5,6 +5,13 @@ from datetime import datetime
 from pydantic import BaseModel, ConfigDict, Field, ValidationError, field_validator
 
 from runwx.domain.models import Run, WeatherObs
+from runwx.domain.spatial import Station
+
+
+def _empty_to_none(value):
+    if isinstance(value, str) and value.strip() == "":
+        return None
+    return value
 
 
 def _normalize_z_suffix(value):
@@ -19,6 +26,14 @@ class RunIn(BaseModel):
     started_at: datetime
     duration_s: int = Field(gt=0)
     distance_m: int = Field(gt=0)
+    location: str | None = None
+    latitude: float | None = Field(default=None, ge=-90, le=90)
+    longitude: float | None = Field(default=None, ge=-180, le=180)
+
+    @field_validator("location", "latitude", "longitude", mode="before")
+    @classmethod
+    def empty_optional_to_none(cls, value):
+        return _empty_to_none(value)
 
     @field_validator("started_at", mode="before")
     @classmethod
@@ -37,6 +52,9 @@ class RunIn(BaseModel):
             started_at=self.started_at,
             duration_s=self.duration_s,
             distance_m=self.distance_m,
+            location=self.location,
+            latitude=self.latitude,
+            longitude=self.longitude,
         )
 
 
@@ -48,6 +66,12 @@ class WeatherObsIn(BaseModel):
     wind_mps: float = Field(ge=0)
     precipitation_mm: float = Field(ge=0)
     humidity_pct: float = Field(ge=0, le=100)
+    location: str | None = None
+
+    @field_validator("location", mode="before")
+    @classmethod
+    def empty_location_to_none(cls, value):
+        return _empty_to_none(value)
 
     @field_validator("observed_at", mode="before")
     @classmethod
@@ -68,4 +92,16 @@ class WeatherObsIn(BaseModel):
             wind_mps=self.wind_mps,
             precipitation_mm=self.precipitation_mm,
             humidity_pct=self.humidity_pct,
+            location=self.location,
         )
+
+
+class StationIn(BaseModel):
+    model_config = ConfigDict(extra="forbid")
+
+    key: str = Field(min_length=1)
+    latitude: float = Field(ge=-90, le=90)
+    longitude: float = Field(ge=-180, le=180)
+
+    def to_domain(self) -> Station:
+        return Station(key=self.key, latitude=self.latitude, longitude=self.longitude)
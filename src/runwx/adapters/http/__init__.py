@@ -0,0 +1 @@
+"""Local HTTP / Unix socket server adapter for runwx."""
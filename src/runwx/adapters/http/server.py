@@ -0,0 +1,198 @@
+from __future__ import annotations
+
+import dataclasses
+import json
+import logging
+import os
+import socketserver
+import stat
+from datetime import datetime, timedelta
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Any, Callable, Dict, Optional, Tuple
+from urllib.parse import parse_qs, urlsplit
+
+from runwx.adapters.csv.io_common import parse_datetime_iso
+from runwx.adapters.csv.schemas import RunIn
+from runwx.adapters.sqlite.query_sqlite import EnrichedFilter
+from runwx.services.serve import WarmService
+
+logger = logging.getLogger("runwx.serve")
+
+_Params = Dict[str, list]
+_Route = Callable[[WarmService, _Params, Any], Any]
+
+# query string parameter -> (EnrichedFilter field, parser); names match the CLI options
+_FILTER_PARAMS: Dict[str, Tuple[str, Callable[[str], object]]] = {
+    "start": ("start", parse_datetime_iso),
+    "end": ("end", parse_datetime_iso),
+    "min_distance": ("min_distance_m", int),
+    "max_distance": ("max_distance_m", int),
+    "min_temp": ("min_temp_c", float),
+    "max_temp": ("max_temp_c", float),
+    "min_wind": ("min_wind_mps", float),
+    "max_wind": ("max_wind_mps", float),
+    "min_precip": ("min_precipitation_mm", float),
+    "max_precip": ("max_precipitation_mm", float),
+}
+
+
+def _param(params: _Params, name: str) -> Optional[str]:
+    values = params.get(name)
+    return values[-1] if values else None
+
+
+def _as_json(value: Any) -> Any:
+    if isinstance(value, datetime):
+        return value.isoformat()
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+def _health(service: WarmService, params: _Params, body: Any) -> dict:
+    return {"status": "ok", "db": service.conn is not None, "align": service.align}
+
+
+def _enrich(service: WarmService, params: _Params, body: Any) -> dict:
+    if not isinstance(body, dict) or not isinstance(body.get("runs"), list):
+        raise ValueError('Expected a JSON object with a "runs" list')
+
+    runs = [RunIn.model_validate(item).to_domain() for item in body["runs"]]
+    max_gap_min = body.get("max_gap_min")
+    result, created = service.enrich(
+        runs,
+        align=body.get("align"),
+        max_gap=None if max_gap_min is None else timedelta(minutes=int(max_gap_min)),
+        persist=bool(body.get("persist", False)),
+    )
+
+    payload = {
+        "enriched": [
+            {"run": dataclasses.asdict(item.run), "weather": dataclasses.asdict(item.weather)}
+            for item in result.enriched
+        ],
+        "skipped": [
+            {"run": dataclasses.asdict(s.run), "code": s.reason.code.name.lower(), "reason": str(s.reason)}
+            for s in result.skipped
+        ],
+    }
+    if created is not None:
+        payload["created"] = {"enriched": created[0], "skipped": created[1]}
+    return payload
+
+
+def _query(service: WarmService, params: _Params, body: Any) -> dict:
+    limit_text = _param(params, "limit")
+    limit = None if limit_text == "all" else int(limit_text or 20)
+
+    fields = {}
+    for name, (field, parse) in _FILTER_PARAMS.items():
+        value = _param(params, name)
+        if value is not None:
+            fields[field] = parse(value)
+
+    rows = service.query(limit=limit, where=EnrichedFilter(**fields))
+    return {"rows": [dataclasses.asdict(r) for r in rows]}
+
+
+def _aggregates(service: WarmService, params: _Params, body: Any) -> dict:
+    rows = service.aggregates(period=_param(params, "period") or "month", by=_param(params, "by") or "temp")
+    return {
+        "rows": [dict(dataclasses.asdict(a), avg_pace_s_per_km=a.avg_pace_s_per_km) for a in rows],
+    }
+
+
+ROUTES: Dict[Tuple[str, str], _Route] = {
+    ("GET", "/health"): _health,
+    ("POST", "/enrich"): _enrich,
+    ("GET", "/query"): _query,
+    ("GET", "/aggregates"): _aggregates,
+}
+
+
+class _Handler(BaseHTTPRequestHandler):
+    """JSON request handler shared by the TCP and Unix socket servers."""
+
+    protocol_version = "HTTP/1.1"
+    server: "_WarmServerMixin"
+
+    def do_GET(self) -> None:
+        self._dispatch("GET")
+
+    def do_POST(self) -> None:
+        self._dispatch("POST")
+
+    def _dispatch(self, method: str) -> None:
+        url = urlsplit(self.path)
+        route = ROUTES.get((method, url.path))
+        if route is None:
+            self._send(404, {"error": f"No route for {method} {url.path}"})
+            return
+
+        try:
+            body = None
+            if method == "POST":
+                length = int(self.headers.get("Content-Length") or 0)
+                body = json.loads(self.rfile.read(length) or b"null")
+            self._send(200, route(self.server.service, parse_qs(url.query), body))
+        except ValueError as e:  # includes JSON decode and pydantic validation errors
+            self._send(400, {"error": f"{type(e).__name__}: {e}"})
+        except Exception as e:
+            logger.exception("Request %s %s failed", method, self.path)
+            self._send(500, {"error": f"{type(e).__name__}: {e}"})
+
+    def _send(self, status: int, payload: Any) -> None:
+        data = json.dumps(payload, default=_as_json).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def address_string(self) -> str:
+        # Unix socket peers have no (host, port) address
+        return self.client_address[0] if isinstance(self.client_address, tuple) else "unix"
+
+    def log_message(self, format: str, *args: Any) -> None:
+        logger.debug("%s %s", self.address_string(), format % args)
+
+
+class _WarmServerMixin:
+    service: WarmService
+
+
+class WarmHTTPServer(_WarmServerMixin, ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, address: Tuple[str, int], service: WarmService) -> None:
+        self.service = service
+        super().__init__(address, _Handler)
+
+
+class WarmUnixServer(_WarmServerMixin, socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    daemon_threads = True
+
+    def __init__(self, path: Path, service: WarmService) -> None:
+        self.service = service
+        if path.exists() and stat.S_ISSOCK(path.stat().st_mode):
+            path.unlink()  # stale socket from a previous server
+        super().__init__(str(path), _Handler)
+
+    def server_close(self) -> None:
+        super().server_close()
+        try:
+            os.unlink(self.server_address)
+        except FileNotFoundError:
+            pass
+
+
+def make_server(
+    service: WarmService,
+    *,
+    host: str = "127.0.0.1",
+    port: int = 8765,
+    socket_path: Path | None = None,
+) -> socketserver.BaseServer:
+    """HTTP over a Unix socket when socket_path is given, else over TCP host:port."""
+    if socket_path is not None:
+        return WarmUnixServer(socket_path, service)
+    return WarmHTTPServer((host, port), service)
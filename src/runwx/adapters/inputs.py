@@ -0,0 +1,125 @@
+from __future__ import annotations
+
+import glob
+import heapq
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Callable, Sequence, TypeVar
+
+from runwx.adapters.compression import compression_of, strip_compression_suffix
+from runwx.domain.align import WeatherIndex
+from runwx.domain.models import Run, WeatherObs
+
+INPUT_FORMAT_SUFFIXES = {".csv": "csv", ".jsonl": "jsonl", ".ndjson": "jsonl", ".parquet": "parquet"}
+
+T = TypeVar("T")
+
+
+def input_format(path: Path, explicit: str | None = None) -> str:
+    """
+    Explicit format wins; else infer from the suffix, ignoring a compression
+    suffix (runs.jsonl.gz is jsonl). "-" is jsonl on stdin, unknown is csv.
+    Only csv and jsonl are decompressed: parquet.gz and friends are rejected.
+    """
+    if str(path) == "-" and explicit is None:
+        return "jsonl"
+    fmt = explicit or INPUT_FORMAT_SUFFIXES.get(strip_compression_suffix(path).suffix.lower(), "csv")
+    if fmt == "parquet" and compression_of(path):
+        # pyarrow reads parquet files, not compressed streams of them
+        raise ValueError(f"Compressed parquet is not supported: {path} (parquet compresses its own columns; store it uncompressed)")
+    return fmt
+
+
+def expand_inputs(spec: str | Path) -> list[Path]:
+    """
+    Resolve an input argument to the files it names, in sorted order:
+      - a directory: every csv/jsonl/parquet file in it (compressed or not),
+      - a glob pattern (data/runs-2026-*.csv.gz),
+      - anything else (including "-") as a single path.
+    Compressed parquet files are rejected here, before any file is read.
+    """
+    text = str(spec)
+    path = Path(spec)
+    files: list[Path]
+
+    if path.is_dir():
+        files = [
+            p for p in path.iterdir()
+            if p.is_file() and strip_compression_suffix(p).suffix.lower() in INPUT_FORMAT_SUFFIXES
+        ]
+    elif glob.has_magic(text):
+        files = [Path(p) for p in glob.glob(text) if Path(p).is_file()]
+    else:
+        files = [path]
+
+    if not files:
+        raise ValueError(f"No input files match {text!r}")
+    for p in files:
+        input_format(p)
+    return sorted(files)
+
+
+def load_runs_file(path: Path, fmt: str) -> list[Run]:
+    if fmt == "csv":
+        from runwx.adapters.csv.io_runs import load_runs_csv
+        return load_runs_csv(path)
+    if fmt == "jsonl":
+        from runwx.adapters.jsonl.io_jsonl import load_runs_jsonl
+        return load_runs_jsonl(path)
+    if fmt == "parquet":
+        from runwx.adapters.parquet.io_parquet import load_runs_parquet
+        return load_runs_parquet(path)
+    raise ValueError(f"Unknown input format: {fmt!r}")
+
+
+def load_weather_file(path: Path, fmt: str) -> list[WeatherObs]:
+    if fmt == "csv":
+        from runwx.adapters.csv.io_weather import load_weather_csv
+        return load_weather_csv(path)
+    if fmt == "jsonl":
+        from runwx.adapters.jsonl.io_jsonl import load_weather_jsonl
+        return load_weather_jsonl(path)
+    if fmt == "parquet":
+        from runwx.adapters.parquet.io_parquet import load_weather_parquet
+        return load_weather_parquet(path)
+    raise ValueError(f"Unknown input format: {fmt!r}")
+
+
+def _sorted_weather_file(path: Path, fmt: str) -> list[WeatherObs]:
+    # sort inside the worker so the parent only has to merge
+    return sorted(load_weather_file(path, fmt), key=lambda obs: obs.observed_at)
+
+
+def _map_files(
+    load: Callable[[Path, str], list[T]],
+    paths: Sequence[Path],
+    fmt: str | None,
+    workers: int,
+) -> list[list[T]]:
+    formats = [input_format(p, fmt) for p in paths]
+    if workers <= 1 or len(paths) <= 1:
+        return [load(p, f) for p, f in zip(paths, formats)]
+
+    with ProcessPoolExecutor(max_workers=min(workers, len(paths))) as pool:
+        return list(pool.map(load, paths, formats))
+
+
+def load_runs_files(paths: Sequence[Path], *, fmt: str | None = None, workers: int = 1) -> list[Run]:
+    """Parse run files (in parallel with workers > 1) and concatenate them in path order."""
+    return [run for chunk in _map_files(load_runs_file, paths, fmt, workers) for run in chunk]
+
+
+def load_weather_index_files(paths: Sequence[Path], *, fmt: str | None = None, workers: int = 1) -> WeatherIndex:
+    """
+    Parse weather files (in parallel with workers > 1), sort each in its
+    worker and k-way merge the sorted chunks into one WeatherIndex.
+
+    Equal timestamps keep path order, matching build_weather_index over
+    the concatenated files.
+    """
+    chunks = _map_files(_sorted_weather_file, paths, fmt, workers)
+    observations = tuple(heapq.merge(*chunks, key=lambda obs: obs.observed_at))
+    return WeatherIndex(
+        observed_at=tuple(obs.observed_at for obs in observations),
+        observations=observations,
+    )
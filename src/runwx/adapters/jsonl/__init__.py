@@ -0,0 +1 @@
+"""Newline-delimited JSON input/output adapters for runwx."""
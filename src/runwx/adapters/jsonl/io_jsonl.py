@@ -0,0 +1,127 @@
+from __future__ import annotations
+
+import dataclasses
+import json
+import sys
+from contextlib import nullcontext
+from datetime import datetime
+from pathlib import Path
+from typing import IO, Any, ContextManager, Iterator, List, TextIO, Union
+
+from pydantic import BaseModel, TypeAdapter, ValidationError
+
+from runwx.adapters.compression import open_text
+from runwx.adapters.csv.schemas import RunIn, WeatherObsIn
+from runwx.domain.models import Run, WeatherObs
+from runwx.services.pipeline import PipelineResult
+
+# a path, "-" for stdin, or an already open text stream
+JsonlSource = Union[str, Path, TextIO]
+
+DEFAULT_BATCH_SIZE = 1000
+
+_RUNS = TypeAdapter(List[RunIn])
+_WEATHER = TypeAdapter(List[WeatherObsIn])
+
+
+def _open_source(source: JsonlSource) -> ContextManager[IO[str]]:
+    if isinstance(source, (str, Path)):
+        if str(source) == "-":
+            return nullcontext(sys.stdin)
+        return open_text(source)
+    return nullcontext(source)
+
+
+def _validate(adapter: TypeAdapter, records: list, line_nos: list[int], what: str) -> list:
+    try:
+        models: list[BaseModel] = adapter.validate_python(records)
+    except ValidationError as e:
+        first = e.errors()[0]["loc"][0]
+        line = line_nos[first] if isinstance(first, int) else line_nos[0]
+        raise ValueError(f"Invalid {what} JSONL line {line}: {e}") from e
+
+    out = []
+    for model, line in zip(models, line_nos):
+        try:
+            out.append(model.to_domain())  # type: ignore[attr-defined]
+        except ValueError as e:
+            raise ValueError(f"Invalid {what} JSONL line {line}: {e}") from e
+    return out
+
+
+def _iter_jsonl(source: JsonlSource, adapter: TypeAdapter, what: str, batch_size: int) -> Iterator[list]:
+    with _open_source(source) as f:
+        records: list[Any] = []
+        line_nos: list[int] = []
+        for line_no, line in enumerate(f, start=1):
+            if not line.strip():
+                continue
+            try:
+                records.append(json.loads(line))
+            except json.JSONDecodeError as e:
+                raise ValueError(f"Invalid {what} JSONL line {line_no}: {e}") from e
+            line_nos.append(line_no)
+
+            if len(records) >= batch_size:
+                yield _validate(adapter, records, line_nos, what)
+                records, line_nos = [], []
+
+        if records:
+            yield _validate(adapter, records, line_nos, what)
+
+
+def iter_runs_jsonl(source: JsonlSource, *, batch_size: int = DEFAULT_BATCH_SIZE) -> Iterator[list[Run]]:
+    """
+    Stream runs from newline-delimited JSON, one object per line with keys:
+      started_at,duration_s,distance_m[,location,latitude,longitude]
+
+    Lines are parsed one at a time and validated batch_size at a time, so
+    memory stays bounded by the batch regardless of input size.
+    """
+    return _iter_jsonl(source, _RUNS, "runs", batch_size)
+
+
+def iter_weather_jsonl(source: JsonlSource, *, batch_size: int = DEFAULT_BATCH_SIZE) -> Iterator[list[WeatherObs]]:
+    """
+    Stream weather observations from newline-delimited JSON with keys:
+      observed_at,temp_c,wind_mps,precipitation_mm,humidity_pct[,location]
+    """
+    return _iter_jsonl(source, _WEATHER, "weather", batch_size)
+
+
+def load_runs_jsonl(source: JsonlSource) -> list[Run]:
+    return [run for batch in iter_runs_jsonl(source) for run in batch]
+
+
+def load_weather_jsonl(source: JsonlSource) -> list[WeatherObs]:
+    return [obs for batch in iter_weather_jsonl(source) for obs in batch]
+
+
+def _default(value: Any) -> Any:
+    if isinstance(value, datetime):
+        return value.isoformat()
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+def write_pipeline_jsonl(result: PipelineResult, stream: TextIO) -> int:
+    """
+    Write one JSON object per run: enriched runs as
+    {"status": "enriched", "run": {...}, "weather": {...}} and skipped runs as
+    {"status": "skipped", "run": {...}, "code": "no_weather_in_gap", "reason": "..."}.
+    Returns lines written.
+    """
+    count = 0
+    for item in result.enriched:
+        record = {"status": "enriched", "run": dataclasses.asdict(item.run), "weather": dataclasses.asdict(item.weather)}
+        stream.write(json.dumps(record, default=_default) + "\n")
+        count += 1
+    for skipped in result.skipped:
+        record = {
+            "status": "skipped",
+            "run": dataclasses.asdict(skipped.run),
+            "code": skipped.reason.code.name.lower(),
+            "reason": str(skipped.reason),
+        }
+        stream.write(json.dumps(record, default=_default) + "\n")
+        count += 1
+    return count
@@ -0,0 +1 @@
+"""Parquet / Arrow input/output adapters for runwx (optional, needs pyarrow)."""
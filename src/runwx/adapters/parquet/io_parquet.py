@@ -0,0 +1,284 @@
+from __future__ import annotations
+
+from datetime import timezone
+from pathlib import Path
+from typing import Any, Callable, Iterable, Iterator, Sequence, TypeVar
+
+from runwx.adapters.csv.io_common import parse_datetime_iso
+from runwx.adapters.sqlite.query_sqlite import EnrichedRow
+from runwx.domain.align import WeatherIndex, build_weather_index
+from runwx.domain.models import Run, WeatherObs
+
+RUN_COLUMNS = ("started_at", "duration_s", "distance_m")
+RUN_OPTIONAL_COLUMNS = ("location", "latitude", "longitude")
+WEATHER_COLUMNS = ("observed_at", "temp_c", "wind_mps", "precipitation_mm", "humidity_pct")
+WEATHER_OPTIONAL_COLUMNS = ("location",)
+
+DEFAULT_BATCH_SIZE = 65_536
+
+T = TypeVar("T")
+
+
+def _pyarrow():
+    """Import pyarrow lazily so the rest of runwx works without it."""
+    try:
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+    except ImportError as e:
+        raise RuntimeError("Parquet support requires pyarrow: pip install 'runwx[parquet]'") from e
+    return pa, pq
+
+
+def _projection(schema_names: Sequence[str], required: Sequence[str], optional: Sequence[str], what: str) -> list[str]:
+    missing = set(required) - set(schema_names)
+    if missing:
+        raise ValueError(f"Missing {what} Parquet columns: {sorted(missing)}")
+    return list(required) + [c for c in optional if c in schema_names]
+
+
+def _time_column(column: Any, name: str) -> list:
+    """Timestamps must be tz-aware; ISO-8601 strings are parsed like the CSV loaders do."""
+    pa, _ = _pyarrow()
+    if pa.types.is_timestamp(column.type):
+        if column.type.tz is None:
+            raise ValueError(f"Parquet column {name!r} must be a timezone-aware timestamp")
+        return column.to_pylist()
+    if pa.types.is_string(column.type) or pa.types.is_large_string(column.type):
+        return [None if v is None else parse_datetime_iso(v) for v in column.to_pylist()]
+    raise ValueError(f"Parquet column {name!r} must be a timestamp or ISO-8601 string, not {column.type}")
+
+
+def _domain_batches(
+    batches: Iterable[Any],
+    *,
+    columns: Sequence[str],
+    required: Sequence[str],
+    time_column: str,
+    what: str,
+    build: Callable[..., T],
+) -> Iterator[list[T]]:
+    """Turn Arrow record batches into lists of domain objects, column by column."""
+    first_row = 1
+    for batch in batches:
+        for name in required:
+            if batch.column(name).null_count:
+                raise ValueError(f"Parquet column {name!r} has nulls in {what} rows {first_row}..{first_row + batch.num_rows - 1}")
+
+        values = {name: batch.column(name).to_pylist() for name in columns if name != time_column}
+        values[time_column] = _time_column(batch.column(time_column), time_column)
+        names = list(values)
+
+        items: list[T] = []
+        for i, row in enumerate(zip(*values.values())):
+            try:
+                items.append(build(**dict(zip(names, row))))
+            except (TypeError, ValueError) as e:
+                raise ValueError(f"Invalid {what} Parquet row {first_row + i}: {e}") from e
+        yield items
+        first_row += batch.num_rows
+
+
+def _iter_file(
+    path: str | Path,
+    *,
+    required: Sequence[str],
+    optional: Sequence[str],
+    time_column: str,
+    what: str,
+    build: Callable[..., T],
+    batch_size: int,
+) -> Iterator[list[T]]:
+    _, pq = _pyarrow()
+    parquet = pq.ParquetFile(str(path))
+    columns = _projection(parquet.schema_arrow.names, required, optional, what)
+    return _domain_batches(
+        parquet.iter_batches(batch_size=batch_size, columns=columns),
+        columns=columns,
+        required=required,
+        time_column=time_column,
+        what=what,
+        build=build,
+    )
+
+
+def iter_runs_parquet(path: str | Path, *, batch_size: int = DEFAULT_BATCH_SIZE) -> Iterator[list[Run]]:
+    """
+    Stream runs from a Parquet file one record batch at a time.
+
+    Only the run columns are read (optional location/latitude/longitude
+    when present), so wide lake tables cost no more than narrow ones.
+    """
+    return _iter_file(
+        path,
+        required=RUN_COLUMNS,
+        optional=RUN_OPTIONAL_COLUMNS,
+        time_column="started_at",
+        what="runs",
+        build=Run,
+        batch_size=batch_size,
+    )
+
+
+def iter_weather_parquet(path: str | Path, *, batch_size: int = DEFAULT_BATCH_SIZE) -> Iterator[list[WeatherObs]]:
+    """Stream weather observations from a Parquet file one record batch at a time."""
+    return _iter_file(
+        path,
+        required=WEATHER_COLUMNS,
+        optional=WEATHER_OPTIONAL_COLUMNS,
+        time_column="observed_at",
+        what="weather",
+        build=WeatherObs,
+        batch_size=batch_size,
+    )
+
+
+def load_runs_parquet(path: str | Path) -> list[Run]:
+    return [run for batch in iter_runs_parquet(path) for run in batch]
+
+
+def load_weather_parquet(path: str | Path) -> list[WeatherObs]:
+    return [obs for batch in iter_weather_parquet(path) for obs in batch]
+
+
+def load_weather_index_parquet(path: str | Path) -> WeatherIndex:
+    """
+    Read weather straight into a WeatherIndex.
+
+    The table is sorted by observed_at in Arrow and the index's timestamp
+    column is taken from it directly, instead of sorting Python objects in
+    build_weather_index.
+    """
+    pa, pq = _pyarrow()
+    columns = _projection(pq.read_schema(str(path)).names, WEATHER_COLUMNS, WEATHER_OPTIONAL_COLUMNS, "weather")
+    table = pq.read_table(str(path), columns=columns)
+
+    # ISO strings with mixed offsets do not sort lexically; only timestamps sort in Arrow
+    presorted = pa.types.is_timestamp(table.schema.field("observed_at").type)
+    if presorted:
+        table = table.sort_by("observed_at")
+
+    observations = tuple(
+        obs
+        for batch in _domain_batches(
+            table.to_batches(max_chunksize=DEFAULT_BATCH_SIZE),
+            columns=columns,
+            required=WEATHER_COLUMNS,
+            time_column="observed_at",
+            what="weather",
+            build=WeatherObs,
+        )
+        for obs in batch
+    )
+    if not presorted:
+        return build_weather_index(observations)
+    return WeatherIndex(observed_at=tuple(obs.observed_at for obs in observations), observations=observations)
+
+
+def _utc(dt):
+    return dt.astimezone(timezone.utc)
+
+
+def _write_batches(path: str | Path, schema: Any, rows: Iterable[T], to_columns: Callable[[list[T]], dict], batch_size: int) -> int:
+    pa, pq = _pyarrow()
+    count = 0
+    with pq.ParquetWriter(str(path), schema) as writer:
+        batch: list[T] = []
+        for row in rows:
+            batch.append(row)
+            if len(batch) >= batch_size:
+                writer.write_table(pa.table(to_columns(batch), schema=schema))
+                count += len(batch)
+                batch = []
+        if batch or count == 0:
+            writer.write_table(pa.table(to_columns(batch), schema=schema))
+            count += len(batch)
+    return count
+
+
+def write_runs_parquet(path: str | Path, runs: Iterable[Run], *, batch_size: int = DEFAULT_BATCH_SIZE) -> int:
+    pa, _ = _pyarrow()
+    schema = pa.schema(
+        [
+            ("started_at", pa.timestamp("us", tz="UTC")),
+            ("duration_s", pa.int64()),
+            ("distance_m", pa.int64()),
+            ("location", pa.string()),
+            ("latitude", pa.float64()),
+            ("longitude", pa.float64()),
+        ]
+    )
+    return _write_batches(
+        path,
+        schema,
+        runs,
+        lambda batch: {
+            "started_at": [_utc(r.started_at) for r in batch],
+            "duration_s": [r.duration_s for r in batch],
+            "distance_m": [r.distance_m for r in batch],
+            "location": [r.location for r in batch],
+            "latitude": [r.latitude for r in batch],
+            "longitude": [r.longitude for r in batch],
+        },
+        batch_size,
+    )
+
+
+def write_weather_parquet(path: str | Path, weather: Iterable[WeatherObs], *, batch_size: int = DEFAULT_BATCH_SIZE) -> int:
+    pa, _ = _pyarrow()
+    schema = pa.schema(
+        [
+            ("observed_at", pa.timestamp("us", tz="UTC")),
+            ("temp_c", pa.float64()),
+            ("wind_mps", pa.float64()),
+            ("precipitation_mm", pa.float64()),
+            ("humidity_pct", pa.float64()),
+            ("location", pa.string()),
+        ]
+    )
+    return _write_batches(
+        path,
+        schema,
+        weather,
+        lambda batch: {
+            "observed_at": [_utc(w.observed_at) for w in batch],
+            "temp_c": [w.temp_c for w in batch],
+            "wind_mps": [w.wind_mps for w in batch],
+            "precipitation_mm": [w.precipitation_mm for w in batch],
+            "humidity_pct": [w.humidity_pct for w in batch],
+            "location": [w.location for w in batch],
+        },
+        batch_size,
+    )
+
+
+def write_enriched_parquet(path: str | Path, rows: Iterable[EnrichedRow], *, batch_size: int = DEFAULT_BATCH_SIZE) -> int:
+    """Write enriched rows (e.g. from iter_enriched) in row groups of batch_size; returns rows written."""
+    pa, _ = _pyarrow()
+    schema = pa.schema(
+        [
+            ("started_at", pa.timestamp("us", tz="UTC")),
+            ("duration_s", pa.int64()),
+            ("distance_m", pa.int64()),
+            ("observed_at", pa.timestamp("us", tz="UTC")),
+            ("temp_c", pa.float64()),
+            ("wind_mps", pa.float64()),
+            ("precipitation_mm", pa.float64()),
+            ("humidity_pct", pa.float64()),
+        ]
+    )
+    return _write_batches(
+        path,
+        schema,
+        rows,
+        lambda batch: {
+            "started_at": [_utc(parse_datetime_iso(r.started_at)) for r in batch],
+            "duration_s": [r.duration_s for r in batch],
+            "distance_m": [r.distance_m for r in batch],
+            "observed_at": [_utc(parse_datetime_iso(r.observed_at)) for r in batch],
+            "temp_c": [r.temp_c for r in batch],
+            "wind_mps": [r.wind_mps for r in batch],
+            "precipitation_mm": [r.precipitation_mm for r in batch],
+            "humidity_pct": [r.humidity_pct for r in batch],
+        },
+        batch_size,
+    )
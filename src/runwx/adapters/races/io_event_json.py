@@ -5,13 +5,15 @@ from pathlib import Path
 
 from pydantic import ValidationError
 
+from runwx.adapters.compression import open_text
 from runwx.adapters.races.schemas import RaceEventIn
 from runwx.domain.race import RaceEvent
 
 
 def load_event_json(path: str | Path) -> RaceEvent:
     path = Path(path)
-    raw = json.loads(path.read_text(encoding="utf-8"))
+    with open_text(path) as f:
+        raw = json.load(f)
 
     try:
         return RaceEventIn.model_validate(raw).to_domain()
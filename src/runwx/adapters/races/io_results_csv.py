@@ -5,6 +5,7 @@ from pathlib import Path
 
 from pydantic import ValidationError
 
+from runwx.adapters.compression import open_text
 from runwx.adapters.races.schemas import RaceResultIn
 from runwx.domain.race import RaceResult
 
@@ -13,7 +14,7 @@ def load_results_csv(path: str | Path, *, event_id: str) -> list[RaceResult]:
     path = Path(path)
     results: list[RaceResult] = []
 
-    with path.open("r", encoding="utf-8", newline="") as f:
+    with open_text(path, newline="") as f:
         reader = csv.DictReader(f)
 
         required = {"duration_s"}
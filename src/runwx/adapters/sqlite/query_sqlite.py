@@ -2,8 +2,12 @@ from __future__ import annotations
 
 import sqlite3
 from dataclasses import dataclass
-from datetime import datetime
-from typing import Iterable
+from datetime import datetime, timezone
+from typing import Iterator, Tuple
+
+from runwx.adapters.sqlite.storage_sqlite import ROLLUP_BAND_WIDTHS, ROLLUP_PERIODS
+from runwx.domain.models import Run
+from runwx.services.pipeline import SkipCode
 
 
 @dataclass(frozen=True)
@@ -18,12 +22,140 @@ class EnrichedRow:
     humidity_pct: float
 
 
-def fetch_latest_enriched(conn: sqlite3.Connection, *, limit: int = 20) -> list[EnrichedRow]:
+@dataclass(frozen=True)
+class AggregateRow:
+    period_start: str
+    band_start: float
+    band_end: float
+    run_count: int
+    distance_m: int
+    duration_s: int
+    avg_temp_c: float
+
+    @property
+    def avg_pace_s_per_km(self) -> float:
+        return self.duration_s / (self.distance_m / 1000.0)
+
+
+@dataclass(frozen=True)
+class EnrichedFilter:
     """
-    Return latest enriched runs, ordered by run start time descending.
+    Predicates for enriched-run queries; None means "no bound".
+
+    start is inclusive and end exclusive on the run start time. Every other
+    bound is inclusive.
+    """
+    start: datetime | None = None
+    end: datetime | None = None
+    min_distance_m: int | None = None
+    max_distance_m: int | None = None
+    min_temp_c: float | None = None
+    max_temp_c: float | None = None
+    min_wind_mps: float | None = None
+    max_wind_mps: float | None = None
+    min_precipitation_mm: float | None = None
+    max_precipitation_mm: float | None = None
+
+
+# filter field -> (SQL expression, comparison operator)
+_FILTER_PREDICATES = {
+    "start": ("r.started_at", ">="),
+    "end": ("r.started_at", "<"),
+    "min_distance_m": ("r.distance_m", ">="),
+    "max_distance_m": ("r.distance_m", "<="),
+    "min_temp_c": ("w.temp_c", ">="),
+    "max_temp_c": ("w.temp_c", "<="),
+    "min_wind_mps": ("w.wind_mps", ">="),
+    "max_wind_mps": ("w.wind_mps", "<="),
+    "min_precipitation_mm": ("w.precipitation_mm", ">="),
+    "max_precipitation_mm": ("w.precipitation_mm", "<="),
+}
+
+
+def _compile_filter(flt: EnrichedFilter | None) -> tuple[list[str], list[object]]:
+    """Turn a filter into parameterized WHERE clauses (indexed columns only)."""
+    clauses: list[str] = []
+    params: list[object] = []
+    if flt is None:
+        return clauses, params
+
+    for name, (column, op) in _FILTER_PREDICATES.items():
+        value = getattr(flt, name)
+        if value is None:
+            continue
+        if isinstance(value, datetime):
+            # stored as ISO text; assumes runs were persisted in UTC
+            value = value.astimezone(timezone.utc).isoformat()
+        clauses.append(f"{column} {op} ?")
+        params.append(value)
+
+    return clauses, params
+
+
+# (started_at, run id) of the last row of a page
+EnrichedCursor = Tuple[str, int]
+
+_BAND_COLUMNS = {
+    "temp": "temp_band",
+    "wind": "wind_band",
+    "precip": "precip_band",
+}
+
+
+def _row_to_enriched(row: tuple) -> EnrichedRow:
+    return EnrichedRow(
+        started_at=row[0],
+        duration_s=int(row[1]),
+        distance_m=int(row[2]),
+        observed_at=row[3],
+        temp_c=float(row[4]),
+        wind_mps=float(row[5]),
+        precipitation_mm=float(row[6]),
+        humidity_pct=float(row[7]),
+    )
+
+
+def fetch_enriched_page(
+    conn: sqlite3.Connection,
+    *,
+    after: EnrichedCursor | None = None,
+    page_size: int = 500,
+    where: EnrichedFilter | None = None,
+) -> tuple[list[EnrichedRow], EnrichedCursor | None]:
+    """
+    Return one page of enriched runs, newest first, plus the cursor for the next page.
+
+    Pagination is keyset-based on (started_at, run id): each page seeks
+    straight to its position in the runs(started_at) index instead of
+    skipping over OFFSET rows. The returned cursor is None on the last page.
+
+    `where` predicates are compiled into the SQL and answered from indexes
+    on runs and weather_obs, not filtered in Python. Without a time bound,
+    walking runs(started_at) for the ORDER BY would read every run the
+    predicates reject; the sort key is then hidden from the planner (unary
+    +) so a predicate index drives the query and a LIMIT-bounded sorter
+    orders the matches. With weather predicates only, the join is pinned
+    to start from weather_obs, since the planner has no statistics telling
+    it a one-sided weather range is selective.
     """
+    clauses, params = _compile_filter(where)
+    order = "r.started_at DESC, r.id DESC"
+    joins = "run_with_weather rw JOIN runs r ON r.id = rw.run_id JOIN weather_obs w ON w.id = rw.weather_id"
+    if clauses and where is not None and where.start is None and where.end is None:
+        order = "+r.started_at DESC, +r.id DESC"
+        if where.min_distance_m is None and where.max_distance_m is None:
+            # CROSS JOIN fixes the loop order: weather_obs outermost
+            joins = (
+                "weather_obs w CROSS JOIN run_with_weather rw ON rw.weather_id = w.id"
+                " CROSS JOIN runs r ON r.id = rw.run_id"
+            )
+    if after is not None:
+        clauses.append("(r.started_at, r.id) < (?, ?)")
+        params.extend(after)
+    where_sql = f"WHERE {' AND '.join(clauses)}" if clauses else ""
+
     cur = conn.execute(
-        """
+        f"""
         SELECT
             r.started_at,
             r.duration_s,
@@ -32,28 +164,158 @@ def fetch_latest_enriched(conn: sqlite3.Connection, *, limit: int = 20) -> list[
             w.temp_c,
             w.wind_mps,
             w.precipitation_mm,
-            w.humidity_pct
-        FROM run_with_weather rw
-        JOIN runs r ON r.id = rw.run_id
-        JOIN weather_obs w ON w.id = rw.weather_id
-        ORDER BY r.started_at DESC
+            w.humidity_pct,
+            r.id
+        FROM {joins}
+        {where_sql}
+        ORDER BY {order}
         LIMIT ?
         """,
-        (limit,),
+        (*params, page_size),
     )
+    rows = cur.fetchall()
 
-    out: list[EnrichedRow] = []
-    for row in cur.fetchall():
-        out.append(
-            EnrichedRow(
-                started_at=row[0],
-                duration_s=int(row[1]),
-                distance_m=int(row[2]),
-                observed_at=row[3],
-                temp_c=float(row[4]),
-                wind_mps=float(row[5]),
-                precipitation_mm=float(row[6]),
-                humidity_pct=float(row[7]),
-            )
+    next_cursor: EnrichedCursor | None = None
+    if len(rows) == page_size:
+        next_cursor = (rows[-1][0], int(rows[-1][8]))
+
+    return [_row_to_enriched(row) for row in rows], next_cursor
+
+
+def iter_enriched(
+    conn: sqlite3.Connection,
+    *,
+    limit: int | None = None,
+    page_size: int = 500,
+    where: EnrichedFilter | None = None,
+) -> Iterator[EnrichedRow]:
+    """
+    Yield enriched runs, newest first, one keyset page at a time.
+
+    At most page_size rows are held in memory, so limit=None streams the
+    whole table in constant memory. A negative limit means no limit, as it
+    does for SQLite's LIMIT.
+    """
+    remaining = None if limit is not None and limit < 0 else limit
+    cursor: EnrichedCursor | None = None
+
+    while remaining is None or remaining > 0:
+        size = page_size if remaining is None else min(page_size, remaining)
+        rows, cursor = fetch_enriched_page(conn, after=cursor, page_size=size, where=where)
+        yield from rows
+
+        if remaining is not None:
+            remaining -= len(rows)
+        if cursor is None:
+            return
+
+
+def fetch_latest_enriched(conn: sqlite3.Connection, *, limit: int = 20) -> list[EnrichedRow]:
+    """
+    Return latest enriched runs, ordered by run start time descending.
+    """
+    return list(iter_enriched(conn, limit=limit))
+
+
+def fetch_skipped_runs_in_range(
+    conn: sqlite3.Connection,
+    *,
+    start: datetime,
+    end: datetime,
+) -> list[Run]:
+    """
+    Return distinct skipped runs whose start time lies in [start, end].
+
+    The range is answered from the started_at prefix of the skipped_runs
+    UNIQUE index, so only the matching slice of the table is read.
+    Timestamps are compared as stored ISO text, which assumes runs were
+    persisted in UTC (as all bundled adapters do).
+    """
+    cur = conn.execute(
+        """
+        SELECT DISTINCT started_at, duration_s, distance_m
+        FROM skipped_runs
+        WHERE started_at BETWEEN ? AND ?
+        ORDER BY started_at
+        """,
+        (start.astimezone(timezone.utc).isoformat(), end.astimezone(timezone.utc).isoformat()),
+    )
+
+    return [
+        Run(
+            started_at=datetime.fromisoformat(row[0]),
+            duration_s=int(row[1]),
+            distance_m=int(row[2]),
+        )
+        for row in cur.fetchall()
+    ]
+
+
+def fetch_max_skipped_duration_s(conn: sqlite3.Connection) -> int:
+    """Return the longest skipped run duration in seconds (0 if none)."""
+    row = conn.execute("SELECT MAX(duration_s) FROM skipped_runs").fetchone()
+    return int(row[0]) if row and row[0] is not None else 0
+
+
+def fetch_skip_counts(conn: sqlite3.Connection) -> dict[SkipCode, int]:
+    """Return the number of skipped rows per SkipCode, in code order."""
+    cur = conn.execute(
+        """
+        SELECT r.code, COUNT(*)
+        FROM skipped_runs s
+        JOIN skip_reasons r ON r.id = s.reason_id
+        GROUP BY r.code
+        ORDER BY r.code
+        """
+    )
+    return {SkipCode(code): int(n) for code, n in cur.fetchall()}
+
+
+def fetch_aggregates(
+    conn: sqlite3.Connection,
+    *,
+    period: str = "month",
+    by: str = "temp",
+) -> list[AggregateRow]:
+    """
+    Return per-period, per-weather-bucket totals from the weather_rollups table.
+
+    period is one of day/week/month and by one of temp/wind/precip. Rows are
+    answered from the rollups alone, never from the raw run tables.
+    """
+    if period not in ROLLUP_PERIODS:
+        raise ValueError(f"Unknown rollup period: {period!r}")
+    if by not in _BAND_COLUMNS:
+        raise ValueError(f"Unknown rollup bucket: {by!r}")
+
+    band = _BAND_COLUMNS[by]
+    width = ROLLUP_BAND_WIDTHS[by]
+    cur = conn.execute(
+        f"""
+        SELECT
+            period_start,
+            {band},
+            SUM(run_count),
+            SUM(distance_m),
+            SUM(duration_s),
+            SUM(temp_c_sum)
+        FROM weather_rollups
+        WHERE period = ?
+        GROUP BY period_start, {band}
+        ORDER BY period_start, {band}
+        """,
+        (period,),
+    )
+
+    return [
+        AggregateRow(
+            period_start=row[0],
+            band_start=float(row[1]),
+            band_end=float(row[1]) + width,
+            run_count=int(row[2]),
+            distance_m=int(row[3]),
+            duration_s=int(row[4]),
+            avg_temp_c=float(row[5]) / int(row[2]),
         )
-    return out
\ No newline at end of file
+        for row in cur.fetchall()
+    ]
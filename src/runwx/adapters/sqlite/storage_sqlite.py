@@ -1,26 +1,73 @@
 from __future__ import annotations
 
+import math
 import sqlite3
+from datetime import date, datetime, timedelta, timezone
 from pathlib import Path
 from typing import Iterable
 
 from runwx.domain.enrich import RunWithWeather
 from runwx.domain.models import Run, WeatherObs
-from runwx.services.pipeline import PipelineResult
+from runwx.services.pipeline import PipelineResult, SkipReason
+
+
+ROLLUP_PERIODS = ("day", "week", "month")
+
+# Width of each weather bucket; a bucket is stored by its lower bound.
+ROLLUP_BAND_WIDTHS = {
+    "temp": 5.0,
+    "wind": 2.0,
+    "precip": 1.0,
+}
+
+# derived (interpolated / aggregated weather linked to a run) is part of the
+# identity, so a measured observation never shares a row with derived weather
+_WEATHER_OBS_KEY = ("observed_at", "temp_c", "wind_mps", "precipitation_mm", "humidity_pct", "derived")
+
+_WEATHER_OBS_TABLE = """
+    CREATE TABLE IF NOT EXISTS {name} (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        observed_at TEXT NOT NULL,
+        temp_c REAL NOT NULL,
+        wind_mps REAL NOT NULL,
+        precipitation_mm REAL NOT NULL,
+        humidity_pct REAL NOT NULL,
+        derived INTEGER NOT NULL DEFAULT 0,
+        UNIQUE(observed_at, temp_c, wind_mps, precipitation_mm, humidity_pct, derived)
+    )
+"""
 
 
 def _iso(dt) -> str:
     return dt.isoformat()
 
 
-def connect(db_path: str | Path) -> sqlite3.Connection:
+def _band(value: float, width: float) -> float:
+    return math.floor(value / width) * width
+
+
+def _period_start(day: date, period: str) -> str:
+    if period == "day":
+        return day.isoformat()
+    if period == "week":
+        return (day - timedelta(days=day.weekday())).isoformat()
+    if period == "month":
+        return day.replace(day=1).isoformat()
+    raise ValueError(f"Unknown rollup period: {period!r}")
+
+
+def connect(db_path: str | Path, *, check_same_thread: bool = True) -> sqlite3.Connection:
     path = Path(db_path)
-    conn = sqlite3.connect(path)
+    conn = sqlite3.connect(path, check_same_thread=check_same_thread)
     conn.execute("PRAGMA foreign_keys = ON")
     return conn
 
 
 def init_db(conn: sqlite3.Connection) -> None:
+    had_rollups = conn.execute(
+        "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'weather_rollups'"
+    ).fetchone() is not None
+
     conn.execute(
         """
         CREATE TABLE IF NOT EXISTS runs (
@@ -33,19 +80,9 @@ def init_db(conn: sqlite3.Connection) -> None:
         """
     )
 
-    conn.execute(
-        """
-        CREATE TABLE IF NOT EXISTS weather_obs (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            observed_at TEXT NOT NULL,
-            temp_c REAL NOT NULL,
-            wind_mps REAL NOT NULL,
-            precipitation_mm REAL NOT NULL,
-            humidity_pct REAL NOT NULL,
-            UNIQUE(observed_at, temp_c, wind_mps, precipitation_mm, humidity_pct)
-        )
-        """
-    )
+    conn.execute(_WEATHER_OBS_TABLE.format(name="weather_obs"))
+    if _WEATHER_OBS_KEY not in _unique_keys(conn, "weather_obs"):
+        _migrate_weather_key(conn)
 
     conn.execute(
         """
@@ -59,22 +96,248 @@ def init_db(conn: sqlite3.Connection) -> None:
         """
     )
 
+    legacy_skipped = "reason" in _columns(conn, "skipped_runs")
+    # an interrupted migration (before it ran in one transaction) left its rows here
+    resume_skipped = not legacy_skipped and bool(_columns(conn, "skipped_runs_legacy"))
+    migrate_skipped = legacy_skipped or resume_skipped
+    began = migrate_skipped and not conn.in_transaction
+    if began:
+        # DDL does not open a transaction implicitly: without BEGIN the rename
+        # would commit on its own and a crash could strand the old rows
+        conn.execute("BEGIN")
+
+    try:
+        if legacy_skipped:
+            conn.execute("ALTER TABLE skipped_runs RENAME TO skipped_runs_legacy")
+
+        # each distinct (code, param) is stored once; skipped rows carry its id
+        conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS skip_reasons (
+                id INTEGER PRIMARY KEY,
+                code INTEGER NOT NULL,
+                param TEXT NOT NULL DEFAULT '',
+                UNIQUE(code, param)
+            )
+            """
+        )
+
+        conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS skipped_runs (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                started_at TEXT NOT NULL,
+                duration_s INTEGER NOT NULL,
+                distance_m INTEGER NOT NULL,
+                reason_id INTEGER NOT NULL,
+                UNIQUE(started_at, duration_s, distance_m, reason_id),
+                FOREIGN KEY(reason_id) REFERENCES skip_reasons(id)
+            )
+            """
+        )
+
+        if migrate_skipped:
+            _migrate_skipped_reasons(conn)
+    except BaseException:
+        if began:
+            conn.rollback()
+        raise
+
+    # serves newest-first listing and keyset pagination on (started_at, id)
     conn.execute(
         """
-        CREATE TABLE IF NOT EXISTS skipped_runs (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            started_at TEXT NOT NULL,
-            duration_s INTEGER NOT NULL,
+        CREATE INDEX IF NOT EXISTS idx_runs_started_at
+        ON runs (started_at)
+        """
+    )
+
+    # indexes for query predicates (see query_sqlite.EnrichedFilter)
+    for name, table, column in (
+        ("idx_runs_distance_m", "runs", "distance_m"),
+        ("idx_weather_obs_temp_c", "weather_obs", "temp_c"),
+        ("idx_weather_obs_wind_mps", "weather_obs", "wind_mps"),
+        ("idx_weather_obs_precipitation_mm", "weather_obs", "precipitation_mm"),
+        ("idx_run_with_weather_weather_id", "run_with_weather", "weather_id"),
+    ):
+        conn.execute(f"CREATE INDEX IF NOT EXISTS {name} ON {table} ({column})")
+
+    conn.execute(
+        """
+        CREATE TABLE IF NOT EXISTS weather_rollups (
+            period TEXT NOT NULL,
+            period_start TEXT NOT NULL,
+            temp_band REAL NOT NULL,
+            wind_band REAL NOT NULL,
+            precip_band REAL NOT NULL,
+            run_count INTEGER NOT NULL,
             distance_m INTEGER NOT NULL,
-            reason TEXT NOT NULL,
-            UNIQUE(started_at, duration_s, distance_m, reason)
-        )
+            duration_s INTEGER NOT NULL,
+            temp_c_sum REAL NOT NULL,
+            PRIMARY KEY(period, period_start, temp_band, wind_band, precip_band)
+        ) WITHOUT ROWID
         """
     )
 
+    # The UNIQUE(started_at, ...) index already serves started_at range scans;
+    # this one keeps MAX(duration_s) cheap for reprocessing window bounds.
+    conn.execute(
+        """
+        CREATE INDEX IF NOT EXISTS idx_skipped_runs_duration_s
+        ON skipped_runs (duration_s)
+        """
+    )
+
+    if not had_rollups:
+        # databases created before rollups existed need a one-off backfill
+        rebuild_rollups(conn)
+
     conn.commit()
 
 
+def _columns(conn: sqlite3.Connection, table: str) -> set[str]:
+    return {row[1] for row in conn.execute(f"PRAGMA table_info({table})")}
+
+
+def _unique_keys(conn: sqlite3.Connection, table: str) -> set[tuple[str, ...]]:
+    indexes = [row[1] for row in conn.execute(f"PRAGMA index_list({table})") if row[2]]
+    return {tuple(info[2] for info in conn.execute(f"PRAGMA index_info({name})")) for name in indexes}
+
+
+def _migrate_weather_key(conn: sqlite3.Connection) -> None:
+    """
+    Rebuild weather_obs with `derived` in its UNIQUE key (commits). SQLite
+    cannot change a constraint in place, so the rows move to a new table
+    under their old ids; foreign keys are off meanwhile, as dropping the old
+    table would otherwise trip the run_with_weather references. Tables from
+    before the flag existed have only measured rows.
+    """
+    derived = "derived" if "derived" in _columns(conn, "weather_obs") else "0"
+    # PRAGMA foreign_keys is a no-op inside a transaction
+    conn.commit()
+    foreign_keys = conn.execute("PRAGMA foreign_keys").fetchone()[0]
+    conn.execute("PRAGMA foreign_keys = OFF")
+    try:
+        conn.execute("BEGIN")
+        try:
+            conn.execute(_WEATHER_OBS_TABLE.format(name="weather_obs_rekeyed"))
+            conn.execute(
+                f"""
+                INSERT INTO weather_obs_rekeyed (id, observed_at, temp_c, wind_mps, precipitation_mm, humidity_pct, derived)
+                SELECT id, observed_at, temp_c, wind_mps, precipitation_mm, humidity_pct, {derived}
+                FROM weather_obs
+                ORDER BY id
+                """
+            )
+            conn.execute("DROP TABLE weather_obs")
+            conn.execute("ALTER TABLE weather_obs_rekeyed RENAME TO weather_obs")
+            conn.commit()
+        except BaseException:
+            conn.rollback()
+            raise
+    finally:
+        conn.execute(f"PRAGMA foreign_keys = {int(foreign_keys)}")
+
+
+def _migrate_skipped_reasons(conn: sqlite3.Connection) -> None:
+    """
+    Move rows from the old free-text skipped_runs (renamed to
+    skipped_runs_legacy) into the coded table (no commit). Each distinct
+    message is parsed once; the rows are copied in one INSERT ... SELECT.
+    """
+    conn.execute("CREATE TEMP TABLE skip_reason_map (reason TEXT PRIMARY KEY, reason_id INTEGER NOT NULL)")
+    texts = [row[0] for row in conn.execute("SELECT DISTINCT reason FROM skipped_runs_legacy")]
+    cache: dict[SkipReason, int] = {}
+    conn.executemany(
+        "INSERT INTO skip_reason_map (reason, reason_id) VALUES (?, ?)",
+        [(text, _skip_reason_id(conn, SkipReason.parse(text), cache)) for text in texts],
+    )
+    conn.execute(
+        """
+        INSERT OR IGNORE INTO skipped_runs (id, started_at, duration_s, distance_m, reason_id)
+        SELECT s.id, s.started_at, s.duration_s, s.distance_m, m.reason_id
+        FROM skipped_runs_legacy s
+        JOIN skip_reason_map m ON m.reason = s.reason
+        ORDER BY s.id
+        """
+    )
+    conn.execute("DROP TABLE skip_reason_map")
+    conn.execute("DROP TABLE skipped_runs_legacy")
+
+
+def _skip_reason_id(conn: sqlite3.Connection, reason: SkipReason, cache: dict[SkipReason, int]) -> int:
+    reason_id = cache.get(reason)
+    if reason_id is None:
+        param = reason.param or ""
+        conn.execute("INSERT OR IGNORE INTO skip_reasons (code, param) VALUES (?, ?)", (int(reason.code), param))
+        row = conn.execute("SELECT id FROM skip_reasons WHERE code = ? AND param = ?", (int(reason.code), param)).fetchone()
+        reason_id = cache[reason] = int(row[0])
+    return reason_id
+
+
+def _add_to_rollups(
+    conn: sqlite3.Connection,
+    *,
+    started_at: datetime,
+    duration_s: int,
+    distance_m: int,
+    temp_c: float,
+    wind_mps: float,
+    precipitation_mm: float,
+) -> None:
+    day = started_at.astimezone(timezone.utc).date()
+    bands = (
+        _band(temp_c, ROLLUP_BAND_WIDTHS["temp"]),
+        _band(wind_mps, ROLLUP_BAND_WIDTHS["wind"]),
+        _band(precipitation_mm, ROLLUP_BAND_WIDTHS["precip"]),
+    )
+    conn.executemany(
+        """
+        INSERT INTO weather_rollups (
+            period, period_start, temp_band, wind_band, precip_band,
+            run_count, distance_m, duration_s, temp_c_sum
+        )
+        VALUES (?, ?, ?, ?, ?, 1, ?, ?, ?)
+        ON CONFLICT(period, period_start, temp_band, wind_band, precip_band) DO UPDATE SET
+            run_count = run_count + 1,
+            distance_m = distance_m + excluded.distance_m,
+            duration_s = duration_s + excluded.duration_s,
+            temp_c_sum = temp_c_sum + excluded.temp_c_sum
+        """,
+        [
+            (period, _period_start(day, period), *bands, distance_m, duration_s, temp_c)
+            for period in ROLLUP_PERIODS
+        ],
+    )
+
+
+def rebuild_rollups(conn: sqlite3.Connection) -> None:
+    """
+    Recompute weather_rollups from run_with_weather (no commit).
+    Only needed for backfills; writers keep rollups current incrementally.
+    Runs linked to derived weather are left out, as the writers do.
+    """
+    conn.execute("DELETE FROM weather_rollups")
+    cur = conn.execute(
+        """
+        SELECT r.started_at, r.duration_s, r.distance_m, w.temp_c, w.wind_mps, w.precipitation_mm
+        FROM run_with_weather rw
+        JOIN runs r ON r.id = rw.run_id
+        JOIN weather_obs w ON w.id = rw.weather_id
+        WHERE w.derived = 0
+        """
+    )
+    for row in cur:
+        _add_to_rollups(
+            conn,
+            started_at=datetime.fromisoformat(row[0]),
+            duration_s=int(row[1]),
+            distance_m=int(row[2]),
+            temp_c=float(row[3]),
+            wind_mps=float(row[4]),
+            precipitation_mm=float(row[5]),
+        )
+
+
 def _get_or_create_run_id(conn: sqlite3.Connection, run: Run) -> int:
     conn.execute(
         """
@@ -96,32 +359,38 @@ def _get_or_create_run_id(conn: sqlite3.Connection, run: Run) -> int:
 
 
 def _get_or_create_weather_id(conn: sqlite3.Connection, obs: WeatherObs) -> int:
+    """
+    Derived weather (obs.derived) is stored flagged and keyed apart from
+    measured weather, so the two never share a row, even with equal values.
+    A row's flag never changes, which keeps the incremental rollups in step
+    with rebuild_rollups.
+    """
+    key = (_iso(obs.observed_at), obs.temp_c, obs.wind_mps, obs.precipitation_mm, obs.humidity_pct, int(obs.derived))
     conn.execute(
         """
-        INSERT OR IGNORE INTO weather_obs (observed_at, temp_c, wind_mps, precipitation_mm, humidity_pct)
-        VALUES (?, ?, ?, ?, ?)
+        INSERT OR IGNORE INTO weather_obs (observed_at, temp_c, wind_mps, precipitation_mm, humidity_pct, derived)
+        VALUES (?, ?, ?, ?, ?, ?)
         """,
-        (_iso(obs.observed_at), obs.temp_c, obs.wind_mps, obs.precipitation_mm, obs.humidity_pct),
+        key,
     )
     row = conn.execute(
         """
         SELECT id FROM weather_obs
         WHERE observed_at = ? AND temp_c = ? AND wind_mps = ? AND precipitation_mm = ? AND humidity_pct = ?
+          AND derived = ?
         """,
-        (_iso(obs.observed_at), obs.temp_c, obs.wind_mps, obs.precipitation_mm, obs.humidity_pct),
+        key,
     ).fetchone()
     if row is None:
         raise RuntimeError("Failed to read back weather id after insert")
     return int(row[0])
 
 
-def write_enriched(conn: sqlite3.Connection, rows: Iterable[RunWithWeather]) -> int:
+def _insert_enriched(conn: sqlite3.Connection, rows: Iterable[RunWithWeather]) -> int:
     """
-    Persist enriched rows to SQLite.
+    Insert enriched rows without committing.
     Returns number of run_with_weather links created.
-    Assumes init_db(conn) has already been called.
     """
-    init_db(conn)
     created = 0
 
     for item in rows:
@@ -135,8 +404,58 @@ def write_enriched(conn: sqlite3.Connection, rows: Iterable[RunWithWeather]) ->
             """,
             (run_id, weather_id),
         )
+        # rollups aggregate measured weather only
+        if cur.rowcount and not item.weather.derived:
+            _add_to_rollups(
+                conn,
+                started_at=item.run.started_at,
+                duration_s=item.run.duration_s,
+                distance_m=item.run.distance_m,
+                temp_c=item.weather.temp_c,
+                wind_mps=item.weather.wind_mps,
+                precipitation_mm=item.weather.precipitation_mm,
+            )
         created += int(cur.rowcount)
 
+    return created
+
+
+def write_enriched(conn: sqlite3.Connection, rows: Iterable[RunWithWeather]) -> int:
+    """
+    Persist enriched rows to SQLite.
+    Returns number of run_with_weather links created.
+    Assumes init_db(conn) has already been called.
+    """
+    init_db(conn)
+    created = _insert_enriched(conn, rows)
+    conn.commit()
+    return created
+
+
+def promote_skipped(conn: sqlite3.Connection, rows: Iterable[RunWithWeather]) -> int:
+    """
+    Move previously skipped runs into run_with_weather.
+
+    Inserting the enriched rows and deleting their skipped_runs entries
+    happens in a single transaction: either every run is promoted or none is.
+    Returns number of run_with_weather links created.
+    """
+    init_db(conn)
+    rows = list(rows)
+
+    try:
+        created = _insert_enriched(conn, rows)
+        conn.executemany(
+            """
+            DELETE FROM skipped_runs
+            WHERE started_at = ? AND duration_s = ? AND distance_m = ?
+            """,
+            [(_iso(item.run.started_at), item.run.duration_s, item.run.distance_m) for item in rows],
+        )
+    except Exception:
+        conn.rollback()
+        raise
+
     conn.commit()
     return created
 
@@ -150,16 +469,18 @@ def write_pipeline_result(conn: sqlite3.Connection, result: PipelineResult) -> t
 
     enriched_created = write_enriched(conn, result.enriched)
 
-    skipped_created = 0
-    for s in result.skipped:
-        cur = conn.execute(
-            """
-            INSERT OR IGNORE INTO skipped_runs (started_at, duration_s, distance_m, reason)
-            VALUES (?, ?, ?, ?)
-            """,
-            (_iso(s.run.started_at), s.run.duration_s, s.run.distance_m, s.reason),
-        )
-        skipped_created += int(cur.rowcount)
+    reason_ids: dict[SkipReason, int] = {}
+    cur = conn.executemany(
+        """
+        INSERT OR IGNORE INTO skipped_runs (started_at, duration_s, distance_m, reason_id)
+        VALUES (?, ?, ?, ?)
+        """,
+        [
+            (_iso(s.run.started_at), s.run.duration_s, s.run.distance_m, _skip_reason_id(conn, s.reason, reason_ids))
+            for s in result.skipped
+        ],
+    )
+    skipped_created = max(int(cur.rowcount), 0)
 
     conn.commit()
     return enriched_created, skipped_created
@@ -1,22 +1,372 @@
 from __future__ import annotations
 
-from bisect import bisect_left
-from dataclasses import dataclass
-from datetime import datetime, timedelta
-from typing import Sequence
+import heapq
+import sys
+import threading
+import warnings
+from array import array
+from bisect import bisect_left, bisect_right
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta, timezone
+from functools import cached_property
+from itertools import accumulate
+from typing import Callable, Dict, Iterable, Iterator, Literal, Mapping, Sequence, Union, overload
 
 from runwx.domain.models import Run, WeatherObs
 
 
+AlignMode = Literal["nearest", "interpolate", "window"]
+WindowTemp = Literal["mean", "max"]
+
+# resolves the weather location key of each run in a batch (None = unknown)
+Locator = Callable[[Sequence[Run]], Sequence["str | None"]]
+
+# the point of a run its weather is looked up at: a name or a weight in [0, 1] along the run
+AnchorStrategy = Union[Literal["start", "midpoint", "end"], float]
+_ANCHOR_WEIGHTS = {"start": 0.0, "midpoint": 0.5, "end": 1.0}
+
+_EPOCH = datetime(1970, 1, 1, tzinfo=timezone.utc)
+_US = timedelta(microseconds=1)
+
+
+def anchor_weight(anchor: AnchorStrategy) -> float:
+    """Resolve an anchor strategy to its fraction of the run duration."""
+    if isinstance(anchor, str):
+        if anchor not in _ANCHOR_WEIGHTS:
+            raise ValueError(f"Unknown anchor strategy: {anchor!r}")
+        return _ANCHOR_WEIGHTS[anchor]
+    weight = float(anchor)
+    if not 0.0 <= weight <= 1.0:
+        raise ValueError(f"Anchor weight must be between 0 and 1, got {anchor!r}")
+    return weight
+
+
+class _RangeMax:
+    """Sparse table answering max(values[lo:hi]) in O(1) after O(m log m) build."""
+
+    def __init__(self, values: Sequence[float]) -> None:
+        self.levels: list[list[float]] = [list(values)]
+        width = 1
+        while 2 * width <= len(values):
+            prev = self.levels[-1]
+            self.levels.append([max(prev[i], prev[i + width]) for i in range(len(prev) - width)])
+            width *= 2
+
+    def query(self, lo: int, hi: int) -> float:
+        level = (hi - lo).bit_length() - 1
+        row = self.levels[level]
+        return max(row[lo], row[hi - (1 << level)])
+
+
+@dataclass(frozen=True)
+class _WindowTables:
+    temp_sum: tuple[float, ...]
+    precipitation_sum: tuple[float, ...]
+    humidity_sum: tuple[float, ...]
+    temp_max: _RangeMax
+    wind_max: _RangeMax
+
+
 @dataclass(frozen=True)
 class WeatherIndex:
     observed_at: tuple[datetime, ...]
     observations: tuple[WeatherObs, ...]
 
+    @cached_property
+    def observed_us(self) -> array:
+        """observed_at as int64 UTC epoch microseconds, built on first batch lookup."""
+        return array("q", [(t - _EPOCH) // _US for t in self.observed_at])
+
+    @cached_property
+    def window_tables(self) -> _WindowTables:
+        """Prefix sums and range-max tables, built on first window query."""
+        obs = self.observations
+        return _WindowTables(
+            temp_sum=(0.0, *accumulate(o.temp_c for o in obs)),
+            precipitation_sum=(0.0, *accumulate(o.precipitation_mm for o in obs)),
+            humidity_sum=(0.0, *accumulate(o.humidity_pct for o in obs)),
+            temp_max=_RangeMax([o.temp_c for o in obs]),
+            wind_max=_RangeMax([o.wind_mps for o in obs]),
+        )
+
+    def extend(self, observations: Iterable[WeatherObs]) -> "WeatherIndex":
+        """
+        Return a new index that also contains `observations`.
+
+        Only the new observations are sorted; they are then merged with the
+        already sorted series in one linear pass (appending directly when
+        they all come after the current last observation). Existing
+        observations stay ahead of new ones with the same timestamp.
+        """
+        new = sorted(observations, key=lambda obs: obs.observed_at)
+        if not new:
+            return self
+
+        if not self.observations or new[0].observed_at >= self.observed_at[-1]:
+            merged = self.observations + tuple(new)
+        else:
+            merged = tuple(heapq.merge(self.observations, new, key=lambda obs: obs.observed_at))
+
+        return WeatherIndex(
+            observed_at=tuple(obs.observed_at for obs in merged),
+            observations=merged,
+        )
+
+    def between(self, start: datetime, end: datetime) -> "WeatherIndex":
+        """Return the sub-index of observations with start <= observed_at <= end (two bisects and a slice)."""
+        lo = bisect_left(self.observed_at, start)
+        hi = bisect_right(self.observed_at, end)
+        return WeatherIndex(observed_at=self.observed_at[lo:hi], observations=self.observations[lo:hi])
+
+
+@dataclass
+class MultiWeatherIndex:
+    """
+    Weather observations partitioned by location key.
+
+    Each partition keeps its raw observations until first use, when a
+    WeatherIndex is built and cached for it, so locations that no run
+    touches are never sorted. Routing a run to its partition is a dict
+    lookup before the usual bisect.
+    """
+    partitions: Dict[str, tuple[WeatherObs, ...]]
+    _built: Dict[str, WeatherIndex] = field(default_factory=dict, init=False, repr=False, compare=False)
+
+    @classmethod
+    def from_observations(
+        cls,
+        observations: Iterable[WeatherObs],
+        *,
+        key: Callable[[WeatherObs], str | None] = lambda obs: obs.location,
+    ) -> "MultiWeatherIndex":
+        """Group observations by key (default: WeatherObs.location)."""
+        groups: dict[str, list[WeatherObs]] = {}
+        for obs in observations:
+            k = key(obs)
+            if k is None:
+                raise ValueError(f"Weather observation at {obs.observed_at.isoformat()} has no location")
+            groups.setdefault(k, []).append(obs)
+        return cls(partitions={k: tuple(v) for k, v in groups.items()})
+
+    @classmethod
+    def from_mapping(cls, partitions: Mapping[str, Sequence[WeatherObs]]) -> "MultiWeatherIndex":
+        return cls(partitions={k: tuple(v) for k, v in partitions.items()})
+
+    def __contains__(self, key: object) -> bool:
+        return key in self.partitions
+
+    def __len__(self) -> int:
+        return len(self.partitions)
+
+    def extend(self, observations: Iterable[WeatherObs]) -> None:
+        """
+        Add observations in place, grouped by WeatherObs.location.
+        Partitions that were already built are merged, not re-sorted.
+        """
+        for key, group in MultiWeatherIndex.from_observations(observations).partitions.items():
+            self.partitions[key] = self.partitions.get(key, ()) + group
+            if key in self._built:
+                self._built[key] = self._built[key].extend(group)
+
+    def get(self, key: str | None) -> WeatherIndex | None:
+        """Return the (lazily built) index for a location, or None if unknown."""
+        if key is None or key not in self.partitions:
+            return None
+        index = self._built.get(key)
+        if index is None:
+            index = build_weather_index(self.partitions[key])
+            self._built[key] = index
+        return index
+
+
+class IncrementalWeatherIndex:
+    """
+    Mutable, time-sorted weather series for live feeds.
+
+    Observations are kept in sorted chunks of roughly chunk_size items
+    with a parallel list of each chunk's last timestamp:
+
+      - in-order appends go to the tail chunk (amortized O(1)),
+      - out-of-order inserts bisect to their chunk and insert there,
+        splitting chunks that grow past 2 * chunk_size,
+      - nearest lookups bisect the chunk maxima, then the chunk (O(log m)),
+      - eviction drops whole chunks and trims at most one.
+
+    With a retention window, observations older than the newest one minus
+    `retention` are evicted after every append.
+    """
+
+    def __init__(
+        self,
+        observations: Iterable[WeatherObs] = (),
+        *,
+        chunk_size: int = 512,
+        retention: timedelta | None = None,
+    ) -> None:
+        if chunk_size <= 0:
+            raise ValueError("chunk_size must be positive")
+        self.chunk_size = chunk_size
+        self.retention = retention
+        self._chunks: list[list[WeatherObs]] = []
+        self._times: list[list[datetime]] = []
+        self._maxes: list[datetime] = []
+        self._len = 0
+        self.extend(observations)
+
+    def __len__(self) -> int:
+        return self._len
+
+    def __iter__(self) -> Iterator[WeatherObs]:
+        for chunk in self._chunks:
+            yield from chunk
+
+    def append(self, obs: WeatherObs) -> None:
+        t = obs.observed_at
+        if not self._chunks or t >= self._maxes[-1]:
+            if not self._chunks or len(self._chunks[-1]) >= self.chunk_size:
+                self._chunks.append([])
+                self._times.append([])
+                self._maxes.append(t)
+            self._chunks[-1].append(obs)
+            self._times[-1].append(t)
+            self._maxes[-1] = t
+        else:
+            self._insert(obs)
+        self._len += 1
+
+        if self.retention is not None:
+            self.evict_before(self._maxes[-1] - self.retention)
+
+    def extend(self, observations: Iterable[WeatherObs]) -> None:
+        for obs in sorted(observations, key=lambda o: o.observed_at):
+            self.append(obs)
+
+    def _insert(self, obs: WeatherObs) -> None:
+        t = obs.observed_at
+        ci = bisect_right(self._maxes, t)  # t < last max, so ci is a valid chunk
+        times = self._times[ci]
+        pos = bisect_right(times, t)
+        times.insert(pos, t)
+        self._chunks[ci].insert(pos, obs)
+
+        if len(times) > 2 * self.chunk_size:
+            half = len(times) // 2
+            self._chunks[ci:ci + 1] = [self._chunks[ci][:half], self._chunks[ci][half:]]
+            self._times[ci:ci + 1] = [times[:half], times[half:]]
+            self._maxes[ci:ci + 1] = [times[half - 1], times[-1]]
+
+    def evict_before(self, cutoff: datetime) -> int:
+        """Drop observations strictly older than cutoff; returns how many were removed."""
+        removed = 0
+
+        drop = bisect_left(self._maxes, cutoff)
+        if drop:
+            removed += sum(len(c) for c in self._chunks[:drop])
+            del self._chunks[:drop], self._times[:drop], self._maxes[:drop]
+
+        if self._chunks:
+            trim = bisect_left(self._times[0], cutoff)
+            if trim:
+                del self._chunks[0][:trim], self._times[0][:trim]
+                removed += trim
+
+        self._len -= removed
+        return removed
+
+    def neighbours(self, at: datetime) -> tuple[WeatherObs | None, WeatherObs | None]:
+        """Return (last observation before `at`, first observation at or after `at`)."""
+        ci = bisect_left(self._maxes, at)
+        if ci == len(self._chunks):
+            return (self._chunks[-1][-1] if self._chunks else None), None
+
+        pos = bisect_left(self._times[ci], at)
+        after = self._chunks[ci][pos]
+        if pos > 0:
+            before = self._chunks[ci][pos - 1]
+        else:
+            before = self._chunks[ci - 1][-1] if ci > 0 else None
+        return before, after
+
+    def nearest(
+        self,
+        run: Run,
+        *,
+        max_gap: timedelta = timedelta(minutes=30),
+        anchor: AnchorStrategy = "midpoint",
+    ) -> WeatherObs | None:
+        at = run_anchor_time(run, anchor)
+        before, after = self.neighbours(at)
+        return _closer(before, after, at, max_gap)
+
+    def snapshot(self) -> WeatherIndex:
+        """Freeze the current contents into an immutable WeatherIndex (O(m), no sort)."""
+        return WeatherIndex(
+            observed_at=tuple(t for times in self._times for t in times),
+            observations=tuple(self),
+        )
+
+
+def run_anchor_time(run: Run, anchor: AnchorStrategy = "midpoint") -> datetime:
+    """Return the run's anchor time (the midpoint unless another strategy is given)."""
+    return run.started_at + timedelta(seconds=run.duration_s * anchor_weight(anchor))
+
+
+class RunBatch(Sequence[Run]):
+    """
+    A batch of runs with their anchor times computed once per strategy.
+
+    Anchors are cached both as datetimes and as int64 UTC epoch
+    microseconds, so aligning the same batch again (another max_gap,
+    another weather source) costs bisects only, with no per-run datetime
+    arithmetic.
+    """
+
+    def __init__(self, runs: Iterable[Run]) -> None:
+        self.runs = tuple(runs)
+        self._anchors: Dict[float, tuple[datetime, ...]] = {}
+        self._anchor_us: Dict[float, array] = {}
+
+    def __len__(self) -> int:
+        return len(self.runs)
+
+    @overload
+    def __getitem__(self, i: int) -> Run: ...
+    @overload
+    def __getitem__(self, i: slice) -> Sequence[Run]: ...
+    def __getitem__(self, i):
+        return self.runs[i]
+
+    def __iter__(self) -> Iterator[Run]:
+        return iter(self.runs)
+
+    def anchors(self, anchor: AnchorStrategy = "midpoint") -> tuple[datetime, ...]:
+        weight = anchor_weight(anchor)
+        cached = self._anchors.get(weight)
+        if cached is None:
+            cached = self._anchors[weight] = tuple(
+                run.started_at + timedelta(seconds=run.duration_s * weight) for run in self.runs
+            )
+        return cached
+
+    def anchor_us(self, anchor: AnchorStrategy = "midpoint") -> array:
+        weight = anchor_weight(anchor)
+        cached = self._anchor_us.get(weight)
+        if cached is None:
+            cached = self._anchor_us[weight] = array("q", [(t - _EPOCH) // _US for t in self.anchors(weight)])
+        return cached
 
-def run_anchor_time(run: Run) -> datetime:
-    """Return the midpoint time of the run."""
-    return run.started_at + timedelta(seconds=run.duration_s / 2.0)
+    def subset(self, positions: Sequence[int]) -> "RunBatch":
+        """The runs at `positions`, keeping whatever anchors are already cached."""
+        out = RunBatch(self.runs[i] for i in positions)
+        for weight, anchors in self._anchors.items():
+            out._anchors[weight] = tuple(anchors[i] for i in positions)
+        for weight, epochs in self._anchor_us.items():
+            out._anchor_us[weight] = array("q", [epochs[i] for i in positions])
+        return out
+
+
+def as_run_batch(runs: Sequence[Run] | RunBatch) -> RunBatch:
+    return runs if isinstance(runs, RunBatch) else RunBatch(runs)
 
 
 def build_weather_index(observations: Sequence[WeatherObs]) -> WeatherIndex:
@@ -31,35 +381,155 @@ def build_weather_index(observations: Sequence[WeatherObs]) -> WeatherIndex:
     )
 
 
+# implicit builds per call site (file, line) of the public function that was
+# handed a plain sequence; a site building more than once is usually a loop
+_implicit_builds: Dict[tuple[str, int], int] = {}
+_implicit_lock = threading.Lock()
+
+
+def implicit_index_builds() -> int:
+    """Number of WeatherIndex builds triggered by passing a plain sequence."""
+    with _implicit_lock:
+        return sum(_implicit_builds.values())
+
+
+def as_weather_index(
+    observations: Sequence[WeatherObs] | WeatherIndex | IncrementalWeatherIndex,
+) -> WeatherIndex:
+    """
+    Return `observations` if it is already an index, else build one.
+
+    An IncrementalWeatherIndex is frozen into an immutable snapshot, which
+    is a linear copy of its already sorted chunks.
+
+    Builds from plain sequences are counted per call site (see
+    implicit_index_builds) and a RuntimeWarning is raised when the same
+    call site builds a second time, which usually means a loop should
+    build the index once with build_weather_index() and pass it in.
+    """
+    if isinstance(observations, WeatherIndex):
+        return observations
+    if isinstance(observations, IncrementalWeatherIndex):
+        return observations.snapshot()
+
+    # the caller of the public entry point, where the warning points (stacklevel=3)
+    caller = sys._getframe(2)
+    site = (caller.f_code.co_filename, caller.f_lineno)
+    with _implicit_lock:
+        builds = _implicit_builds[site] = _implicit_builds.get(site, 0) + 1
+    if builds > 1:
+        warnings.warn(
+            "Rebuilding a WeatherIndex from a plain sequence again at this call site; "
+            "build it once with build_weather_index() and pass the index instead",
+            RuntimeWarning,
+            stacklevel=3,
+        )
+
+    return build_weather_index(observations)
+
+
 def nearest_weather(
     run: Run,
-    observations: Sequence[WeatherObs] | WeatherIndex,
+    observations: Sequence[WeatherObs] | WeatherIndex | IncrementalWeatherIndex,
     *,
     max_gap: timedelta = timedelta(minutes=30),
+    anchor: AnchorStrategy = "midpoint",
 ) -> WeatherObs | None:
     """
     Return the WeatherObs closest in time to the run's anchor time.
     If the closest observation is farther than max_gap away, return None.
 
     Accepts either:
-      - a plain sequence of WeatherObs, or
-      - a prebuilt WeatherIndex for repeated fast lookups.
+      - a plain sequence of WeatherObs,
+      - a prebuilt WeatherIndex for repeated fast lookups, or
+      - a live IncrementalWeatherIndex (queried in place).
     """
-    index = observations if isinstance(observations, WeatherIndex) else build_weather_index(observations)
+    if isinstance(observations, IncrementalWeatherIndex):
+        return observations.nearest(run, max_gap=max_gap, anchor=anchor)
+
+    index = as_weather_index(observations)
 
     if not index.observations:
         return None
 
-    anchor = run_anchor_time(run)
-    pos = bisect_left(index.observed_at, anchor)
+    at = run_anchor_time(run, anchor)
+    pos = bisect_left(index.observed_at, at)
+    return _nearest_around(index, pos, at, max_gap)
+
 
-    candidates: list[WeatherObs] = []
+def nearest_with_gap(
+    runs: Sequence[Run] | RunBatch,
+    observations: Sequence[WeatherObs] | WeatherIndex,
+    *,
+    anchor: AnchorStrategy = "midpoint",
+) -> list[tuple[WeatherObs, int] | None]:
+    """
+    The nearest observation to each run's anchor with its absolute gap in
+    microseconds, whatever the gap (None only when there is no weather).
+
+    The batch's cached anchors are bisected into the index's epoch column
+    and gaps compared as integers; ties go to the earlier observation, as
+    in nearest_weather.
+    """
+    batch = as_run_batch(runs)
+    index = as_weather_index(observations)
+    if not index.observations:
+        return [None] * len(batch)
+
+    times = index.observed_us
+    obs = index.observations
+    n = len(times)
+
+    out: list[tuple[WeatherObs, int] | None] = []
+    for at in batch.anchor_us(anchor):
+        pos = bisect_left(times, at)
+        after = times[pos] - at if pos < n else None
+        before = at - times[pos - 1] if pos > 0 else None
+        if after is not None and (before is None or after < before):
+            out.append((obs[pos], after))
+        else:
+            out.append((obs[pos - 1], before))  # type: ignore[arg-type]
+    return out
+
+
+def nearest_weather_batch(
+    runs: Sequence[Run] | RunBatch,
+    observations: Sequence[WeatherObs] | WeatherIndex,
+    *,
+    max_gap: timedelta = timedelta(minutes=30),
+    anchor: AnchorStrategy = "midpoint",
+) -> list[WeatherObs | None]:
+    """nearest_weather for a whole batch; same results as calling it per run."""
+    limit = max_gap // _US
+    return [
+        None if match is None or match[1] > limit else match[0]
+        for match in nearest_with_gap(runs, observations, anchor=anchor)
+    ]
+
+
+def _nearest_around(
+    index: WeatherIndex,
+    pos: int,
+    anchor: datetime,
+    max_gap: timedelta,
+) -> WeatherObs | None:
+    """Pick the closer of the observations at pos and pos - 1 (ties go earlier)."""
+    obs = index.observations
+    return _closer(
+        obs[pos - 1] if pos > 0 else None,
+        obs[pos] if pos < len(obs) else None,
+        anchor,
+        max_gap,
+    )
 
-    if pos < len(index.observations):
-        candidates.append(index.observations[pos])
 
-    if pos > 0:
-        candidates.append(index.observations[pos - 1])
+def _closer(
+    before: WeatherObs | None,
+    after: WeatherObs | None,
+    anchor: datetime,
+    max_gap: timedelta,
+) -> WeatherObs | None:
+    candidates = [obs for obs in (after, before) if obs is not None]
 
     if not candidates:
         return None
@@ -75,3 +545,130 @@ def nearest_weather(
     return best
 
 
+def _blend(before: WeatherObs, after: WeatherObs, at: datetime) -> WeatherObs:
+    """Linearly interpolate every weather field between two observations."""
+    w = (at - before.observed_at) / (after.observed_at - before.observed_at)
+    return WeatherObs(
+        observed_at=at,
+        temp_c=before.temp_c + w * (after.temp_c - before.temp_c),
+        wind_mps=before.wind_mps + w * (after.wind_mps - before.wind_mps),
+        precipitation_mm=before.precipitation_mm + w * (after.precipitation_mm - before.precipitation_mm),
+        humidity_pct=before.humidity_pct + w * (after.humidity_pct - before.humidity_pct),
+        location=before.location,
+        derived=True,
+    )
+
+
+def interpolation_span(max_gap: timedelta, max_span: timedelta | None = None) -> timedelta:
+    """Widest pair of observations interpolate_weather bridges (default: 4 * max_gap)."""
+    return 4 * max_gap if max_span is None else max_span
+
+
+def interpolate_weather(
+    runs: Sequence[Run] | RunBatch,
+    observations: Sequence[WeatherObs] | WeatherIndex,
+    *,
+    max_gap: timedelta = timedelta(minutes=30),
+    max_span: timedelta | None = None,
+    anchor: AnchorStrategy = "midpoint",
+) -> list[WeatherObs | None]:
+    """
+    Estimate the weather at each run's anchor time from the bracketing observations.
+
+    Anchors come from the (cached) RunBatch and are bisected as epoch
+    microseconds. A run between two observations at most max_span apart
+    (default: 4 * max_gap) gets a derived WeatherObs, observed at the
+    anchor, with every field linearly interpolated. The default span
+    reaches past 2 * max_gap so that runs nearest mode would skip between
+    sparse observations still get weather. Runs on an exact
+    observation get that observation; runs outside the observed range or
+    across a wider hole fall back to the nearest observation within max_gap.
+
+    Returns one entry per run, None where nothing usable was found.
+    """
+    index = as_weather_index(observations)
+    span_limit = interpolation_span(max_gap, max_span)
+
+    batch = as_run_batch(runs)
+    if not index.observations:
+        return [None] * len(batch)
+
+    times = index.observed_us
+    obs = index.observations
+    span_us = span_limit // _US
+
+    out: list[WeatherObs | None] = []
+    for at, at_us in zip(batch.anchors(anchor), batch.anchor_us(anchor)):
+        pos = bisect_left(times, at_us)
+        if pos < len(times) and times[pos] == at_us:
+            out.append(obs[pos])
+        elif 0 < pos < len(times) and times[pos] - times[pos - 1] <= span_us:
+            out.append(_blend(obs[pos - 1], obs[pos], at))
+        else:
+            out.append(_nearest_around(index, pos, at, max_gap))
+
+    return out
+
+
+def window_weather(
+    runs: Sequence[Run] | RunBatch,
+    observations: Sequence[WeatherObs] | WeatherIndex,
+    *,
+    max_gap: timedelta = timedelta(minutes=30),
+    temp: WindowTemp = "mean",
+    anchor: AnchorStrategy = "midpoint",
+) -> list[WeatherObs | None]:
+    """
+    Aggregate all observations within [started_at, started_at + duration_s] of each run.
+
+    The result is a derived WeatherObs observed at the run's `anchor` with
+    mean (or max) temperature, peak wind, total precipitation and mean
+    humidity. Sums come from prefix arrays and maxima from sparse tables on
+    the index, so each run costs two bisects no matter how long it is.
+    Runs with no observation inside their window fall back to the nearest
+    observation within max_gap.
+
+    Returns one entry per run, None where nothing usable was found.
+    """
+    if temp not in ("mean", "max"):
+        raise ValueError(f"Unknown window temperature statistic: {temp!r}")
+
+    index = as_weather_index(observations)
+    batch = as_run_batch(runs)
+    if not index.observations:
+        return [None] * len(batch)
+
+    times = index.observed_us
+    tables = index.window_tables
+
+    out: list[WeatherObs | None] = []
+    # window bounds are the start and end anchors, cached on the batch like the lookup anchor
+    for at, at_us, start_us, end_us in zip(
+        batch.anchors(anchor), batch.anchor_us(anchor), batch.anchor_us("start"), batch.anchor_us("end")
+    ):
+        lo = bisect_left(times, start_us)
+        hi = bisect_right(times, end_us)
+
+        if hi == lo:
+            out.append(_nearest_around(index, bisect_left(times, at_us), at, max_gap))
+            continue
+
+        n = hi - lo
+        # clamps only absorb float error from the prefix-sum subtraction
+        out.append(
+            WeatherObs(
+                observed_at=at,
+                temp_c=(
+                    tables.temp_max.query(lo, hi)
+                    if temp == "max"
+                    else (tables.temp_sum[hi] - tables.temp_sum[lo]) / n
+                ),
+                wind_mps=tables.wind_max.query(lo, hi),
+                precipitation_mm=max(0.0, tables.precipitation_sum[hi] - tables.precipitation_sum[lo]),
+                humidity_pct=min(100.0, max(0.0, (tables.humidity_sum[hi] - tables.humidity_sum[lo]) / n)),
+                location=index.observations[lo].location,
+                derived=True,
+            )
+        )
+
+    return out
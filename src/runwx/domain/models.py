@@ -8,6 +8,9 @@ class Run:
     started_at: datetime
     duration_s: int
     distance_m: int
+    location: str | None = None  # weather partition key (station id, grid cell, ...)
+    latitude: float | None = None
+    longitude: float | None = None
 
     def __post_init__(self) -> None:
         if self.started_at.tzinfo is None:
@@ -16,6 +19,12 @@ class Run:
             raise ValueError("duration_s must be positive")
         if self.distance_m <= 0:
             raise ValueError("distance_m must be positive")
+        if (self.latitude is None) != (self.longitude is None):
+            raise ValueError("latitude and longitude must be given together")
+        if self.latitude is not None and not (-90.0 <= self.latitude <= 90.0):
+            raise ValueError("latitude must be between -90 and 90")
+        if self.longitude is not None and not (-180.0 <= self.longitude <= 180.0):
+            raise ValueError("longitude must be between -180 and 180")
 
 
 @dataclass(frozen=True)
@@ -26,6 +35,8 @@ class WeatherObs:
     wind_mps: float
     precipitation_mm: float
     humidity_pct: float  # <-- add
+    location: str | None = None  # station id / grid cell the observation belongs to
+    derived: bool = False  # computed by alignment (interpolated, aggregated), not measured
 
     def __post_init__(self) -> None:
         if self.observed_at.tzinfo is None:
@@ -84,4 +84,6 @@ class RaceResult:
             started_at=event.started_at_utc,
             duration_s=self.duration_s,
             distance_m=event.distance_m,
+            latitude=event.latitude,
+            longitude=event.longitude,
         )
\ No newline at end of file
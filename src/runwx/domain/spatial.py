@@ -0,0 +1,161 @@
+from __future__ import annotations
+
+import math
+from dataclasses import dataclass
+from typing import Iterable, Optional, Sequence, Tuple
+
+from runwx.domain.models import Run
+
+EARTH_RADIUS_KM = 6371.0088
+
+_Point = Tuple[float, float, float]
+# (point, station position, split axis, left child, right child)
+_Node = Tuple[_Point, int, int, Optional["_Node"], Optional["_Node"]]
+
+
+@dataclass(frozen=True)
+class Station:
+    """A weather station or grid cell centre that observations are keyed by."""
+    key: str
+    latitude: float
+    longitude: float
+
+    def __post_init__(self) -> None:
+        if not self.key.strip():
+            raise ValueError("key must be non-empty")
+        if not (-90.0 <= self.latitude <= 90.0):
+            raise ValueError("latitude must be between -90 and 90")
+        if not (-180.0 <= self.longitude <= 180.0):
+            raise ValueError("longitude must be between -180 and 180")
+
+
+def _unit_vector(latitude: float, longitude: float) -> _Point:
+    lat = math.radians(latitude)
+    lon = math.radians(longitude)
+    return (math.cos(lat) * math.cos(lon), math.cos(lat) * math.sin(lon), math.sin(lat))
+
+
+def _chord_to_km(chord: float) -> float:
+    return 2.0 * EARTH_RADIUS_KM * math.asin(min(1.0, chord / 2.0))
+
+
+def _km_to_chord_sq(distance_km: float) -> float:
+    angle = distance_km / EARTH_RADIUS_KM
+    if angle >= math.pi:
+        return math.inf
+    return (2.0 * math.sin(angle / 2.0)) ** 2
+
+
+def _build(points: list[tuple[_Point, int]], depth: int) -> Optional[_Node]:
+    if not points:
+        return None
+    axis = depth % 3
+    points.sort(key=lambda p: p[0][axis])
+    mid = len(points) // 2
+    point, pos = points[mid]
+    return (
+        point,
+        pos,
+        axis,
+        _build(points[:mid], depth + 1),
+        _build(points[mid + 1:], depth + 1),
+    )
+
+
+class StationIndex:
+    """
+    k-d tree over station coordinates for nearest-station lookups.
+
+    Stations are placed on the unit sphere as 3D vectors, so straight-line
+    (chord) distance orders them exactly like great-circle distance and the
+    tree works across the antimeridian and near the poles. Build is
+    O(n log^2 n); each query is O(log n) on average.
+    """
+
+    def __init__(self, stations: Iterable[Station]) -> None:
+        self.stations: tuple[Station, ...] = tuple(stations)
+        self._root = _build(
+            [(_unit_vector(s.latitude, s.longitude), pos) for pos, s in enumerate(self.stations)],
+            0,
+        )
+
+    def __len__(self) -> int:
+        return len(self.stations)
+
+    def _nearest(self, target: _Point, limit_sq: float) -> tuple[int, float]:
+        best_pos, best_sq = -1, limit_sq
+        stack: list[tuple[Optional[_Node], float]] = [(self._root, 0.0)]
+
+        while stack:
+            node, bound = stack.pop()
+            if node is None or bound > best_sq:
+                continue
+
+            point, pos, axis, left, right = node
+            d_sq = (point[0] - target[0]) ** 2 + (point[1] - target[1]) ** 2 + (point[2] - target[2]) ** 2
+            if d_sq <= best_sq and (d_sq < best_sq or best_pos < 0 or pos < best_pos):
+                best_pos, best_sq = pos, d_sq
+
+            diff = target[axis] - point[axis]
+            near, far = (left, right) if diff < 0 else (right, left)
+            stack.append((far, diff * diff))
+            stack.append((near, 0.0))
+
+        return best_pos, best_sq
+
+    def nearest(
+        self,
+        latitude: float,
+        longitude: float,
+        *,
+        max_distance_km: float | None = None,
+    ) -> tuple[Station, float] | None:
+        """
+        Return (station, distance_km) for the station closest to a point.
+        Returns None if there are no stations or none within max_distance_km.
+        """
+        limit_sq = math.inf if max_distance_km is None else _km_to_chord_sq(max_distance_km)
+        pos, d_sq = self._nearest(_unit_vector(latitude, longitude), limit_sq)
+        if pos < 0:
+            return None
+        return self.stations[pos], _chord_to_km(math.sqrt(d_sq))
+
+    def nearest_many(
+        self,
+        points: Sequence[tuple[float, float]],
+        *,
+        max_distance_km: float | None = None,
+    ) -> list[Station | None]:
+        """Batch nearest-station lookup for (latitude, longitude) points."""
+        limit_sq = math.inf if max_distance_km is None else _km_to_chord_sq(max_distance_km)
+        out: list[Station | None] = []
+        for latitude, longitude in points:
+            pos, _ = self._nearest(_unit_vector(latitude, longitude), limit_sq)
+            out.append(self.stations[pos] if pos >= 0 else None)
+        return out
+
+    def locate_runs(
+        self,
+        runs: Sequence[Run],
+        *,
+        max_distance_km: float | None = None,
+    ) -> list[str | None]:
+        """
+        Resolve each run's weather location key.
+
+        An explicit Run.location wins; otherwise runs with coordinates get
+        the key of the nearest station within max_distance_km. Usable as
+        the `locate` callback of enrich_runs.
+        """
+        keys: list[str | None] = [run.location for run in runs]
+        pending = [
+            i for i, run in enumerate(runs)
+            if run.location is None and run.latitude is not None and run.longitude is not None
+        ]
+        stations = self.nearest_many(
+            [(runs[i].latitude, runs[i].longitude) for i in pending],  # type: ignore[misc]
+            max_distance_km=max_distance_km,
+        )
+        for i, station in zip(pending, stations):
+            keys[i] = station.key if station is not None else None
+        return keys
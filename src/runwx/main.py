@@ -1,16 +1,27 @@
 from __future__ import annotations
 
 import argparse
+import csv
+import dataclasses
+import json
 import logging
+import signal
+import sys
 from datetime import datetime, timedelta, timezone
 from pathlib import Path
+from typing import TYPE_CHECKING, Iterable, TextIO
 
-from runwx.adapters.csv.io_runs import load_runs_csv
-from runwx.adapters.csv.io_weather import load_weather_csv
-from runwx.adapters.sqlite.query_sqlite import fetch_latest_enriched
-from runwx.adapters.sqlite.storage_sqlite import connect, write_pipeline_result
+# Keep module-level imports to the stdlib and light domain/parsing helpers:
+# the CLI is started thousands of times from cron, and commands such as
+# `query` must not pay for pydantic (CSV schemas) or httpx. Each command
+# imports what it needs when it runs (see tests/test_startup.py).
+from runwx.adapters.csv.io_common import parse_datetime_iso
 from runwx.domain.models import Run, WeatherObs
-from runwx.services.pipeline import enrich_runs
+
+if TYPE_CHECKING:
+    from runwx.adapters.sqlite.query_sqlite import EnrichedRow
+    from runwx.domain.align import Locator, MultiWeatherIndex, WeatherIndex
+    from runwx.services.metrics import Metrics
 
 
 def demo_data() -> tuple[list[Run], list[WeatherObs]]:
@@ -47,11 +58,75 @@ def demo_data() -> tuple[list[Run], list[WeatherObs]]:
 
 
 def csv_data(data_dir: Path = Path("data")) -> tuple[list[Run], list[WeatherObs]]:
+    from runwx.adapters.csv.io_runs import load_runs_csv
+    from runwx.adapters.csv.io_weather import load_weather_csv
+
     runs = load_runs_csv(data_dir / "sample_runs.csv")
     weather = load_weather_csv(data_dir / "sample_weather.csv")
     return runs, weather
 
 
+def write_enriched_rows(rows: Iterable[EnrichedRow], fmt: str, stream: TextIO) -> int:
+    """Stream enriched rows to `stream` as text, csv or jsonl; returns rows written."""
+    from runwx.adapters.sqlite.query_sqlite import EnrichedRow
+
+    fields = [f.name for f in dataclasses.fields(EnrichedRow)]
+    count = 0
+
+    if fmt == "csv":
+        writer = csv.writer(stream, lineterminator="\n")
+        writer.writerow(fields)
+        for row in rows:
+            writer.writerow(dataclasses.astuple(row))
+            count += 1
+    elif fmt == "jsonl":
+        for row in rows:
+            stream.write(json.dumps(dataclasses.asdict(row)) + "\n")
+            count += 1
+    elif fmt == "text":
+        for r in rows:
+            stream.write(
+                f"- run {r.started_at} ({r.distance_m}m, {r.duration_s}s)"
+                f" -> weather {r.observed_at} ({r.temp_c}C, wind {r.wind_mps}m/s, rain {r.precipitation_mm}mm)\n"
+            )
+            count += 1
+        if not count:
+            stream.write("- (no rows found)\n")
+    else:
+        raise ValueError(f"Unknown output format: {fmt!r}")
+
+    return count
+
+
+def anchor_arg(text: str) -> str | float:
+    """--anchor value: start, midpoint, end or a weight in [0, 1] along the run."""
+    if text in ("start", "midpoint", "end"):
+        return text
+    try:
+        weight = float(text)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"expected start, midpoint, end or a number in [0, 1], got {text!r}") from None
+    if not 0.0 <= weight <= 1.0:
+        raise argparse.ArgumentTypeError(f"anchor weight must be between 0 and 1, got {text!r}")
+    return weight
+
+
+def gaps_arg(text: str) -> list[int]:
+    """--gaps value: comma-separated max gaps in minutes, e.g. 5,10,15,30,60."""
+    try:
+        gaps = [int(part) for part in text.split(",") if part.strip()]
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"expected comma-separated minutes, got {text!r}") from None
+    if not gaps or min(gaps) < 0:
+        raise argparse.ArgumentTypeError(f"expected one or more non-negative minutes, got {text!r}")
+    return gaps
+
+
+def emit_metrics(metrics: Metrics, fmt: str | None, stream: TextIO) -> None:
+    if fmt == "json":
+        stream.write(json.dumps(metrics.report(), sort_keys=True) + "\n")
+
+
 def configure_logging(level: str) -> None:
     logging.basicConfig(
         level=getattr(logging, level.upper(), logging.INFO),
@@ -64,29 +139,122 @@ def parse_args(argv: list[str] | None = None) -> argparse.Namespace:
         prog="runwx",
         description="Align runs with weather and optionally persist/query SQLite.",
     )
+    p.add_argument("--profile", choices=["cprofile", "tracemalloc"], default=None, help="Profile the whole command; the profile is written next to the db/output file and a summary printed to stderr.")
     sub = p.add_subparsers(dest="cmd")
 
     # run command
     run_p = sub.add_parser("run", help="Run pipeline (default).")
     run_p.add_argument("--csv", action="store_true", help="Load runs/weather from CSV sample files.")
+    run_p.add_argument("--runs", type=str, default=None, help="Runs file, directory or glob (quote it), or '-' for jsonl on stdin. Needs --weather.")
+    run_p.add_argument("--weather", type=str, default=None, help="Weather file, directory or glob (quote it), or '-' for jsonl on stdin. Needs --runs.")
+    run_p.add_argument("--workers", type=int, default=1, help="Worker processes for parsing input files and aligning runs (default: 1).")
+    run_p.add_argument("--input-format", choices=["csv", "jsonl", "parquet"], default=None, help="Format of --runs/--weather (default: from each file's extension, csv otherwise).")
+    run_p.add_argument("--output", choices=["text", "jsonl"], default="text", help="Result format on stdout; jsonl writes one record per run (default: text).")
     run_p.add_argument("--data-dir", type=Path, default=Path("data"), help="Directory containing CSV files (default: data/).")
     run_p.add_argument("--db", type=Path, default=None, help="Path to SQLite db file to write results.")
     run_p.add_argument("--max-gap-min", type=int, default=30, help="Maximum allowed gap in minutes (default: 30).")
+    run_p.add_argument("--stations", type=Path, default=None, help="Stations CSV (key,latitude,longitude) to resolve runs with coordinates to the nearest weather location.")
+    run_p.add_argument("--max-station-km", type=float, default=None, help="Maximum distance to the nearest station in km (default: unlimited).")
+    run_p.add_argument("--align", choices=["nearest", "interpolate", "window"], default="nearest", help="Weather alignment mode (default: nearest).")
+    run_p.add_argument("--window-temp", choices=["mean", "max"], default="mean", help="Temperature statistic for --align window (default: mean).")
+    run_p.add_argument("--anchor", type=anchor_arg, default="midpoint", help="Point of each run matched to weather: start, midpoint, end or a weight in [0, 1] (default: midpoint).")
+    run_p.add_argument("--metrics", choices=["json"], default=None, help="Print per-stage timings and counters to stderr in this format.")
     run_p.add_argument("--log-level", type=str, default="INFO", help="Logging level (DEBUG, INFO, WARNING, ERROR). Default: INFO.")
     run_p.add_argument(
     "--quiet",
     action="store_true",
     help="Suppress human-readable output (logs only).",
+)
+    # sweep command
+    sw_p = sub.add_parser("sweep", help="Align once with nearest mode and report coverage for several max gaps.")
+    sw_p.add_argument("--csv", action="store_true", help="Load runs/weather from CSV sample files.")
+    sw_p.add_argument("--runs", type=str, default=None, help="Runs file, directory or glob (quote it), or '-' for jsonl on stdin. Needs --weather.")
+    sw_p.add_argument("--weather", type=str, default=None, help="Weather file, directory or glob (quote it), or '-' for jsonl on stdin. Needs --runs.")
+    sw_p.add_argument("--workers", type=int, default=1, help="Worker processes for parsing input files (default: 1).")
+    sw_p.add_argument("--input-format", choices=["csv", "jsonl", "parquet"], default=None, help="Format of --runs/--weather (default: from each file's extension, csv otherwise).")
+    sw_p.add_argument("--data-dir", type=Path, default=Path("data"), help="Directory containing CSV files (default: data/).")
+    sw_p.add_argument("--gaps", type=gaps_arg, default=[5, 10, 15, 30, 60], help="Comma-separated max gaps in minutes (default: 5,10,15,30,60).")
+    sw_p.add_argument("--anchor", type=anchor_arg, default="midpoint", help="Point of each run matched to weather: start, midpoint, end or a weight in [0, 1] (default: midpoint).")
+    sw_p.add_argument("--stations", type=Path, default=None, help="Stations CSV (key,latitude,longitude) to resolve runs with coordinates to the nearest weather location.")
+    sw_p.add_argument("--max-station-km", type=float, default=None, help="Maximum distance to the nearest station in km (default: unlimited).")
+    sw_p.add_argument("--metrics", choices=["json"], default=None, help="Print per-stage timings and counters to stderr in this format.")
+    sw_p.add_argument("--log-level", type=str, default="INFO", help="Logging level (DEBUG, INFO, WARNING, ERROR). Default: INFO.")
+    sw_p.add_argument(
+    "--quiet",
+    action="store_true",
+    help="Suppress human-readable output (logs only).",
 )
     # query command
     q_p = sub.add_parser("query", help="Query latest enriched rows from SQLite.")
     q_p.add_argument("--db", type=Path, default=Path("runwx.db"), help="SQLite db path (default: runwx.db).")
     q_p.add_argument("--limit", type=int, default=20, help="Max rows to print (default: 20).")
+    q_p.add_argument("--all", action="store_true", help="Export every enriched row (ignores --limit); streams in constant memory.")
+    q_p.add_argument("--format", choices=["text", "csv", "jsonl", "parquet"], default="text", help="Output format (default: text; parquet needs --out and pyarrow).")
+    q_p.add_argument("--out", type=Path, default=None, help="Write rows to this file instead of stdout (required for --format parquet).")
+    q_p.add_argument("--start", type=parse_datetime_iso, default=None, help="Only runs starting at or after this ISO-8601 time.")
+    q_p.add_argument("--end", type=parse_datetime_iso, default=None, help="Only runs starting before this ISO-8601 time.")
+    q_p.add_argument("--min-distance", type=int, default=None, help="Minimum run distance in meters.")
+    q_p.add_argument("--max-distance", type=int, default=None, help="Maximum run distance in meters.")
+    q_p.add_argument("--min-temp", type=float, default=None, help="Minimum temperature in C.")
+    q_p.add_argument("--max-temp", type=float, default=None, help="Maximum temperature in C.")
+    q_p.add_argument("--min-wind", type=float, default=None, help="Minimum wind speed in m/s.")
+    q_p.add_argument("--max-wind", type=float, default=None, help="Maximum wind speed in m/s.")
+    q_p.add_argument("--min-precip", type=float, default=None, help="Minimum precipitation in mm.")
+    q_p.add_argument("--max-precip", type=float, default=None, help="Maximum precipitation in mm.")
+    q_p.add_argument("--aggregate", choices=["day", "week", "month"], default=None, help="Answer from the rollup tables per period instead of listing rows.")
+    q_p.add_argument("--by", choices=["temp", "wind", "precip"], default="temp", help="Weather bucket for --aggregate (default: temp).")
     q_p.add_argument("--log-level", type=str, default="INFO", help="Logging level (DEBUG, INFO, WARNING, ERROR). Default: INFO.")
     q_p.add_argument(
     "--quiet",
     action="store_true",
     help="Suppress human-readable output (logs only).",
+)
+    # reprocess-skipped command
+    rp_p = sub.add_parser("reprocess-skipped", help="Retry skipped runs against newly loaded weather.")
+    rp_p.add_argument("--db", type=Path, default=Path("runwx.db"), help="SQLite db path (default: runwx.db).")
+    rp_p.add_argument("--weather", type=Path, default=Path("data") / "sample_weather.csv", help="Weather CSV with the newly loaded observations (default: data/sample_weather.csv).")
+    rp_p.add_argument("--max-gap-min", type=int, default=30, help="Maximum allowed gap in minutes (default: 30).")
+    rp_p.add_argument("--align", choices=["nearest", "interpolate", "window"], default="nearest", help="Weather alignment mode (default: nearest).")
+    rp_p.add_argument("--window-temp", choices=["mean", "max"], default="mean", help="Temperature statistic for --align window (default: mean).")
+    rp_p.add_argument("--metrics", choices=["json"], default=None, help="Print per-stage timings and counters to stderr in this format.")
+    rp_p.add_argument("--log-level", type=str, default="INFO", help="Logging level (DEBUG, INFO, WARNING, ERROR). Default: INFO.")
+    rp_p.add_argument(
+    "--quiet",
+    action="store_true",
+    help="Suppress human-readable output (logs only).",
+)
+    # serve command
+    s_p = sub.add_parser("serve", help="Serve enrichment and queries as JSON over HTTP or a Unix socket, keeping the weather index and DB warm.")
+    s_p.add_argument("--weather", type=Path, default=Path("data") / "sample_weather.csv", help="Weather CSV to index at startup (default: data/sample_weather.csv).")
+    s_p.add_argument("--db", type=Path, default=None, help="SQLite db path for /query, /aggregates and persisted /enrich.")
+    s_p.add_argument("--host", type=str, default="127.0.0.1", help="Address to listen on (default: 127.0.0.1).")
+    s_p.add_argument("--port", type=int, default=8765, help="TCP port to listen on (default: 8765).")
+    s_p.add_argument("--socket", type=Path, default=None, help="Listen on this Unix socket instead of TCP.")
+    s_p.add_argument("--max-gap-min", type=int, default=30, help="Maximum allowed gap in minutes (default: 30).")
+    s_p.add_argument("--align", choices=["nearest", "interpolate", "window"], default="nearest", help="Default weather alignment mode (default: nearest).")
+    s_p.add_argument("--window-temp", choices=["mean", "max"], default="mean", help="Temperature statistic for --align window (default: mean).")
+    s_p.add_argument("--stations", type=Path, default=None, help="Stations CSV (key,latitude,longitude) to resolve runs with coordinates to the nearest weather location.")
+    s_p.add_argument("--max-station-km", type=float, default=None, help="Maximum distance to the nearest station in km (default: unlimited).")
+    s_p.add_argument("--log-level", type=str, default="INFO", help="Logging level (DEBUG, INFO, WARNING, ERROR). Default: INFO.")
+    s_p.add_argument(
+    "--quiet",
+    action="store_true",
+    help="Suppress human-readable output (logs only).",
+)
+    # bench command
+    b_p = sub.add_parser("bench", help="Benchmark loaders, alignment and SQLite writes on synthetic data.")
+    b_p.add_argument("--runs", type=int, default=10_000, help="Number of synthetic runs (default: 10000).")
+    b_p.add_argument("--seed", type=int, default=0, help="Seed for the synthetic data generators (default: 0).")
+    b_p.add_argument("--cases", nargs="+", default=None, help="Subsystems to benchmark: csv_runs csv_weather index enrich sqlite_write (default: all).")
+    b_p.add_argument("--no-memory", action="store_true", help="Skip the tracemalloc pass that measures peak memory.")
+    b_p.add_argument("--label", type=str, default=None, help="Free-form label stored in the results (e.g. a git revision).")
+    b_p.add_argument("--out", type=Path, default=None, help="Write results as JSON to this file.")
+    b_p.add_argument("--compare", type=Path, default=None, help="Baseline results JSON to compare throughput against.")
+    b_p.add_argument("--log-level", type=str, default="INFO", help="Logging level (DEBUG, INFO, WARNING, ERROR). Default: INFO.")
+    b_p.add_argument(
+    "--quiet",
+    action="store_true",
+    help="Suppress human-readable output (logs only).",
 )
     args = p.parse_args(argv)
 
@@ -94,9 +262,20 @@ def parse_args(argv: list[str] | None = None) -> argparse.Namespace:
     if args.cmd is None:
         args.cmd = "run"
         args.csv = False
+        args.runs = None
+        args.weather = None
+        args.input_format = None
+        args.workers = 1
+        args.output = "text"
         args.data_dir = Path("data")
         args.db = None
         args.max_gap_min = 30
+        args.align = "nearest"
+        args.window_temp = "mean"
+        args.anchor = "midpoint"
+        args.stations = None
+        args.max_station_km = None
+        args.metrics = None
         args.log_level = "INFO"
         args.quiet = False
 
@@ -106,63 +285,384 @@ def parse_args(argv: list[str] | None = None) -> argparse.Namespace:
 def main(argv: list[str] | None = None) -> None:
     args = parse_args(argv)
     configure_logging(args.log_level)
+
+    if args.profile is None:
+        run_command(args)
+        return
+
+    from runwx.services.profiling import profile_call, profile_path
+
+    base = getattr(args, "db", None) or getattr(args, "out", None) or Path("runwx")
+    output = profile_path(Path(base), args.profile)
+    logging.getLogger("runwx").info("Profiling with %s -> %s", args.profile, output)
+    profile_call(lambda: run_command(args), mode=args.profile, output=output, stream=sys.stderr)
+
+
+def partition_weather(weather: list[WeatherObs]) -> MultiWeatherIndex | None:
+    """
+    Partition located weather by WeatherObs.location; None when no observation has one.
+
+    A mix of located and unlocated observations cannot be routed and is an
+    input error.
+    """
+    from runwx.domain.align import MultiWeatherIndex
+
+    unlocated = sum(obs.location is None for obs in weather)
+    if unlocated == len(weather):
+        return None
+    if unlocated:
+        raise SystemExit(
+            f"Weather mixes located and unlocated observations ({unlocated} of {len(weather)} have no location); "
+            "give every observation a location or none"
+        )
+    return MultiWeatherIndex.from_observations(weather)
+
+
+def station_locator(args: argparse.Namespace, logger: logging.Logger) -> Locator | None:
+    """Locator that resolves runs to their nearest --stations key; None without --stations."""
+    if args.stations is None:
+        return None
+    from runwx.adapters.csv.io_stations import load_stations_csv
+    from runwx.domain.spatial import StationIndex
+
+    station_index = StationIndex(load_stations_csv(args.stations))
+    logger.info("Loaded %s stations from %s", len(station_index), args.stations)
+
+    def locate(batch: list[Run]) -> list[str | None]:
+        return station_index.locate_runs(batch, max_distance_km=args.max_station_km)
+
+    return locate
+
+
+def load_inputs(
+    args: argparse.Namespace,
+    metrics: Metrics,
+    logger: logging.Logger,
+) -> tuple[list[Run], WeatherIndex | MultiWeatherIndex, Locator | None]:
+    """Load runs and weather for run/sweep from --runs/--weather, --csv or the demo data."""
+    from runwx.domain.align import WeatherIndex, build_weather_index
+
+    weather_index: WeatherIndex | None = None
+    if args.runs is not None or args.weather is not None:
+        if args.runs is None or args.weather is None:
+            raise SystemExit("--runs and --weather must be given together")
+        if args.runs == args.weather == "-":
+            raise SystemExit("Only one of --runs/--weather can read stdin")
+        from runwx.adapters.inputs import expand_inputs, load_runs_files, load_weather_index_files
+
+        try:
+            runs_paths = expand_inputs(args.runs)
+            weather_paths = expand_inputs(args.weather)
+        except ValueError as e:
+            raise SystemExit(str(e)) from e
+        with metrics.stage("load"):
+            runs = load_runs_files(runs_paths, fmt=args.input_format, workers=args.workers)
+            weather_index = load_weather_index_files(weather_paths, fmt=args.input_format, workers=args.workers)
+        weather = list(weather_index.observations)
+        logger.info(
+            "Source: %s run files (%s), %s weather files (%s), workers=%s",
+            len(runs_paths),
+            args.runs,
+            len(weather_paths),
+            args.weather,
+            args.workers,
+        )
+    elif args.csv:
+        with metrics.stage("load"):
+            runs, weather = csv_data(args.data_dir)
+        logger.info(
+            "Source: CSV files (%s, %s)",
+            args.data_dir / "sample_runs.csv",
+            args.data_dir / "sample_weather.csv",
+        )
+    else:
+        runs, weather = demo_data()
+        logger.info("Source: demo data")
+
+    weather_source: WeatherIndex | MultiWeatherIndex
+    with metrics.stage("index"):
+        partitioned = partition_weather(weather)
+        if partitioned is not None:
+            weather_source = partitioned
+            logger.info("Weather partitioned into %s locations", len(partitioned))
+        else:
+            weather_source = weather_index if weather_index is not None else build_weather_index(weather)
+
+    locate = station_locator(args, logger)
+    if locate is not None and partitioned is None:
+        logger.warning("Ignoring --stations: weather observations carry no location")
+
+    return runs, weather_source, locate
+
+
+def run_command(args: argparse.Namespace) -> None:
     logger = logging.getLogger("runwx")
     def out(msg: str) -> None:
         if not getattr(args, "quiet", False):
             print(msg)
 
     # --- QUERY MODE ---
-    if args.cmd == "query":
-        logger.info("Querying latest enriched rows from %s (limit=%s)", args.db, args.limit)
+    if args.cmd == "query" and args.aggregate:
+        from runwx.adapters.sqlite.query_sqlite import fetch_aggregates
+        from runwx.adapters.sqlite.storage_sqlite import connect, init_db
+
+        logger.info("Querying %s rollups by %s from %s", args.aggregate, args.by, args.db)
 
         conn = connect(args.db)
-        rows = fetch_latest_enriched(conn, limit=args.limit)
+        init_db(conn)  # backfills rollups for databases written before they existed
+        aggregates = fetch_aggregates(conn, period=args.aggregate, by=args.by)
         conn.close()
 
-        out(f"Latest enriched runs (limit={args.limit}) from {args.db}:")
-        if not rows:
+        out(f"Enriched runs per {args.aggregate} and {args.by} bucket from {args.db}:")
+        if not aggregates:
             out("- (no rows found)")
             return
 
-        for r in rows:
+        for a in aggregates:
             out(
-                f"- run {r.started_at} ({r.distance_m}m, {r.duration_s}s)"
-                f" -> weather {r.observed_at} ({r.temp_c}C, wind {r.wind_mps}m/s, rain {r.precipitation_mm}mm)"
+                f"- {a.period_start} {args.by} [{a.band_start:g}, {a.band_end:g}):"
+                f" runs {a.run_count}, {a.distance_m}m, avg pace {a.avg_pace_s_per_km:.1f}s/km, avg temp {a.avg_temp_c:.1f}C"
             )
         return
 
-    # --- RUN MODE ---
-    if args.csv:
-        runs, weather = csv_data(args.data_dir)
+    if args.cmd == "query":
+        from runwx.adapters.sqlite.query_sqlite import EnrichedFilter, iter_enriched
+        from runwx.adapters.sqlite.storage_sqlite import connect
+
+        if args.format == "parquet" and args.out is None:
+            raise SystemExit("--format parquet requires --out")
+        limit = None if args.all else args.limit
+        logger.info("Querying latest enriched rows from %s (limit=%s)", args.db, limit)
+
+        where = EnrichedFilter(
+            start=args.start,
+            end=args.end,
+            min_distance_m=args.min_distance,
+            max_distance_m=args.max_distance,
+            min_temp_c=args.min_temp,
+            max_temp_c=args.max_temp,
+            min_wind_mps=args.min_wind,
+            max_wind_mps=args.max_wind,
+            min_precipitation_mm=args.min_precip,
+            max_precipitation_mm=args.max_precip,
+        )
+
+        conn = connect(args.db)
+        try:
+            rows = iter_enriched(conn, limit=limit, where=where)
+            if args.format == "text" and args.out is None:
+                out(f"Latest enriched runs (limit={limit}) from {args.db}:")
+                if not args.quiet:
+                    write_enriched_rows(rows, "text", sys.stdout)
+            elif args.format == "parquet":
+                from runwx.adapters.parquet.io_parquet import write_enriched_parquet
+
+                try:
+                    written = write_enriched_parquet(args.out, rows)
+                except RuntimeError as e:  # pyarrow not installed
+                    raise SystemExit(str(e)) from e
+                logger.info("Wrote %s rows to %s", written, args.out)
+            elif args.out is not None:
+                with args.out.open("w", encoding="utf-8", newline="") as f:
+                    if args.format == "text":
+                        f.write(f"Latest enriched runs (limit={limit}) from {args.db}:\n")
+                    written = write_enriched_rows(rows, args.format, f)
+                logger.info("Wrote %s rows to %s", written, args.out)
+            else:
+                write_enriched_rows(rows, args.format, sys.stdout)
+        finally:
+            conn.close()
+        return
+
+    # --- BENCH MODE ---
+    if args.cmd == "bench":
+        if args.runs <= 0:
+            raise SystemExit("--runs must be positive")
+        from runwx.services.bench import bench_report, compare_reports, run_benchmarks
+
+        logger.info("Benchmarking %s synthetic runs (seed=%s)", args.runs, args.seed)
+
+        try:
+            results = run_benchmarks(args.runs, seed=args.seed, cases=args.cases, memory=not args.no_memory)
+        except ValueError as e:
+            raise SystemExit(str(e)) from e
+        report = bench_report(results, n_runs=args.runs, seed=args.seed, label=args.label)
+
+        out(f"Benchmark ({args.runs} runs, seed {args.seed}):")
+        for r in results:
+            peak = "-" if r.peak_bytes is None else f"{r.peak_bytes / 1e6:.1f}MB"
+            out(f"- {r.name:<13} {r.rows:>10} rows {r.seconds:9.3f}s {r.rows_per_s:>12.0f} rows/s  peak {peak}")
+
+        if args.out is not None:
+            args.out.write_text(json.dumps(report, indent=2) + "\n", encoding="utf-8")
+            logger.info("Saved benchmark results to %s", args.out)
+
+        if args.compare is not None:
+            baseline = json.loads(args.compare.read_text(encoding="utf-8"))
+            out(f"Compared with {args.compare} ({baseline.get('label') or 'unlabelled'}):")
+            for name, before, after, ratio in compare_reports(baseline, report):
+                out(f"- {name:<13} {before:>12.0f} -> {after:>12.0f} rows/s ({ratio:.2f}x)")
+        return
+
+    # --- SERVE MODE ---
+    if args.cmd == "serve":
+        from runwx.adapters.csv.io_weather import load_weather_csv
+        from runwx.adapters.http.server import make_server
+        from runwx.adapters.sqlite.storage_sqlite import connect
+        from runwx.domain.align import build_weather_index
+        from runwx.services.serve import WarmService
+
+        weather = load_weather_csv(args.weather)
+        weather_index = partition_weather(weather)
+        if weather_index is None:
+            weather_index = build_weather_index(weather)
+        locate = station_locator(args, logger)
+
+        # request threads share one connection; WarmService serializes access
+        conn = connect(args.db, check_same_thread=False) if args.db is not None else None
+        service = WarmService(
+            weather_index,
+            conn,
+            max_gap=timedelta(minutes=args.max_gap_min),
+            align=args.align,
+            window_temp=args.window_temp,
+            locate=locate,
+        )
+        server = make_server(service, host=args.host, port=args.port, socket_path=args.socket)
+        where = args.socket if args.socket is not None else f"http://{args.host}:{server.server_address[1]}"
+        logger.info("Indexed %s weather observations from %s", len(weather), args.weather)
+        out(f"Serving on {where} (GET /health, POST /enrich, GET /query, GET /aggregates); Ctrl-C to stop")
+
+        def stop(signum, frame) -> None:
+            raise KeyboardInterrupt
+
+        signal.signal(signal.SIGTERM, stop)  # clean up the socket/DB under service managers too
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            server.server_close()
+            service.close()
+        return
+
+    from runwx.services.metrics import NO_METRICS, Metrics, count_statements
+
+    metrics = Metrics() if getattr(args, "metrics", None) else NO_METRICS
+
+    # --- REPROCESS-SKIPPED MODE ---
+    if args.cmd == "reprocess-skipped":
+        from runwx.adapters.csv.io_weather import load_weather_csv
+        from runwx.adapters.sqlite.storage_sqlite import connect
+        from runwx.services.reprocess import reprocess_skipped
+
+        with metrics.stage("load"):
+            weather = load_weather_csv(args.weather)
+        logger.info("Reprocessing skipped runs in %s against %s (%s observations)", args.db, args.weather, len(weather))
+
+        if partition_weather(weather) is not None:
+            raise SystemExit(
+                "reprocess-skipped cannot use located weather: stored skipped runs carry no location "
+                "or coordinates to route them by"
+            )
+
+        conn = connect(args.db)
+        count_statements(conn, metrics)
+        rp = reprocess_skipped(
+            conn,
+            weather,
+            max_gap=timedelta(minutes=args.max_gap_min),
+            align=args.align,
+            window_temp=args.window_temp,
+            metrics=metrics,
+        )
+        conn.close()
+
         logger.info(
-            "Source: CSV files (%s, %s)",
-            args.data_dir / "sample_runs.csv",
-            args.data_dir / "sample_weather.csv",
+            "Reprocess completed: ranges=%s candidates=%s promoted=%s",
+            len(rp.ranges),
+            rp.candidates,
+            rp.promoted,
         )
-    else:
-        runs, weather = demo_data()
-        logger.info("Source: demo data")
+        out(f"Weather ranges: {len(rp.ranges)}")
+        for start, end in rp.ranges:
+            out(f"- {start.isoformat()} .. {end.isoformat()}")
+        out(f"Candidates: {rp.candidates}")
+        out(f"Promoted: {rp.promoted}")
+        out(f"Still skipped: {len(rp.result.skipped)}")
+        emit_metrics(metrics, args.metrics, sys.stderr)
+        return
+
+    # --- SWEEP MODE ---
+    if args.cmd == "sweep":
+        from runwx.services.sweep import format_coverage_table, sweep_gaps
 
-    result = enrich_runs(runs, weather, max_gap=timedelta(minutes=args.max_gap_min))
+        runs, weather_source, locate = load_inputs(args, metrics, logger)
+        try:
+            sweep = sweep_gaps(
+                runs,
+                weather_source,
+                [timedelta(minutes=m) for m in args.gaps],
+                anchor=args.anchor,
+                locate=locate,
+                metrics=metrics,
+            )
+        except ValueError as e:
+            raise SystemExit(str(e)) from e
+        logger.info("Sweep completed: %s runs, %s thresholds", len(runs), len(sweep.max_gaps))
+
+        out(f"Coverage of {len(runs)} runs per max gap:")
+        for line in format_coverage_table(sweep.coverage()):
+            out(line)
+        emit_metrics(metrics, args.metrics, sys.stderr)
+        return
+
+    # --- RUN MODE ---
+    from runwx.services.pipeline import enrich_runs
+
+    runs, weather_source, locate = load_inputs(args, metrics, logger)
+
+    result = enrich_runs(
+        runs,
+        weather_source,
+        max_gap=timedelta(minutes=args.max_gap_min),
+        align=args.align,
+        window_temp=args.window_temp,
+        anchor=args.anchor,
+        locate=locate,
+        metrics=metrics,
+        workers=args.workers,
+    )
     logger.info("Pipeline completed: enriched=%s skipped=%s", len(result.enriched), len(result.skipped))
 
-    # keep prints as the user-facing report
-    out(f"\nEnriched: {len(result.enriched)}")
-    for item in result.enriched:
-        r = item.run
-        w = item.weather
-        out(
-            f"- run @ {r.started_at.isoformat()} ({r.distance_m}m, {r.duration_s}s)"
-            f" -> weather @ {w.observed_at.isoformat()} ({w.temp_c}C, wind {w.wind_mps}m/s, rain {w.precipitation_mm}mm)"
-        )
+    if args.output == "jsonl":
+        from runwx.adapters.jsonl.io_jsonl import write_pipeline_jsonl
 
-    out(f"\nSkipped: {len(result.skipped)}")
-    for s in result.skipped:
-        out(f"- run @ {s.run.started_at.isoformat()} -> {s.reason}")
+        write_pipeline_jsonl(result, sys.stdout)
+    else:
+        # keep prints as the user-facing report
+        out(f"\nEnriched: {len(result.enriched)}")
+        for item in result.enriched:
+            r = item.run
+            w = item.weather
+            out(
+                f"- run @ {r.started_at.isoformat()} ({r.distance_m}m, {r.duration_s}s)"
+                f" -> weather @ {w.observed_at.isoformat()} ({w.temp_c}C, wind {w.wind_mps}m/s, rain {w.precipitation_mm}mm)"
+            )
+
+        out(f"\nSkipped: {len(result.skipped)}")
+        for code, n in result.skip_counts().items():
+            out(f"  {code.name.lower()}: {n}")
+        for s in result.skipped:
+            out(f"- run @ {s.run.started_at.isoformat()} -> {s.reason}")
 
     if args.db is not None:
+        from runwx.adapters.sqlite.storage_sqlite import connect, write_pipeline_result
+
         conn = connect(args.db)
-        enriched_created, skipped_created = write_pipeline_result(conn, result)
+        count_statements(conn, metrics)
+        with metrics.stage("persist"):
+            enriched_created, skipped_created = write_pipeline_result(conn, result)
         conn.close()
         logger.info(
             "Saved to SQLite: enriched_created=%s skipped_created=%s db=%s",
@@ -171,6 +671,8 @@ def main(argv: list[str] | None = None) -> None:
             args.db,
         )
 
+    emit_metrics(metrics, args.metrics, sys.stderr)
+
 
 if __name__ == "__main__":
     main()
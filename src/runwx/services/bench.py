@@ -0,0 +1,238 @@
+from __future__ import annotations
+
+import csv
+import platform
+import random
+import tempfile
+import tracemalloc
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from time import perf_counter
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+from runwx.adapters.csv.io_runs import load_runs_csv
+from runwx.adapters.csv.io_weather import load_weather_csv
+from runwx.adapters.sqlite.storage_sqlite import connect, write_pipeline_result
+from runwx.domain.align import build_weather_index
+from runwx.domain.models import Run, WeatherObs
+from runwx.services.pipeline import enrich_runs
+from runwx.services.profiling import reset_traced_peak
+
+BENCH_CASES = ("csv_runs", "csv_weather", "index", "enrich", "sqlite_write")
+
+_EPOCH = datetime(2026, 1, 1, tzinfo=timezone.utc)
+_WEATHER_STEP = timedelta(minutes=15)
+
+
+@dataclass(frozen=True)
+class BenchResult:
+    name: str
+    rows: int
+    seconds: float
+    peak_bytes: Optional[int] = None
+
+    @property
+    def rows_per_s(self) -> float:
+        return self.rows / self.seconds if self.seconds > 0 else float("inf")
+
+    def to_dict(self) -> dict:
+        return {
+            "name": self.name,
+            "rows": self.rows,
+            "seconds": round(self.seconds, 6),
+            "rows_per_s": round(self.rows_per_s, 1),
+            "peak_bytes": self.peak_bytes,
+        }
+
+
+def synthetic_runs(n: int, *, seed: int = 0, start: datetime = _EPOCH) -> list[Run]:
+    """Generate `n` runs in time order, 10-50 minutes apart, reproducible for a given seed."""
+    rng = random.Random(seed)
+    runs: list[Run] = []
+    t = start
+    for _ in range(n):
+        t += timedelta(minutes=rng.randint(10, 50))
+        duration_s = rng.randint(1200, 7200)
+        pace_s_per_km = rng.uniform(240.0, 420.0)
+        runs.append(Run(started_at=t, duration_s=duration_s, distance_m=int(duration_s / pace_s_per_km * 1000)))
+    return runs
+
+
+def synthetic_weather(
+    start: datetime,
+    end: datetime,
+    *,
+    seed: int = 0,
+    step: timedelta = _WEATHER_STEP,
+    outage_rate: float = 0.01,
+) -> list[WeatherObs]:
+    """
+    Generate observations every `step` between start and end.
+
+    With probability `outage_rate` per step the feed drops out for two
+    hours, so a realistic share of runs has no weather in range.
+    """
+    rng = random.Random(seed)
+    weather: list[WeatherObs] = []
+    t = start
+    temp_c = 5.0
+    while t <= end:
+        if rng.random() < outage_rate:
+            t += timedelta(hours=2)
+            continue
+        temp_c = min(35.0, max(-15.0, temp_c + rng.uniform(-0.5, 0.5)))
+        weather.append(
+            WeatherObs(
+                observed_at=t,
+                temp_c=round(temp_c, 1),
+                wind_mps=round(rng.uniform(0.0, 12.0), 1),
+                precipitation_mm=round(rng.choice((0.0, 0.0, 0.0, rng.uniform(0.0, 4.0))), 1),
+                humidity_pct=round(rng.uniform(30.0, 100.0), 1),
+            )
+        )
+        t += step
+    return weather
+
+
+def synthetic_dataset(n_runs: int, *, seed: int = 0) -> tuple[list[Run], list[WeatherObs]]:
+    """Runs plus weather covering their whole span (about three observations per run)."""
+    runs = synthetic_runs(n_runs, seed=seed)
+    if not runs:
+        return runs, []
+    last = runs[-1]
+    weather = synthetic_weather(
+        runs[0].started_at - timedelta(hours=1),
+        last.started_at + timedelta(seconds=last.duration_s) + timedelta(hours=1),
+        seed=seed + 1,
+    )
+    return runs, weather
+
+
+def write_runs_csv(path: Path, runs: Sequence[Run]) -> None:
+    with path.open("w", encoding="utf-8", newline="") as f:
+        writer = csv.writer(f)
+        writer.writerow(["started_at", "duration_s", "distance_m"])
+        for run in runs:
+            writer.writerow([run.started_at.isoformat(), run.duration_s, run.distance_m])
+
+
+def write_weather_csv(path: Path, weather: Sequence[WeatherObs]) -> None:
+    with path.open("w", encoding="utf-8", newline="") as f:
+        writer = csv.writer(f)
+        writer.writerow(["observed_at", "temp_c", "wind_mps", "precipitation_mm", "humidity_pct"])
+        for obs in weather:
+            writer.writerow([obs.observed_at.isoformat(), obs.temp_c, obs.wind_mps, obs.precipitation_mm, obs.humidity_pct])
+
+
+def _measure(name: str, rows: int, fn: Callable[[], object], *, memory: bool) -> BenchResult:
+    # time without tracemalloc (it slows allocation-heavy code several-fold),
+    # then repeat under tracemalloc for the peak
+    started = perf_counter()
+    fn()
+    seconds = perf_counter() - started
+
+    peak: Optional[int] = None
+    if memory:
+        # already tracing under `runwx --profile tracemalloc`: measure
+        # relative to the current usage and leave the outer trace running,
+        # keeping its peak for the profile summary
+        nested = tracemalloc.is_tracing()
+        if nested:
+            reset_traced_peak()
+        else:
+            tracemalloc.start()
+        try:
+            baseline, _ = tracemalloc.get_traced_memory()
+            fn()
+            _, peak = tracemalloc.get_traced_memory()
+            peak -= baseline
+        finally:
+            if not nested:
+                tracemalloc.stop()
+
+    return BenchResult(name=name, rows=rows, seconds=seconds, peak_bytes=peak)
+
+
+def run_benchmarks(
+    n_runs: int,
+    *,
+    seed: int = 0,
+    cases: Sequence[str] | None = None,
+    memory: bool = True,
+    workdir: Path | None = None,
+) -> list[BenchResult]:
+    """
+    Time each subsystem on a synthetic dataset of `n_runs` runs.
+
+    CSV files and SQLite databases are written under `workdir` (a
+    temporary directory by default). `cases` defaults to all of BENCH_CASES.
+    """
+    cases = BENCH_CASES if cases is None else tuple(cases)
+    unknown = set(cases) - set(BENCH_CASES)
+    if unknown:
+        raise ValueError(f"Unknown bench cases: {sorted(unknown)}")
+
+    runs, weather = synthetic_dataset(n_runs, seed=seed)
+    results: list[BenchResult] = []
+
+    with tempfile.TemporaryDirectory(dir=workdir) as tmp:
+        tmp_path = Path(tmp)
+
+        if "csv_runs" in cases:
+            runs_csv = tmp_path / "runs.csv"
+            write_runs_csv(runs_csv, runs)
+            results.append(_measure("csv_runs", len(runs), lambda: load_runs_csv(runs_csv), memory=memory))
+
+        if "csv_weather" in cases:
+            weather_csv = tmp_path / "weather.csv"
+            write_weather_csv(weather_csv, weather)
+            results.append(_measure("csv_weather", len(weather), lambda: load_weather_csv(weather_csv), memory=memory))
+
+        if "index" in cases:
+            results.append(_measure("index", len(weather), lambda: build_weather_index(weather), memory=memory))
+
+        if "enrich" in cases or "sqlite_write" in cases:
+            weather_index = build_weather_index(weather)
+            result = enrich_runs(runs, weather_index)
+
+            if "enrich" in cases:
+                results.append(_measure("enrich", len(runs), lambda: enrich_runs(runs, weather_index), memory=memory))
+
+            if "sqlite_write" in cases:
+                dbs = iter(range(2))
+
+                def write() -> None:
+                    conn = connect(tmp_path / f"bench-{next(dbs)}.db")
+                    try:
+                        write_pipeline_result(conn, result)
+                    finally:
+                        conn.close()
+
+                results.append(_measure("sqlite_write", len(runs), write, memory=memory))
+
+    return results
+
+
+def bench_report(results: Sequence[BenchResult], *, n_runs: int, seed: int, label: str | None = None) -> dict:
+    return {
+        "label": label,
+        "runs": n_runs,
+        "seed": seed,
+        "python": platform.python_version(),
+        "results": [r.to_dict() for r in results],
+    }
+
+
+def compare_reports(baseline: dict, current: dict) -> list[Tuple[str, float, float, float]]:
+    """
+    Match cases by name; returns (name, baseline rows/s, current rows/s, ratio).
+    A ratio below 1.0 is a throughput regression.
+    """
+    before: Dict[str, float] = {r["name"]: r["rows_per_s"] for r in baseline.get("results", [])}
+    out: List[Tuple[str, float, float, float]] = []
+    for r in current.get("results", []):
+        name = r["name"]
+        if name in before and before[name] > 0:
+            out.append((name, before[name], r["rows_per_s"], r["rows_per_s"] / before[name]))
+    return out
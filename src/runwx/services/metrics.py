@@ -0,0 +1,91 @@
+from __future__ import annotations
+
+import sqlite3
+from contextlib import contextmanager, nullcontext
+from time import perf_counter
+from typing import Callable, ContextManager, Dict, Iterator, List
+
+# (kind, name, value): kind is "stage" (value = seconds) or "counter" (value = increment)
+MetricsHook = Callable[[str, str, float], None]
+
+
+class Metrics:
+    """
+    Per-stage wall-clock timers and named counters for one pipeline run.
+
+    Stages are timed with `with metrics.stage("align"): ...` and counters
+    bumped with `metrics.incr("rows.enriched", n)`. Subscribed hooks see
+    every stage timing and counter increment as it happens; `report()`
+    returns the totals as a JSON-ready dict.
+    """
+
+    enabled = True
+
+    def __init__(self) -> None:
+        self.timings: Dict[str, float] = {}
+        self.calls: Dict[str, int] = {}
+        self.counters: Dict[str, int] = {}
+        self._hooks: List[MetricsHook] = []
+
+    def subscribe(self, hook: MetricsHook) -> None:
+        self._hooks.append(hook)
+
+    def unsubscribe(self, hook: MetricsHook) -> None:
+        self._hooks.remove(hook)
+
+    def _emit(self, kind: str, name: str, value: float) -> None:
+        for hook in self._hooks:
+            hook(kind, name, value)
+
+    @contextmanager
+    def _timed(self, name: str) -> Iterator[None]:
+        started = perf_counter()
+        try:
+            yield
+        finally:
+            elapsed = perf_counter() - started
+            self.timings[name] = self.timings.get(name, 0.0) + elapsed
+            self.calls[name] = self.calls.get(name, 0) + 1
+            self._emit("stage", name, elapsed)
+
+    def stage(self, name: str) -> ContextManager[None]:
+        return self._timed(name)
+
+    def incr(self, name: str, n: int = 1) -> None:
+        self.counters[name] = self.counters.get(name, 0) + n
+        self._emit("counter", name, n)
+
+    def report(self) -> dict:
+        return {
+            "stages": {
+                name: {"seconds": round(seconds, 6), "calls": self.calls[name]}
+                for name, seconds in self.timings.items()
+            },
+            "counters": dict(sorted(self.counters.items())),
+        }
+
+
+class _DisabledMetrics(Metrics):
+    """Drop-in no-op used when no metrics are requested."""
+
+    enabled = False
+
+    _NOOP: ContextManager[None] = nullcontext()
+
+    def stage(self, name: str) -> ContextManager[None]:
+        return self._NOOP
+
+    def incr(self, name: str, n: int = 1) -> None:
+        pass
+
+    def subscribe(self, hook: MetricsHook) -> None:
+        raise ValueError("Cannot subscribe to disabled metrics; pass a Metrics() instance")
+
+
+NO_METRICS: Metrics = _DisabledMetrics()
+
+
+def count_statements(conn: sqlite3.Connection, metrics: Metrics, name: str = "db.statements") -> None:
+    """Count every SQL statement `conn` sends to SQLite (one per round trip)."""
+    if metrics.enabled:
+        conn.set_trace_callback(lambda _sql: metrics.incr(name))
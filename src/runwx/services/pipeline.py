@@ -1,18 +1,84 @@
 from __future__ import annotations
 
+from concurrent.futures import ProcessPoolExecutor
 from dataclasses import dataclass
-from datetime import timedelta
-from typing import List, Sequence, Tuple
+from datetime import datetime, timedelta
+from enum import IntEnum
+from typing import Dict, List, Optional, Sequence, Tuple
 
-from runwx.domain.align import build_weather_index, nearest_weather
+from runwx.domain.align import (
+    AlignMode,
+    AnchorStrategy,
+    Locator,
+    MultiWeatherIndex,
+    RunBatch,
+    WeatherIndex,
+    WindowTemp,
+    anchor_weight,
+    as_run_batch,
+    as_weather_index,
+    interpolate_weather,
+    interpolation_span,
+    nearest_weather_batch,
+    window_weather,
+)
 from runwx.domain.enrich import RunWithWeather, attach_weather
 from runwx.domain.models import Run, WeatherObs
+from runwx.services.metrics import NO_METRICS, Metrics
+from runwx.services.shared_index import SharedIndexHandle, SharedWeatherIndex, attached
+
+
+class SkipCode(IntEnum):
+    """Why a run was skipped; the integer is what gets stored."""
+    OTHER = 0  # free text kept from before reasons were structured
+    NO_WEATHER_IN_GAP = 1
+    NO_LOCATION = 2
+    NO_WEATHER_FOR_LOCATION = 3
+    ALIGN_ERROR = 4  # no longer produced: bad runs are classified up front as INVALID_RUN
+    INVALID_RUN = 5
+
+
+_SKIP_TEXT = {
+    SkipCode.OTHER: "{param}",
+    SkipCode.NO_WEATHER_IN_GAP: "No weather within {param}",
+    SkipCode.NO_LOCATION: "No location for run",
+    SkipCode.NO_WEATHER_FOR_LOCATION: "No weather for location {param!r}",
+    SkipCode.ALIGN_ERROR: "{param}",
+    SkipCode.INVALID_RUN: "Invalid run: {param}",
+}
+
+
+@dataclass(frozen=True)
+class SkipReason:
+    """
+    A skip code plus its parameter (the max gap, the missing location or
+    the error text). str() gives the human-readable message.
+    """
+    code: SkipCode
+    param: Optional[str] = None
+
+    def __str__(self) -> str:
+        return _SKIP_TEXT[self.code].format(param=self.param)
+
+    @classmethod
+    def parse(cls, text: str) -> "SkipReason":
+        """Recover the structured reason from a message written by str()."""
+        for code in (SkipCode.NO_WEATHER_IN_GAP, SkipCode.NO_WEATHER_FOR_LOCATION, SkipCode.INVALID_RUN):
+            prefix = _SKIP_TEXT[code].split("{", 1)[0]
+            if text.startswith(prefix):
+                param = text[len(prefix):]
+                if code == SkipCode.NO_WEATHER_FOR_LOCATION and len(param) >= 2 and param[0] == param[-1] == "'":
+                    param = param[1:-1]
+                return cls(code, param)
+        if text == _SKIP_TEXT[SkipCode.NO_LOCATION]:
+            return cls(SkipCode.NO_LOCATION)
+        return cls(SkipCode.OTHER, text)
 
 
 @dataclass(frozen=True)
 class SkippedRun:
     run: Run
-    reason: str
+    reason: SkipReason
 
 
 @dataclass(frozen=True)
@@ -20,35 +86,299 @@ class PipelineResult:
     enriched: Tuple[RunWithWeather, ...]
     skipped: Tuple[SkippedRun, ...]
 
+    def skip_counts(self) -> Dict[SkipCode, int]:
+        """Number of skipped runs per code, in code order."""
+        counts: Dict[SkipCode, int] = {}
+        for s in self.skipped:
+            counts[s.reason.code] = counts.get(s.reason.code, 0) + 1
+        return dict(sorted(counts.items()))
 
-def enrich_runs(
+
+# per-run alignment outcome: (matched weather, skip reason if unmatched)
+_Outcome = Tuple[Optional[WeatherObs], Optional[SkipReason]]
+
+_ALIGN_MODES = ("nearest", "interpolate", "window")
+
+
+def validate_runs(runs: Sequence[Run]) -> Dict[int, SkipReason]:
+    """
+    Classify the runs the aligners cannot handle, in one pass and without
+    raising: returns {position: reason} for every bad run. Alignment then
+    only sees valid runs and needs no per-run exception handling.
+    """
+    invalid: Dict[int, SkipReason] = {}
+    for pos, run in enumerate(runs):
+        started = getattr(run, "started_at", None)
+        duration = getattr(run, "duration_s", None)
+
+        if not isinstance(started, datetime):
+            problem = "started_at is not a datetime"
+        elif started.utcoffset() is None:
+            problem = "started_at is not timezone-aware"
+        elif not isinstance(duration, (int, float)) or isinstance(duration, bool) or not duration > 0:
+            problem = "duration_s must be a positive number"
+        elif (datetime.max - started.replace(tzinfo=None)).total_seconds() < duration:
+            problem = "run ends past the supported date range"
+        else:
+            continue
+        invalid[pos] = SkipReason(SkipCode.INVALID_RUN, problem)
+
+    return invalid
+
+
+def _align_runs(
+    runs: RunBatch,
+    weather_index: WeatherIndex,
+    *,
+    max_gap: timedelta,
+    align: AlignMode,
+    window_temp: WindowTemp,
+    anchor: AnchorStrategy,
+) -> List[_Outcome]:
+    """Align runs that passed validate_runs; only a missing match is a skip here."""
+    matches: Sequence[Optional[WeatherObs]]
+    if align == "interpolate":
+        matches = interpolate_weather(runs, weather_index, max_gap=max_gap, anchor=anchor)
+    elif align == "window":
+        matches = window_weather(runs, weather_index, max_gap=max_gap, temp=window_temp, anchor=anchor)
+    else:
+        matches = nearest_weather_batch(runs, weather_index, max_gap=max_gap, anchor=anchor)
+
+    # one shared instance: skip-heavy batches do not repeat the message per run
+    no_weather = SkipReason(SkipCode.NO_WEATHER_IN_GAP, str(max_gap))
+    return [(w, None) if w is not None else (None, no_weather) for w in matches]
+
+
+def _weather_reach(align: AlignMode, max_gap: timedelta) -> timedelta:
+    """
+    How far outside [started_at, end of run] an aligner can look for weather:
+    the interpolation bracket, else the nearest-observation fallback.
+    """
+    if align == "interpolate":
+        return max(interpolation_span(max_gap), max_gap)
+    return max_gap
+
+
+def _shards(runs: Sequence[Run], n: int, margin: timedelta) -> List[Tuple[List[int], datetime, datetime]]:
+    """
+    Split run positions into n time-contiguous shards of equal size, each
+    with the weather time range it can possibly touch.
+    """
+    order = sorted(range(len(runs)), key=lambda i: runs[i].started_at)
+    size = -(-len(order) // n)
+
+    shards = []
+    for k in range(0, len(order), size):
+        positions = order[k:k + size]
+        start = runs[positions[0]].started_at - margin
+        end = max(runs[i].started_at + timedelta(seconds=runs[i].duration_s) for i in positions) + margin
+        shards.append((positions, start, end))
+    return shards
+
+
+def _align_shared_shard(
+    handle: SharedIndexHandle,
+    runs: RunBatch,
+    start: datetime,
+    end: datetime,
+    **align_kwargs,
+) -> List[_Outcome]:
+    """Worker side: attach to the shared index and align against the shard's slice of it."""
+    return _align_runs(runs, attached(handle).to_weather_index(start, end), **align_kwargs)
+
+
+def _align_parallel(
+    runs: RunBatch,
+    weather_index: WeatherIndex,
+    *,
+    workers: int,
+    max_gap: timedelta,
+    align: AlignMode,
+    **align_kwargs,
+) -> List[_Outcome]:
+    """
+    Align time shards of runs in worker processes.
+
+    Every mode only looks at observations inside [started_at, end of run]
+    widened by _weather_reach (the interpolation span for interpolate,
+    max_gap for the nearest fallback of every mode). The index is
+    exported once into shared memory; each worker attaches to it by name
+    and materializes just its shard's slice, so nothing but the runs and
+    a small handle is pickled per task. Results match the serial run
+    (window sums up to float rounding) and are put back in input order.
+    """
+    outcomes: List[Optional[_Outcome]] = [None] * len(runs)
+    shared = SharedWeatherIndex.export(weather_index)
+    try:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            jobs = [
+                (
+                    positions,
+                    pool.submit(
+                        _align_shared_shard,
+                        shared.handle,
+                        runs.subset(positions),
+                        start,
+                        end,
+                        max_gap=max_gap,
+                        align=align,
+                        **align_kwargs,
+                    ),
+                )
+                for positions, start, end in _shards(runs, workers, _weather_reach(align, max_gap))
+            ]
+            for positions, job in jobs:
+                for pos, outcome in zip(positions, job.result()):
+                    outcomes[pos] = outcome
+    finally:
+        shared.unlink()
+
+    return outcomes  # type: ignore[return-value]
+
+
+def route_by_location(
     runs: Sequence[Run],
-    weather: Sequence[WeatherObs],
+    weather: MultiWeatherIndex,
+    locate: Optional[Locator] = None,
+) -> Tuple[List[Tuple[WeatherIndex, List[int]]], Dict[int, SkipReason]]:
+    """
+    Group run positions by location partition.
+
+    The location comes from `locate(runs)` if given, else from Run.location.
+    Returns the (partition index, positions) groups plus {position: reason}
+    for runs with no location or no weather at theirs.
+    """
+    keys = locate(runs) if locate is not None else [run.location for run in runs]
+
+    by_key: Dict[Optional[str], List[int]] = {}
+    for pos, key in enumerate(keys):
+        by_key.setdefault(key, []).append(pos)
+
+    groups: List[Tuple[WeatherIndex, List[int]]] = []
+    unrouted: Dict[int, SkipReason] = {}
+    for key, positions in by_key.items():
+        index = weather.get(key)
+        if index is not None:
+            groups.append((index, positions))
+            continue
+        if key is None:
+            reason = SkipReason(SkipCode.NO_LOCATION)
+        else:
+            reason = SkipReason(SkipCode.NO_WEATHER_FOR_LOCATION, key)
+        unrouted.update((pos, reason) for pos in positions)
+
+    return groups, unrouted
+
+
+def count_result(metrics: Metrics, result: PipelineResult, *, prefix: str = "") -> None:
+    """Count enriched and skipped rows, and skips per SkipCode, as `prefix`-ed counters."""
+    if not metrics.enabled:
+        return
+    metrics.incr(f"{prefix}rows.enriched", len(result.enriched))
+    metrics.incr(f"{prefix}rows.skipped", len(result.skipped))
+    for code, n in result.skip_counts().items():
+        metrics.incr(f"{prefix}skipped.{code.name.lower()}", n)
+
+
+def _align_by_location(
+    runs: RunBatch,
+    weather: MultiWeatherIndex,
+    locate: Optional[Locator],
+    **align_kwargs,
+) -> List[_Outcome]:
+    """Route runs to their location partition, align per partition, keep input order."""
+    groups, unrouted = route_by_location(runs, weather, locate)
+
+    outcomes: List[Optional[_Outcome]] = [None] * len(runs)
+    for pos, reason in unrouted.items():
+        outcomes[pos] = (None, reason)
+    for index, positions in groups:
+        group_outcomes = _align_runs(runs.subset(positions), index, **align_kwargs)
+        for pos, outcome in zip(positions, group_outcomes):
+            outcomes[pos] = outcome
+
+    return outcomes  # type: ignore[return-value]
+
+
+def enrich_runs(
+    runs: Sequence[Run] | RunBatch,
+    weather: Sequence[WeatherObs] | WeatherIndex | MultiWeatherIndex,
     *,
     max_gap: timedelta = timedelta(minutes=30),
+    align: AlignMode = "nearest",
+    window_temp: WindowTemp = "mean",
+    anchor: AnchorStrategy = "midpoint",
+    locate: Optional[Locator] = None,
+    metrics: Metrics = NO_METRICS,
+    workers: int = 1,
 ) -> PipelineResult:
     """
-    Orchestrate: align (nearest_weather) + enrich (attach_weather).
+    Orchestrate: align (nearest, interpolated or duration-window weather) + enrich (attach_weather).
+
+    Pass a prebuilt WeatherIndex (or MultiWeatherIndex) to reuse it across
+    calls; a plain sequence is indexed on every call. Likewise pass a
+    RunBatch to reuse its anchor times (see `anchor`: start, midpoint,
+    end or a weight along the run) across calls with other max_gap values
+    or weather sources.
+
+    With a MultiWeatherIndex, each run is matched against its own location's
+    observations; the location comes from `locate(runs)` if given, else
+    from Run.location.
+
+    Pass a Metrics instance to time the validate/index/align/enrich stages and count
+    rows and skips per SkipCode.
+
+    Runs the aligners cannot handle (naive or missing started_at, a
+    non-positive duration, ...) are classified in one up-front pass and
+    skipped as SkipCode.INVALID_RUN; they never reach alignment.
+
+    With workers > 1, runs are split into time shards aligned in that many
+    processes (single-location weather only; a MultiWeatherIndex is
+    aligned in-process).
     """
-    enriched: List[RunWithWeather] = []
-    skipped: List[SkippedRun] = []
+    if align not in _ALIGN_MODES:
+        raise ValueError(f"Unknown align mode: {align!r}")
+    anchor_weight(anchor)  # reject unknown strategies before any work
 
-    weather_index = build_weather_index(weather)
+    all_runs = runs = as_run_batch(runs)
+    with metrics.stage("validate"):
+        invalid = validate_runs(runs)
+        if invalid:
+            valid = [pos for pos in range(len(all_runs)) if pos not in invalid]
+            runs = all_runs.subset(valid)
 
-    for run in runs:
-        try:
-            w = nearest_weather(run, weather_index, max_gap=max_gap)
-            if w is None:
-                skipped.append(
-                    SkippedRun(run=run, reason=f"No weather within {max_gap}")
-                )
-                continue
+    align_kwargs = dict(max_gap=max_gap, align=align, window_temp=window_temp, anchor=anchor)
+    if isinstance(weather, MultiWeatherIndex):
+        with metrics.stage("align"):
+            outcomes = _align_by_location(runs, weather, locate, **align_kwargs)
+    else:
+        with metrics.stage("index"):
+            weather_index = as_weather_index(weather)
+        with metrics.stage("align"):
+            if workers > 1 and len(runs) >= 2 * workers:
+                outcomes = _align_parallel(runs, weather_index, workers=workers, **align_kwargs)
+            else:
+                outcomes = _align_runs(runs, weather_index, **align_kwargs)
 
-            enriched.append(attach_weather(run, w))
+    if invalid:
+        # invalid runs keep their reason; valid positions are filled from outcomes
+        merged: List[_Outcome] = [(None, invalid.get(pos)) for pos in range(len(all_runs))]
+        for pos, outcome in zip(valid, outcomes):
+            merged[pos] = outcome
+        runs, outcomes = all_runs, merged
+
+    enriched: List[RunWithWeather] = []
+    skipped: List[SkippedRun] = []
+    with metrics.stage("enrich"):
+        for run, (w, reason) in zip(runs, outcomes):
+            if w is None:
+                skipped.append(SkippedRun(run=run, reason=reason or SkipReason(SkipCode.OTHER, "")))
+            else:
+                enriched.append(attach_weather(run, w))
 
-        except Exception as e:
-            skipped.append(
-                SkippedRun(run=run, reason=f"{type(e).__name__}: {e}")
-            )
+    result = PipelineResult(enriched=tuple(enriched), skipped=tuple(skipped))
+    if metrics.enabled:
+        metrics.incr("rows.runs", len(runs))
+    count_result(metrics, result)
 
-    return PipelineResult(enriched=tuple(enriched), skipped=tuple(skipped))
\ No newline at end of file
+    return result
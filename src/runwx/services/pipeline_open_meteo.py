@@ -4,6 +4,7 @@ from datetime import timedelta, timezone
 from typing import Sequence
 
 from runwx.adapters.weather.open_meteo import OpenMeteoClient
+from runwx.domain.align import AlignMode, WindowTemp
 from runwx.domain.models import Run
 from runwx.services.pipeline import PipelineResult, enrich_runs
 
@@ -15,6 +16,8 @@ def enrich_runs_with_open_meteo(
     longitude: float,
     client: OpenMeteoClient | None = None,
     max_gap: timedelta = timedelta(minutes=30),
+    align: AlignMode = "nearest",
+    window_temp: WindowTemp = "mean",
 ) -> PipelineResult:
     """
     Fetch weather from Open-Meteo for the overall run date range, then
@@ -36,4 +39,4 @@ def enrich_runs_with_open_meteo(
         end_date=end_date,
     )
 
-    return enrich_runs(runs, weather, max_gap=max_gap)
\ No newline at end of file
+    return enrich_runs(runs, weather, max_gap=max_gap, align=align, window_temp=window_temp)
\ No newline at end of file
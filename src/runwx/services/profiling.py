@@ -0,0 +1,102 @@
+from __future__ import annotations
+
+import cProfile
+import io
+import pstats
+import tracemalloc
+from pathlib import Path
+from typing import Callable, Literal, TextIO, TypeVar
+
+ProfileMode = Literal["cprofile", "tracemalloc"]
+
+PROFILE_SUFFIXES = {
+    "cprofile": ".prof",
+    "tracemalloc": ".tracemalloc",
+}
+
+T = TypeVar("T")
+
+# highest tracemalloc peak seen before a nested reset_traced_peak()
+_saved_peak = 0
+
+
+def profile_path(base: Path, mode: ProfileMode) -> Path:
+    """Place the profile next to `base` (e.g. runwx.db -> runwx.db.prof)."""
+    return base.with_name(base.name + PROFILE_SUFFIXES[mode])
+
+
+def reset_traced_peak() -> None:
+    """
+    tracemalloc.reset_peak() for code running inside a traced profile_call:
+    the peak reached so far is kept, and the summary reports the higher one.
+    """
+    global _saved_peak
+    _, peak = tracemalloc.get_traced_memory()
+    _saved_peak = max(_saved_peak, peak)
+    tracemalloc.reset_peak()
+
+
+def profile_call(
+    fn: Callable[[], T],
+    *,
+    mode: ProfileMode,
+    output: Path,
+    stream: TextIO,
+    top: int = 15,
+) -> T:
+    """
+    Run `fn` under cProfile or tracemalloc, save the raw profile to
+    `output` and print a top-N summary to `stream`.
+
+    cProfile output loads with pstats / snakeviz; tracemalloc output with
+    tracemalloc.Snapshot.load(). The summary is written even if `fn` raises.
+    """
+    global _saved_peak
+
+    if mode == "cprofile":
+        profiler = cProfile.Profile()
+        try:
+            return profiler.runcall(fn)
+        finally:
+            profiler.dump_stats(str(output))
+            stream.write(f"cProfile written to {output}; top {top} by cumulative time:\n")
+            _print_hot_functions(profiler, stream, top)
+
+    if mode == "tracemalloc":
+        _saved_peak = 0
+        tracemalloc.start(10)
+        try:
+            return fn()
+        finally:
+            snapshot = tracemalloc.take_snapshot()
+            _, peak = tracemalloc.get_traced_memory()
+            peak = max(peak, _saved_peak)
+            tracemalloc.stop()
+            snapshot.dump(str(output))
+            stream.write(f"tracemalloc snapshot written to {output}; peak {peak / 1e6:.1f}MB; top {top} allocation sites:\n")
+            _print_allocation_sites(snapshot, stream, top)
+
+    raise ValueError(f"Unknown profile mode: {mode!r}")
+
+
+def _print_hot_functions(profiler: cProfile.Profile, stream: TextIO, top: int) -> None:
+    buf = io.StringIO()
+    pstats.Stats(profiler, stream=buf).sort_stats("cumulative").print_stats(top)
+    # drop pstats' preamble and keep the table
+    lines = buf.getvalue().splitlines()
+    start = next((i for i, line in enumerate(lines) if line.lstrip().startswith("ncalls")), 0)
+    for line in lines[start:]:
+        if line.strip():
+            stream.write(line + "\n")
+
+
+def _print_allocation_sites(snapshot: tracemalloc.Snapshot, stream: TextIO, top: int) -> None:
+    snapshot = snapshot.filter_traces(
+        (
+            tracemalloc.Filter(False, tracemalloc.__file__),
+            tracemalloc.Filter(False, "<frozen importlib._bootstrap*>"),
+        )
+    )
+    for stat in snapshot.statistics("lineno")[:top]:
+        frame = stat.traceback[0]
+        stream.write(f"{stat.size / 1024:10.1f} KiB {stat.count:8d} blocks  {frame.filename}:{frame.lineno}\n")
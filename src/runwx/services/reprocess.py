@@ -0,0 +1,126 @@
+from __future__ import annotations
+
+import sqlite3
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from typing import List, Sequence, Tuple
+
+from runwx.adapters.sqlite.query_sqlite import (
+    fetch_max_skipped_duration_s,
+    fetch_skipped_runs_in_range,
+)
+from runwx.adapters.sqlite.storage_sqlite import init_db, promote_skipped
+from runwx.domain.align import (
+    AlignMode,
+    MultiWeatherIndex,
+    WeatherIndex,
+    WindowTemp,
+    as_weather_index,
+    interpolation_span,
+)
+from runwx.domain.models import Run, WeatherObs
+from runwx.services.metrics import NO_METRICS, Metrics
+from runwx.services.pipeline import PipelineResult, enrich_runs
+
+
+@dataclass(frozen=True)
+class ReprocessResult:
+    ranges: Tuple[Tuple[datetime, datetime], ...]
+    candidates: int
+    promoted: int
+    result: PipelineResult
+
+
+def weather_time_ranges(
+    observations: Sequence[WeatherObs],
+    *,
+    max_gap: timedelta = timedelta(minutes=30),
+    max_hole: timedelta | None = None,
+) -> list[tuple[datetime, datetime]]:
+    """
+    Collapse observations into the time ranges they cover.
+
+    Consecutive observations more than max_hole (default: 2 * max_gap)
+    apart start a new range, since no run anchor can be within max_gap of
+    both sides of such a hole.
+    """
+    hole = 2 * max_gap if max_hole is None else max_hole
+    times = sorted(obs.observed_at for obs in observations)
+    if not times:
+        return []
+
+    ranges: list[tuple[datetime, datetime]] = []
+    start = prev = times[0]
+    for t in times[1:]:
+        if t - prev > hole:
+            ranges.append((start, prev))
+            start = t
+        prev = t
+    ranges.append((start, prev))
+    return ranges
+
+
+def reprocess_skipped(
+    conn: sqlite3.Connection,
+    weather: Sequence[WeatherObs] | WeatherIndex | MultiWeatherIndex,
+    *,
+    max_gap: timedelta = timedelta(minutes=30),
+    align: AlignMode = "nearest",
+    window_temp: WindowTemp = "mean",
+    metrics: Metrics = NO_METRICS,
+) -> ReprocessResult:
+    """
+    Retry previously skipped runs against newly loaded weather.
+
+    Only skipped runs whose anchor can fall within max_gap of the new
+    weather ranges are read back, aligned and (if matched) promoted into
+    run_with_weather. Runs that still do not match stay in skipped_runs.
+
+    Skipped runs are stored without a location or coordinates, so they
+    cannot be routed to a location partition: a MultiWeatherIndex is
+    rejected.
+    """
+    if isinstance(weather, MultiWeatherIndex):
+        raise ValueError("Skipped runs are stored without a location; reprocess them against unpartitioned weather")
+    init_db(conn)
+
+    with metrics.stage("index"):
+        weather_index = as_weather_index(weather)
+    # interpolation bridges holes up to its span, not just 2 * max_gap
+    max_hole = max(interpolation_span(max_gap), 2 * max_gap) if align == "interpolate" else None
+    ranges = weather_time_ranges(weather_index.observations, max_gap=max_gap, max_hole=max_hole)
+    if not ranges:
+        return ReprocessResult(ranges=(), candidates=0, promoted=0, result=PipelineResult(enriched=(), skipped=()))
+
+    # anchor = started_at + duration/2, so a run can start up to half of the
+    # longest skipped duration before the padded range and still be in reach;
+    # window mode matches any observation up to the run's end, a full duration.
+    longest = fetch_max_skipped_duration_s(conn)
+    lead = timedelta(seconds=longest if align == "window" else longest / 2.0)
+
+    seen: set[tuple[datetime, int, int]] = set()
+    candidates: List[Run] = []
+    for start, end in ranges:
+        for run in fetch_skipped_runs_in_range(conn, start=start - max_gap - lead, end=end + max_gap):
+            key = (run.started_at, run.duration_s, run.distance_m)
+            if key not in seen:
+                seen.add(key)
+                candidates.append(run)
+
+    result = enrich_runs(
+        candidates,
+        weather_index,
+        max_gap=max_gap,
+        align=align,
+        window_temp=window_temp,
+        metrics=metrics,
+    )
+    with metrics.stage("persist"):
+        promoted = promote_skipped(conn, result.enriched)
+
+    return ReprocessResult(
+        ranges=tuple(ranges),
+        candidates=len(candidates),
+        promoted=promoted,
+        result=result,
+    )
@@ -0,0 +1,89 @@
+from __future__ import annotations
+
+import sqlite3
+import threading
+from datetime import timedelta
+from typing import Optional, Sequence
+
+from runwx.adapters.sqlite.query_sqlite import (
+    AggregateRow,
+    EnrichedFilter,
+    EnrichedRow,
+    fetch_aggregates,
+    iter_enriched,
+)
+from runwx.adapters.sqlite.storage_sqlite import init_db, write_pipeline_result
+from runwx.domain.align import AlignMode, Locator, MultiWeatherIndex, WeatherIndex, WindowTemp
+from runwx.domain.models import Run
+from runwx.services.pipeline import PipelineResult, enrich_runs
+
+
+class WarmService:
+    """
+    Long-lived pipeline state for `runwx serve`.
+
+    Holds the weather index (built once at startup) and an open SQLite
+    connection so each request only pays for its own alignment or query.
+    Calls are serialized with a lock, so one instance can back a
+    threaded server.
+    """
+
+    def __init__(
+        self,
+        weather: WeatherIndex | MultiWeatherIndex,
+        conn: sqlite3.Connection | None = None,
+        *,
+        max_gap: timedelta = timedelta(minutes=30),
+        align: AlignMode = "nearest",
+        window_temp: WindowTemp = "mean",
+        locate: Optional[Locator] = None,
+    ) -> None:
+        self.weather = weather
+        self.conn = conn
+        self.max_gap = max_gap
+        self.align = align
+        self.window_temp = window_temp
+        self.locate = locate
+        self._lock = threading.Lock()
+        if conn is not None:
+            init_db(conn)
+
+    def _require_db(self) -> sqlite3.Connection:
+        if self.conn is None:
+            raise ValueError("No database configured; start the server with --db")
+        return self.conn
+
+    def enrich(
+        self,
+        runs: Sequence[Run],
+        *,
+        align: AlignMode | None = None,
+        max_gap: timedelta | None = None,
+        persist: bool = False,
+    ) -> tuple[PipelineResult, tuple[int, int] | None]:
+        """Align runs against the warm index; with persist, also write them to the DB."""
+        with self._lock:
+            result = enrich_runs(
+                runs,
+                self.weather,
+                max_gap=self.max_gap if max_gap is None else max_gap,
+                align=self.align if align is None else align,
+                window_temp=self.window_temp,
+                locate=self.locate,
+            )
+            created = write_pipeline_result(self._require_db(), result) if persist else None
+        return result, created
+
+    def query(self, *, limit: int | None = 20, where: EnrichedFilter | None = None) -> list[EnrichedRow]:
+        with self._lock:
+            return list(iter_enriched(self._require_db(), limit=limit, where=where))
+
+    def aggregates(self, *, period: str = "month", by: str = "temp") -> list[AggregateRow]:
+        with self._lock:
+            return fetch_aggregates(self._require_db(), period=period, by=by)
+
+    def close(self) -> None:
+        with self._lock:
+            if self.conn is not None:
+                self.conn.close()
+                self.conn = None
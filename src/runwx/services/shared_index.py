@@ -0,0 +1,141 @@
+from __future__ import annotations
+
+from array import array
+from bisect import bisect_left, bisect_right
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from multiprocessing import shared_memory
+from typing import Dict, Optional, Tuple
+
+from runwx.domain.align import WeatherIndex
+from runwx.domain.models import WeatherObs
+
+_EPOCH = datetime(1970, 1, 1, tzinfo=timezone.utc)
+_US = timedelta(microseconds=1)
+
+# packed columns, in block order: (name, struct format, item size); 8-byte columns first keep every column aligned
+_COLUMNS = (
+    ("observed_at_us", "q", 8),
+    ("temp_c", "d", 8),
+    ("wind_mps", "d", 8),
+    ("precipitation_mm", "d", 8),
+    ("humidity_pct", "d", 8),
+    ("utc_offset_s", "i", 4),  # original offset, so observed_at round-trips exactly
+    ("location", "i", 4),  # index into SharedIndexHandle.locations, -1 for None
+)
+
+
+@dataclass(frozen=True)
+class SharedIndexHandle:
+    """Small picklable reference that workers use to attach to an exported index."""
+    name: str
+    length: int
+    locations: Tuple[str, ...]
+
+
+class SharedWeatherIndex:
+    """
+    A WeatherIndex packed into one multiprocessing.shared_memory block.
+
+    Timestamps are stored as int64 UTC epoch microseconds next to float64
+    weather columns, so worker processes attach by name and read the
+    columns in place through memoryviews: nothing is pickled or re-sorted
+    per worker, and memory stays one copy however many workers attach.
+    Workers materialize WeatherObs only for the time slice they align.
+
+    The exporting process owns the block and must call unlink() when done.
+    """
+
+    def __init__(self, shm: shared_memory.SharedMemory, handle: SharedIndexHandle, *, owner: bool) -> None:
+        self._shm = shm
+        self.handle = handle
+        self._owner = owner
+
+        n = handle.length
+        offset = 0
+        self.columns: Dict[str, memoryview] = {}
+        for name, fmt, size in _COLUMNS:
+            self.columns[name] = shm.buf[offset:offset + n * size].cast(fmt)
+            offset += n * size
+
+    @classmethod
+    def export(cls, index: WeatherIndex) -> "SharedWeatherIndex":
+        obs = index.observations
+        n = len(obs)
+        locations = tuple(sorted({o.location for o in obs if o.location is not None}))
+        codes = {key: i for i, key in enumerate(locations)}
+
+        size = max(1, n * sum(size for _, _, size in _COLUMNS))
+        shm = shared_memory.SharedMemory(create=True, size=size)
+        shared = cls(shm, SharedIndexHandle(name=shm.name, length=n, locations=locations), owner=True)
+
+        cols = shared.columns
+        cols["observed_at_us"][:] = array("q", [(t - _EPOCH) // _US for t in index.observed_at])
+        cols["utc_offset_s"][:] = array("i", [int(t.utcoffset().total_seconds()) for t in index.observed_at])
+        cols["temp_c"][:] = array("d", [o.temp_c for o in obs])
+        cols["wind_mps"][:] = array("d", [o.wind_mps for o in obs])
+        cols["precipitation_mm"][:] = array("d", [o.precipitation_mm for o in obs])
+        cols["humidity_pct"][:] = array("d", [o.humidity_pct for o in obs])
+        cols["location"][:] = array("i", [-1 if o.location is None else codes[o.location] for o in obs])
+        return shared
+
+    @classmethod
+    def attach(cls, handle: SharedIndexHandle) -> "SharedWeatherIndex":
+        return cls(shared_memory.SharedMemory(name=handle.name), handle, owner=False)
+
+    def __len__(self) -> int:
+        return self.handle.length
+
+    def to_weather_index(self, start: Optional[datetime] = None, end: Optional[datetime] = None) -> WeatherIndex:
+        """Materialize the observations with start <= observed_at <= end (all by default)."""
+        ts = self.columns["observed_at_us"]
+        lo = 0 if start is None else bisect_left(ts, (start - _EPOCH) // _US)
+        hi = len(ts) if end is None else bisect_right(ts, (end - _EPOCH) // _US)
+
+        c = self.columns
+        locations = self.handle.locations
+        zones: Dict[int, timezone] = {}
+        observations = tuple(
+            WeatherObs(
+                observed_at=(_EPOCH + timedelta(microseconds=us)).astimezone(
+                    zones.get(offset) or zones.setdefault(offset, timezone(timedelta(seconds=offset)))
+                ),
+                temp_c=temp,
+                wind_mps=wind,
+                precipitation_mm=precip,
+                humidity_pct=humidity,
+                location=None if loc < 0 else locations[loc],
+            )
+            for us, offset, temp, wind, precip, humidity, loc in zip(
+                ts[lo:hi],
+                c["utc_offset_s"][lo:hi],
+                c["temp_c"][lo:hi],
+                c["wind_mps"][lo:hi],
+                c["precipitation_mm"][lo:hi],
+                c["humidity_pct"][lo:hi],
+                c["location"][lo:hi],
+            )
+        )
+        return WeatherIndex(observed_at=tuple(o.observed_at for o in observations), observations=observations)
+
+    def close(self) -> None:
+        for view in self.columns.values():
+            view.release()
+        self.columns = {}
+        self._shm.close()
+
+    def unlink(self) -> None:
+        self.close()
+        if self._owner:
+            self._shm.unlink()
+
+
+_attached: Dict[str, SharedWeatherIndex] = {}
+
+
+def attached(handle: SharedIndexHandle) -> SharedWeatherIndex:
+    """Attach once per worker process and reuse the mapping for later tasks."""
+    shared = _attached.get(handle.name)
+    if shared is None:
+        shared = _attached[handle.name] = SharedWeatherIndex.attach(handle)
+    return shared
@@ -0,0 +1,154 @@
+from __future__ import annotations
+
+from bisect import bisect_left
+from dataclasses import dataclass
+from datetime import timedelta
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+from runwx.domain.align import (
+    AnchorStrategy,
+    Locator,
+    MultiWeatherIndex,
+    RunBatch,
+    WeatherIndex,
+    anchor_weight,
+    as_run_batch,
+    as_weather_index,
+    nearest_with_gap,
+)
+from runwx.domain.enrich import RunWithWeather, attach_weather
+from runwx.domain.models import Run, WeatherObs
+from runwx.services.metrics import NO_METRICS, Metrics
+from runwx.services.pipeline import (
+    PipelineResult,
+    SkipCode,
+    SkippedRun,
+    SkipReason,
+    count_result,
+    route_by_location,
+    validate_runs,
+)
+
+_US = timedelta(microseconds=1)
+
+
+@dataclass(frozen=True)
+class GapCoverage:
+    max_gap: timedelta
+    enriched: int
+    skipped: int
+
+    @property
+    def coverage(self) -> float:
+        total = self.enriched + self.skipped
+        return self.enriched / total if total else 0.0
+
+
+@dataclass(frozen=True)
+class SweepResult:
+    max_gaps: Tuple[timedelta, ...]  # ascending
+    results: Tuple[PipelineResult, ...]  # one per max_gap
+
+    def result_for(self, max_gap: timedelta) -> PipelineResult:
+        return self.results[self.max_gaps.index(max_gap)]
+
+    def coverage(self) -> List[GapCoverage]:
+        return [
+            GapCoverage(max_gap=gap, enriched=len(r.enriched), skipped=len(r.skipped))
+            for gap, r in zip(self.max_gaps, self.results)
+        ]
+
+
+def sweep_gaps(
+    runs: Sequence[Run] | RunBatch,
+    weather: Sequence[WeatherObs] | WeatherIndex | MultiWeatherIndex,
+    max_gaps: Iterable[timedelta],
+    *,
+    anchor: AnchorStrategy = "midpoint",
+    locate: Optional[Locator] = None,
+    metrics: Metrics = NO_METRICS,
+) -> SweepResult:
+    """
+    Nearest-mode enrichment for several max_gap thresholds at once.
+
+    Each run's nearest observation and its absolute gap are found once,
+    whatever the threshold; a single pass then files the run as enriched
+    under every threshold at or above its gap and skipped under the rest.
+    Every result equals enrich_runs(..., max_gap=gap) for that gap.
+
+    Metrics get rows.runs once, and for each threshold the row and
+    per-SkipCode counters enrich_runs emits, prefixed max_gap.<minutes>m.
+    """
+    gaps = tuple(sorted(set(max_gaps)))
+    if not gaps:
+        raise ValueError("At least one max_gap is required")
+    if gaps[0] < timedelta(0):
+        raise ValueError("max_gap must not be negative")
+    anchor_weight(anchor)
+
+    batch = as_run_batch(runs)
+    with metrics.stage("validate"):
+        # reasons that hold under every threshold
+        fixed: Dict[int, SkipReason] = validate_runs(batch)
+        valid = [pos for pos in range(len(batch)) if pos not in fixed]
+
+    matches: List[Optional[Tuple[WeatherObs, int]]] = [None] * len(batch)
+    if isinstance(weather, MultiWeatherIndex):
+        with metrics.stage("align"):
+            groups, unrouted = route_by_location(batch.subset(valid), weather, locate)
+            # route_by_location positions index the valid runs; map them back to the batch
+            fixed.update((valid[i], reason) for i, reason in unrouted.items())
+            for index, group in groups:
+                positions = [valid[i] for i in group]
+                for pos, match in zip(positions, nearest_with_gap(batch.subset(positions), index, anchor=anchor)):
+                    matches[pos] = match
+    else:
+        with metrics.stage("index"):
+            weather_index = as_weather_index(weather)
+        with metrics.stage("align"):
+            for pos, match in zip(valid, nearest_with_gap(batch.subset(valid), weather_index, anchor=anchor)):
+                matches[pos] = match
+
+    limits = [gap // _US for gap in gaps]
+    no_weather = [SkipReason(SkipCode.NO_WEATHER_IN_GAP, str(gap)) for gap in gaps]
+    enriched: List[List[RunWithWeather]] = [[] for _ in gaps]
+    skipped: List[List[SkippedRun]] = [[] for _ in gaps]
+
+    with metrics.stage("partition"):
+        for pos, run in enumerate(batch):
+            match = matches[pos]
+            reason = fixed.get(pos)
+            if reason is not None:
+                item = SkippedRun(run=run, reason=reason)
+                for k in range(len(gaps)):
+                    skipped[k].append(item)
+                continue
+
+            # thresholds from `first` on are wide enough for this run's gap
+            first = len(gaps) if match is None else bisect_left(limits, match[1])
+            for k in range(first):
+                skipped[k].append(SkippedRun(run=run, reason=no_weather[k]))
+            if match is not None and first < len(gaps):
+                enriched_item = attach_weather(run, match[0])
+                for k in range(first, len(gaps)):
+                    enriched[k].append(enriched_item)
+
+    results = tuple(PipelineResult(enriched=tuple(e), skipped=tuple(s)) for e, s in zip(enriched, skipped))
+    if metrics.enabled:
+        metrics.incr("rows.runs", len(batch))
+        # the counters enrich_runs would emit for each threshold, e.g. max_gap.30m.skipped.no_location
+        for gap, result in zip(gaps, results):
+            count_result(metrics, result, prefix=f"max_gap.{gap / timedelta(minutes=1):g}m.")
+
+    return SweepResult(max_gaps=gaps, results=results)
+
+
+def format_coverage_table(rows: Sequence[GapCoverage]) -> List[str]:
+    """Render coverage per threshold as fixed-width text lines."""
+    lines = [f"{'max_gap_min':>11}  {'enriched':>8}  {'skipped':>7}  {'coverage':>8}"]
+    for row in rows:
+        minutes = row.max_gap / timedelta(minutes=1)
+        lines.append(
+            f"{minutes:>11g}  {row.enriched:>8}  {row.skipped:>7}  {row.coverage:>8.1%}"
+        )
+    return lines
@@ -1,6 +1,20 @@
+import warnings
 from datetime import datetime, timedelta, timezone
 
-from runwx.domain.align import build_weather_index, nearest_weather
+import pytest
+
+from runwx.domain.align import (
+    IncrementalWeatherIndex,
+    MultiWeatherIndex,
+    RunBatch,
+    build_weather_index,
+    implicit_index_builds,
+    interpolate_weather,
+    nearest_weather,
+    nearest_weather_batch,
+    run_anchor_time,
+    window_weather,
+)
 from runwx.domain.models import Run, WeatherObs
 
 
@@ -132,3 +146,386 @@ def test_nearest_weather_with_prebuilt_index_respects_max_gap():
     result = nearest_weather(run, index, max_gap=timedelta(minutes=30))
 
     assert result is None
+
+
+def test_interpolate_weather_blends_bracketing_observations():
+    run = Run(
+        started_at=datetime(2026, 2, 1, 10, 0, tzinfo=timezone.utc),
+        duration_s=3600,  # midpoint 10:30
+        distance_m=10_000,
+    )
+    before = WeatherObs(
+        observed_at=datetime(2026, 2, 1, 10, 0, tzinfo=timezone.utc),
+        temp_c=6.0,
+        wind_mps=2.0,
+        precipitation_mm=0.0,
+        humidity_pct=80.0,
+    )
+    after = WeatherObs(
+        observed_at=datetime(2026, 2, 1, 11, 0, tzinfo=timezone.utc),
+        temp_c=8.0,
+        wind_mps=4.0,
+        precipitation_mm=1.0,
+        humidity_pct=60.0,
+    )
+
+    (result,) = interpolate_weather([run], [after, before], max_gap=timedelta(minutes=30))
+
+    assert result == WeatherObs(
+        observed_at=datetime(2026, 2, 1, 10, 30, tzinfo=timezone.utc),
+        temp_c=7.0,
+        wind_mps=3.0,
+        precipitation_mm=0.5,
+        humidity_pct=70.0,
+        derived=True,
+    )
+
+
+def test_interpolate_weather_covers_runs_between_sparse_observations():
+    # midpoint 10:30 is 90 minutes from both observations: nearest skips it
+    run = Run(
+        started_at=datetime(2026, 2, 1, 10, 0, tzinfo=timezone.utc),
+        duration_s=3600,
+        distance_m=10_000,
+    )
+    observations = [
+        WeatherObs(
+            observed_at=datetime(2026, 2, 1, 9, 0, tzinfo=timezone.utc),
+            temp_c=4.0,
+            wind_mps=1.0,
+            precipitation_mm=0.0,
+            humidity_pct=90.0,
+        ),
+        WeatherObs(
+            observed_at=datetime(2026, 2, 1, 12, 0, tzinfo=timezone.utc),
+            temp_c=10.0,
+            wind_mps=1.0,
+            precipitation_mm=0.0,
+            humidity_pct=60.0,
+        ),
+    ]
+
+    index = build_weather_index(observations)
+
+    assert nearest_weather(run, index, max_gap=timedelta(minutes=90)) is not None
+    assert nearest_weather(run, index, max_gap=timedelta(minutes=60)) is None
+
+    (narrow,) = interpolate_weather([run], index, max_gap=timedelta(minutes=60), max_span=timedelta(hours=2))
+    (wide,) = interpolate_weather([run], index, max_gap=timedelta(minutes=60))
+
+    assert narrow is None
+    assert wide is not None
+    assert wide.derived
+    assert wide.temp_c == 7.0
+    assert wide.humidity_pct == 75.0
+
+
+def test_interpolate_weather_falls_back_to_nearest_outside_observed_range():
+    runs = [
+        Run(started_at=datetime(2026, 2, 1, 10, 0, tzinfo=timezone.utc), duration_s=1200, distance_m=3000),  # 10:10
+        Run(started_at=datetime(2026, 2, 1, 13, 0, tzinfo=timezone.utc), duration_s=1200, distance_m=3000),  # 13:10
+        Run(started_at=datetime(2026, 2, 1, 10, 50, tzinfo=timezone.utc), duration_s=1200, distance_m=3000),  # 11:00
+    ]
+    last = WeatherObs(
+        observed_at=datetime(2026, 2, 1, 11, 0, tzinfo=timezone.utc),
+        temp_c=5.0,
+        wind_mps=1.0,
+        precipitation_mm=0.0,
+        humidity_pct=70.0,
+    )
+    first = WeatherObs(
+        observed_at=datetime(2026, 2, 1, 10, 20, tzinfo=timezone.utc),
+        temp_c=3.0,
+        wind_mps=1.0,
+        precipitation_mm=0.0,
+        humidity_pct=70.0,
+    )
+
+    results = interpolate_weather(runs, build_weather_index([first, last]), max_gap=timedelta(minutes=30))
+
+    assert results == [first, None, last]
+
+
+def test_window_weather_aggregates_observations_across_run_duration():
+    run = Run(
+        started_at=datetime(2026, 2, 1, 9, 0, tzinfo=timezone.utc),
+        duration_s=3 * 3600,  # 09:00-12:00, midpoint 10:30
+        distance_m=42_195,
+    )
+    observations = [
+        WeatherObs(
+            observed_at=datetime(2026, 2, 1, hour, 0, tzinfo=timezone.utc),
+            temp_c=temp_c,
+            wind_mps=wind_mps,
+            precipitation_mm=precipitation_mm,
+            humidity_pct=humidity_pct,
+        )
+        for hour, temp_c, wind_mps, precipitation_mm, humidity_pct in [
+            (8, 1.0, 9.0, 5.0, 99.0),  # before the run, ignored
+            (9, 4.0, 2.0, 0.5, 80.0),
+            (10, 6.0, 5.0, 0.0, 70.0),
+            (11, 9.0, 3.0, 1.0, 60.0),
+            (12, 11.0, 4.0, 0.5, 50.0),
+            (13, 20.0, 9.0, 5.0, 10.0),  # after the run, ignored
+        ]
+    ]
+
+    (mean,) = window_weather([run], observations)
+    (peak,) = window_weather([run], build_weather_index(observations), temp="max")
+
+    assert mean is not None and peak is not None
+    assert mean.observed_at == datetime(2026, 2, 1, 10, 30, tzinfo=timezone.utc)
+    assert mean.derived and peak.derived
+    assert mean.temp_c == 7.5
+    assert peak.temp_c == 11.0
+    assert mean.wind_mps == 5.0
+    assert mean.precipitation_mm == 2.0
+    assert mean.humidity_pct == 65.0
+
+
+def test_window_weather_falls_back_to_nearest_for_short_runs():
+    run = Run(
+        started_at=datetime(2026, 2, 1, 10, 5, tzinfo=timezone.utc),
+        duration_s=1800,  # no observation between 10:05 and 10:35
+        distance_m=5_000,
+    )
+    obs = WeatherObs(
+        observed_at=datetime(2026, 2, 1, 10, 0, tzinfo=timezone.utc),
+        temp_c=6.0,
+        wind_mps=2.0,
+        precipitation_mm=0.0,
+        humidity_pct=80.0,
+    )
+
+    index = build_weather_index([obs])
+
+    assert window_weather([run], index, max_gap=timedelta(minutes=30)) == [obs]  # measured, not derived
+    assert window_weather([run], index, max_gap=timedelta(minutes=10)) == [None]
+
+
+def test_window_weather_range_max_matches_brute_force():
+    base = datetime(2026, 2, 1, 0, 0, tzinfo=timezone.utc)
+    observations = [
+        WeatherObs(
+            observed_at=base + timedelta(minutes=10 * i),
+            temp_c=float((i * 7) % 13),
+            wind_mps=float((i * 5) % 11),
+            precipitation_mm=0.0,
+            humidity_pct=50.0,
+        )
+        for i in range(37)
+    ]
+    runs = [
+        Run(started_at=base + timedelta(minutes=10 * start), duration_s=600 * length, distance_m=1000)
+        for start in range(0, 37, 3)
+        for length in (1, 2, 5, 17)
+    ]
+
+    results = window_weather(runs, observations, temp="max")
+
+    for run, result in zip(runs, results):
+        end = run.started_at + timedelta(seconds=run.duration_s)
+        inside = [o for o in observations if run.started_at <= o.observed_at <= end]
+        assert result is not None
+        assert result.temp_c == max(o.temp_c for o in inside)
+        assert result.wind_mps == max(o.wind_mps for o in inside)
+
+
+def test_multi_weather_index_partitions_by_location_and_builds_lazily():
+    def obs(location: str, minute: int) -> WeatherObs:
+        return WeatherObs(
+            observed_at=datetime(2026, 2, 1, 10, minute, tzinfo=timezone.utc),
+            temp_c=float(minute),
+            wind_mps=1.0,
+            precipitation_mm=0.0,
+            humidity_pct=70.0,
+            location=location,
+        )
+
+    multi = MultiWeatherIndex.from_observations([obs("oslo", 40), obs("bergen", 10), obs("oslo", 20)])
+
+    assert len(multi) == 2
+    assert "oslo" in multi and "rome" not in multi
+    assert multi.get("rome") is None
+    assert multi.get(None) is None
+    assert multi._built == {}
+
+    oslo = multi.get("oslo")
+    assert oslo is not None
+    assert [o.temp_c for o in oslo.observations] == [20.0, 40.0]
+    assert multi.get("oslo") is oslo
+    assert set(multi._built) == {"oslo"}
+
+
+def test_multi_weather_index_requires_location_on_observations():
+    unlabelled = WeatherObs(
+        observed_at=datetime(2026, 2, 1, 10, 0, tzinfo=timezone.utc),
+        temp_c=5.0,
+        wind_mps=1.0,
+        precipitation_mm=0.0,
+        humidity_pct=70.0,
+    )
+
+    with pytest.raises(ValueError, match="no location"):
+        MultiWeatherIndex.from_observations([unlabelled])
+
+
+def _hourly(hour: int, temp_c: float = 5.0) -> WeatherObs:
+    return WeatherObs(
+        observed_at=datetime(2026, 2, 1, hour, 0, tzinfo=timezone.utc),
+        temp_c=temp_c,
+        wind_mps=1.0,
+        precipitation_mm=0.0,
+        humidity_pct=70.0,
+    )
+
+
+def test_weather_index_extend_merges_without_touching_original():
+    index = build_weather_index([_hourly(10), _hourly(8), _hourly(12)])
+
+    appended = index.extend([_hourly(14), _hourly(13)])
+    merged = index.extend([_hourly(11), _hourly(7), _hourly(10, temp_c=9.0)])
+
+    assert [o.observed_at.hour for o in index.observations] == [8, 10, 12]
+    assert [o.observed_at.hour for o in appended.observations] == [8, 10, 12, 13, 14]
+    assert [o.observed_at.hour for o in merged.observations] == [7, 8, 10, 10, 11, 12]
+    assert [o.temp_c for o in merged.observations if o.observed_at.hour == 10] == [5.0, 9.0]
+    assert merged.observed_at == tuple(o.observed_at for o in merged.observations)
+    assert index.extend([]) is index
+
+
+def test_multi_weather_index_extend_merges_built_partitions():
+    def located(hour: int, location: str) -> WeatherObs:
+        return WeatherObs(
+            observed_at=datetime(2026, 2, 1, hour, 0, tzinfo=timezone.utc),
+            temp_c=5.0,
+            wind_mps=1.0,
+            precipitation_mm=0.0,
+            humidity_pct=70.0,
+            location=location,
+        )
+
+    multi = MultiWeatherIndex.from_observations([located(10, "oslo")])
+    assert multi.get("oslo") is not None
+
+    multi.extend([located(9, "oslo"), located(9, "rome")])
+
+    assert [o.observed_at.hour for o in multi.get("oslo").observations] == [9, 10]
+    assert [o.observed_at.hour for o in multi.get("rome").observations] == [9]
+
+
+def test_implicit_index_rebuild_is_counted_and_warned_about():
+    run = Run(
+        started_at=datetime(2026, 2, 1, 10, 0, tzinfo=timezone.utc),
+        duration_s=3600,
+        distance_m=10_000,
+    )
+    observations = [_hourly(10), _hourly(11)]
+    index = build_weather_index(observations)
+    before = implicit_index_builds()
+
+    def lookup(weather):
+        return nearest_weather(run, weather)
+
+    with warnings.catch_warnings():
+        warnings.simplefilter("error")
+        for _ in range(3):
+            lookup(index)
+        lookup(observations)
+        nearest_weather(run, observations)  # another call site builds once too
+
+    assert implicit_index_builds() == before + 2
+
+    # the same call site building again is the loop the warning is about
+    with pytest.warns(RuntimeWarning, match="build it once"):
+        lookup(observations)
+
+    assert implicit_index_builds() == before + 3
+
+
+def _minute(minute: int, temp_c: float = 5.0) -> WeatherObs:
+    return WeatherObs(
+        observed_at=datetime(2026, 2, 1, 10, 0, tzinfo=timezone.utc) + timedelta(minutes=minute),
+        temp_c=temp_c,
+        wind_mps=1.0,
+        precipitation_mm=0.0,
+        humidity_pct=70.0,
+    )
+
+
+def test_incremental_index_keeps_order_across_chunk_splits():
+    live = IncrementalWeatherIndex(chunk_size=2)
+    minutes = [0, 10, 20, 30, 40, 5, 15, 25, 35, 1, 2, 3, 50, 45]
+    for m in minutes:
+        live.append(_minute(m))
+
+    assert len(live) == len(minutes)
+    assert [o.observed_at.minute for o in live] == sorted(minutes)
+    assert live.snapshot().observations == tuple(live)
+
+
+def test_incremental_index_nearest_matches_immutable_index():
+    live = IncrementalWeatherIndex([_minute(m) for m in (40, 0, 20)], chunk_size=2)
+    live.extend([_minute(m) for m in (10, 30, 50, 35)])
+    frozen = build_weather_index(list(live))
+
+    for start in range(-40, 60, 3):
+        run = Run(
+            started_at=datetime(2026, 2, 1, 10, 0, tzinfo=timezone.utc) + timedelta(minutes=start),
+            duration_s=600,
+            distance_m=2000,
+        )
+        gap = timedelta(minutes=4)
+        assert nearest_weather(run, live, max_gap=gap) == nearest_weather(run, frozen, max_gap=gap)
+
+
+def test_incremental_index_retention_evicts_old_observations():
+    live = IncrementalWeatherIndex(chunk_size=2, retention=timedelta(minutes=20))
+    for m in range(0, 60, 5):
+        live.append(_minute(m))
+
+    assert [o.observed_at.minute for o in live] == [35, 40, 45, 50, 55]
+    assert live.evict_before(_minute(45).observed_at) == 2
+    assert [o.observed_at.minute for o in live] == [45, 50, 55]
+    assert live.neighbours(_minute(0).observed_at) == (None, _minute(45))
+    assert live.neighbours(_minute(59).observed_at) == (_minute(55), None)
+
+
+def test_run_batch_caches_anchors_per_strategy():
+    runs = [
+        Run(started_at=datetime(2026, 2, 1, 10, 0, tzinfo=timezone.utc), duration_s=3600, distance_m=10_000),
+        Run(started_at=datetime(2026, 2, 1, 12, 0, tzinfo=timezone.utc), duration_s=1201, distance_m=4_000),
+    ]
+    batch = RunBatch(runs)
+
+    assert batch.anchors() == tuple(run_anchor_time(r) for r in runs)
+    assert batch.anchors("start") == tuple(r.started_at for r in runs)
+    assert batch.anchors("end")[0] == datetime(2026, 2, 1, 11, 0, tzinfo=timezone.utc)
+    assert batch.anchors(0.25)[0] == datetime(2026, 2, 1, 10, 15, tzinfo=timezone.utc)
+    assert batch.anchors("midpoint") is batch.anchors(0.5)
+    assert batch.anchor_us("midpoint") is batch.anchor_us()
+    assert list(batch.subset([1]).anchor_us()) == [batch.anchor_us()[1]]
+
+    with pytest.raises(ValueError):
+        batch.anchors("late")
+    with pytest.raises(ValueError):
+        batch.anchors(1.5)
+
+
+@pytest.mark.parametrize("anchor", ["start", "midpoint", "end", 0.3])
+def test_nearest_weather_batch_matches_per_run_lookup(anchor):
+    observations = [_minute(m) for m in (0, 10, 10, 20, 35, 50)]
+    index = build_weather_index(observations)
+    runs = [
+        Run(
+            started_at=datetime(2026, 2, 1, 10, 0, tzinfo=timezone.utc) + timedelta(minutes=start),
+            duration_s=600,
+            distance_m=2000,
+        )
+        for start in range(-20, 60, 1)
+    ]
+    gap = timedelta(minutes=4)
+
+    expected = [nearest_weather(run, index, max_gap=gap, anchor=anchor) for run in runs]
+    assert nearest_weather_batch(RunBatch(runs), index, max_gap=gap, anchor=anchor) == expected
+    assert any(w is None for w in expected) and any(w is not None for w in expected)
@@ -0,0 +1,41 @@
+from runwx.services.bench import (
+    BENCH_CASES,
+    bench_report,
+    compare_reports,
+    run_benchmarks,
+    synthetic_dataset,
+)
+from runwx.services.pipeline import enrich_runs
+
+
+def test_synthetic_dataset_is_deterministic_and_sorted():
+    runs, weather = synthetic_dataset(200, seed=7)
+
+    assert (runs, weather) == synthetic_dataset(200, seed=7)
+    assert runs != synthetic_dataset(200, seed=8)[0]
+    assert len(runs) == 200
+    assert [r.started_at for r in runs] == sorted(r.started_at for r in runs)
+    assert weather[0].observed_at < runs[0].started_at
+
+    result = enrich_runs(runs, weather)
+    assert len(result.enriched) > len(result.skipped)
+
+
+def test_run_benchmarks_reports_every_case(tmp_path):
+    results = run_benchmarks(50, workdir=tmp_path)
+
+    assert [r.name for r in results] == list(BENCH_CASES)
+    assert all(r.rows > 0 and r.seconds >= 0 and r.peak_bytes is not None for r in results)
+    assert list(tmp_path.iterdir()) == []
+
+
+def test_compare_reports_matches_cases_by_name():
+    baseline = {"results": [{"name": "enrich", "rows_per_s": 100.0}, {"name": "index", "rows_per_s": 50.0}]}
+    current = bench_report(run_benchmarks(20, cases=["enrich"], memory=False), n_runs=20, seed=0)
+
+    comparison = compare_reports(baseline, current)
+
+    assert [c[0] for c in comparison] == ["enrich"]
+    name, before, after, ratio = comparison[0]
+    assert before == 100.0
+    assert ratio == after / before
@@ -1,3 +1,7 @@
+import json
+
+import pytest
+
 from runwx.main import main
 
 def test_main_cli_smoke(tmp_path, capsys):
@@ -11,3 +15,104 @@ def test_main_cli_quiet_suppresses_stdout(capsys):
     main(["run", "--quiet"])
     out = capsys.readouterr().out
     assert out == ""
+
+
+def test_main_cli_query_streams_jsonl_and_csv(tmp_path, capsys):
+    db = tmp_path / "runwx.db"
+    main(["run", "--db", str(db), "--quiet"])
+    capsys.readouterr()
+
+    main(["query", "--db", str(db), "--all", "--format", "jsonl"])
+    lines = capsys.readouterr().out.splitlines()
+    assert len(lines) == 2
+    assert json.loads(lines[0])["started_at"] == "2026-02-01T12:00:00+00:00"
+
+    main(["query", "--db", str(db), "--limit", "1", "--format", "csv"])
+    lines = capsys.readouterr().out.splitlines()
+    assert lines[0].startswith("started_at,duration_s,distance_m")
+    assert len(lines) == 2
+
+
+def test_main_cli_metrics_json_goes_to_stderr(tmp_path, capsys):
+    main(["run", "--db", str(tmp_path / "runwx.db"), "--quiet", "--metrics", "json"])
+    captured = capsys.readouterr()
+
+    assert captured.out == ""
+    report = json.loads(captured.err.strip().splitlines()[-1])
+    assert {"index", "align", "enrich", "persist"} <= set(report["stages"])
+    assert report["counters"]["rows.runs"] == 2
+    assert report["counters"]["db.statements"] > 0
+
+
+def test_main_cli_streams_jsonl_in_and_out(tmp_path, capsys):
+    runs = tmp_path / "runs.jsonl"
+    runs.write_text(
+        json.dumps({"started_at": "2026-02-01T10:00:00Z", "duration_s": 3600, "distance_m": 10000}) + "\n",
+        encoding="utf-8",
+    )
+    weather = tmp_path / "weather.csv"
+    weather.write_text(
+        "observed_at,temp_c,wind_mps,precipitation_mm,humidity_pct\n2026-02-01T10:20:00Z,6.5,4.2,0.0,80.0\n",
+        encoding="utf-8",
+    )
+
+    main(["run", "--runs", str(runs), "--weather", str(weather), "--output", "jsonl"])
+    lines = capsys.readouterr().out.splitlines()
+
+    assert len(lines) == 1
+    assert json.loads(lines[0])["weather"]["temp_c"] == 6.5
+
+
+def test_main_cli_sweep_prints_coverage_per_gap(capsys):
+    main(["sweep", "--csv", "--gaps", "30,5,10"])
+    lines = capsys.readouterr().out.splitlines()
+
+    assert lines[1].split() == ["max_gap_min", "enriched", "skipped", "coverage"]
+    assert [line.split()[0] for line in lines[2:]] == ["5", "10", "30"]
+    enriched = [int(line.split()[1]) for line in lines[2:]]
+    assert enriched == sorted(enriched)
+
+
+def test_main_cli_rejects_weather_mixing_located_and_unlocated_rows(tmp_path):
+    runs = tmp_path / "runs.jsonl"
+    runs.write_text(
+        json.dumps({"started_at": "2026-02-01T10:00:00Z", "duration_s": 3600, "distance_m": 10000}) + "\n",
+        encoding="utf-8",
+    )
+    weather = tmp_path / "weather.csv"
+    weather.write_text(
+        "observed_at,temp_c,wind_mps,precipitation_mm,humidity_pct,location\n"
+        "2026-02-01T10:20:00Z,6.5,4.2,0.0,80.0,north\n"
+        "2026-02-01T10:40:00Z,6.9,4.0,0.0,80.0,\n",
+        encoding="utf-8",
+    )
+
+    with pytest.raises(SystemExit, match="1 of 2 have no location"):
+        main(["run", "--runs", str(runs), "--weather", str(weather), "--quiet"])
+
+
+def test_main_cli_reprocess_skipped_rejects_located_weather(tmp_path):
+    weather = tmp_path / "weather.csv"
+    weather.write_text(
+        "observed_at,temp_c,wind_mps,precipitation_mm,humidity_pct,location\n"
+        "2026-02-01T10:20:00Z,6.5,4.2,0.0,80.0,north\n",
+        encoding="utf-8",
+    )
+
+    with pytest.raises(SystemExit, match="cannot use located weather"):
+        main(["reprocess-skipped", "--db", str(tmp_path / "runwx.db"), "--weather", str(weather)])
+
+
+def test_main_cli_query_text_honours_out(tmp_path, capsys):
+    db = tmp_path / "runwx.db"
+    main(["run", "--db", str(db), "--quiet"])
+    capsys.readouterr()
+
+    out_file = tmp_path / "latest.txt"
+    main(["query", "--db", str(db), "--format", "text", "--out", str(out_file)])
+
+    assert capsys.readouterr().out == ""
+    lines = out_file.read_text(encoding="utf-8").splitlines()
+    assert lines[0].startswith("Latest enriched runs")
+    assert len(lines) == 3
+    assert lines[1].startswith("- run 2026-02-01T12:00:00+00:00")
@@ -0,0 +1,92 @@
+import bz2
+import gzip
+import lzma
+from pathlib import Path
+
+import pytest
+
+from runwx.adapters.compression import open_text, strip_compression_suffix
+from runwx.adapters.csv.io_runs import load_runs_csv
+from runwx.adapters.inputs import input_format
+from runwx.adapters.jsonl.io_jsonl import load_runs_jsonl
+from runwx.adapters.races.io_event_json import load_event_json
+from runwx.adapters.races.io_results_csv import load_results_csv
+
+DATA = Path("data")
+
+
+def _zstd_compress(data: bytes) -> bytes:
+    zstandard = pytest.importorskip("zstandard")
+    return zstandard.ZstdCompressor().compress(data)
+
+
+@pytest.mark.parametrize(
+    "suffix, compress",
+    [
+        (".gz", gzip.compress),
+        (".bz2", bz2.compress),
+        (".xz", lzma.compress),
+        (".zst", _zstd_compress),
+    ],
+)
+def test_csv_loaders_read_compressed_files(tmp_path, suffix, compress):
+    raw = (DATA / "sample_runs.csv").read_bytes()
+    path = tmp_path / f"runs.csv{suffix}"
+    path.write_bytes(compress(raw))
+
+    assert load_runs_csv(path) == load_runs_csv(DATA / "sample_runs.csv")
+
+
+def test_race_and_jsonl_adapters_read_compressed_files(tmp_path):
+    event_path = tmp_path / "event.json.gz"
+    event_path.write_bytes(gzip.compress((DATA / "sample_event.json").read_bytes()))
+    results_path = tmp_path / "results.csv.xz"
+    results_path.write_bytes(lzma.compress((DATA / "sample_results.csv").read_bytes()))
+    runs_path = tmp_path / "runs.jsonl.bz2"
+    runs_path.write_bytes(bz2.compress(b'{"started_at": "2026-02-01T10:00:00Z", "duration_s": 60, "distance_m": 200}\n'))
+
+    event = load_event_json(event_path)
+    assert event == load_event_json(DATA / "sample_event.json")
+    assert len(load_results_csv(results_path, event_id=event.event_id)) == 5
+    assert load_runs_jsonl(runs_path)[0].distance_m == 200
+
+
+def test_open_text_streams_lines_and_formats_ignore_compression_suffix(tmp_path):
+    path = tmp_path / "lines.txt.gz"
+    with gzip.open(path, "wt", encoding="utf-8") as f:
+        for i in range(10_000):
+            f.write(f"{i}\n")
+
+    with open_text(path) as f:
+        assert next(f) == "0\n"
+        assert sum(1 for _ in f) == 9_999
+
+    assert strip_compression_suffix(Path("runs.jsonl.zst")) == Path("runs.jsonl")
+    assert strip_compression_suffix(Path("runs.csv")) == Path("runs.csv")
+    assert input_format(Path("runs.jsonl.gz")) == "jsonl"
+    assert input_format(Path("runs.csv.xz")) == "csv"
+
+
+def test_open_text_closes_zstd_file_when_reader_setup_fails(tmp_path, monkeypatch):
+    zstandard = pytest.importorskip("zstandard")
+    path = tmp_path / "runs.csv.zst"
+    path.write_bytes(_zstd_compress(b"started_at\n"))
+
+    opened = []
+    real_open = Path.open
+
+    def tracking_open(self, *args, **kwargs):
+        fh = real_open(self, *args, **kwargs)
+        opened.append(fh)
+        return fh
+
+    class FailingDecompressor:
+        def stream_reader(self, *args, **kwargs):
+            raise MemoryError("no room for the decompression context")
+
+    monkeypatch.setattr(Path, "open", tracking_open)
+    monkeypatch.setattr(zstandard, "ZstdDecompressor", FailingDecompressor)
+
+    with pytest.raises(MemoryError):
+        open_text(path)
+    assert len(opened) == 1 and opened[0].closed
@@ -0,0 +1,70 @@
+import gzip
+from pathlib import Path
+
+import pytest
+
+from runwx.adapters.inputs import expand_inputs, load_runs_files, load_weather_index_files
+from runwx.domain.align import build_weather_index
+from runwx.main import main
+from runwx.services.bench import synthetic_dataset, write_runs_csv, write_weather_csv
+
+
+@pytest.fixture
+def daily_files(tmp_path):
+    runs, weather = synthetic_dataset(120, seed=3)
+    runs_dir = tmp_path / "runs"
+    weather_dir = tmp_path / "weather"
+    runs_dir.mkdir()
+    weather_dir.mkdir()
+
+    for day in range(4):
+        write_runs_csv(runs_dir / f"runs-{day}.csv", runs[day * 30:(day + 1) * 30])
+    # interleaved, unsorted weather chunks so the merge has real work to do
+    for part in range(3):
+        write_weather_csv(weather_dir / f"weather-{part}.csv", list(reversed(weather[part::3])))
+    (weather_dir / "README.txt").write_text("not an input", encoding="utf-8")
+    return runs, weather, runs_dir, weather_dir
+
+
+def test_expand_inputs_handles_directories_globs_and_single_paths(daily_files, tmp_path):
+    _, _, runs_dir, weather_dir = daily_files
+
+    assert [p.name for p in expand_inputs(weather_dir)] == ["weather-0.csv", "weather-1.csv", "weather-2.csv"]
+    assert [p.name for p in expand_inputs(str(runs_dir / "runs-[12].csv"))] == ["runs-1.csv", "runs-2.csv"]
+    assert expand_inputs("-") == [Path("-")]
+    with pytest.raises(ValueError, match="No input files"):
+        expand_inputs(str(tmp_path / "*.parquet"))
+
+
+@pytest.mark.parametrize("workers", [1, 2])
+def test_parallel_loading_matches_sequential_build(daily_files, workers):
+    runs, weather, runs_dir, weather_dir = daily_files
+
+    loaded_runs = load_runs_files(expand_inputs(runs_dir), workers=workers)
+    index = load_weather_index_files(expand_inputs(weather_dir), workers=workers)
+
+    assert loaded_runs == runs
+    assert index == build_weather_index(weather)
+
+
+def test_cli_accepts_globs_of_compressed_files(daily_files, tmp_path, capsys):
+    runs, _, runs_dir, weather_dir = daily_files
+    for path in weather_dir.glob("*.csv"):
+        (weather_dir / (path.name + ".gz")).write_bytes(gzip.compress(path.read_bytes()))
+        path.unlink()
+
+    main(["run", "--runs", str(runs_dir), "--weather", str(weather_dir / "*.csv.gz"), "--workers", "2", "--output", "jsonl"])
+
+    assert len(capsys.readouterr().out.splitlines()) == len(runs)
+
+
+def test_compressed_parquet_is_rejected_when_inputs_are_expanded(daily_files, tmp_path):
+    _, _, runs_dir, weather_dir = daily_files
+    (runs_dir / "runs-9.parquet.gz").write_bytes(gzip.compress(b"PAR1"))
+
+    with pytest.raises(ValueError, match="Compressed parquet is not supported"):
+        expand_inputs(runs_dir)
+    with pytest.raises(ValueError, match="Compressed parquet is not supported"):
+        expand_inputs(runs_dir / "runs-9.parquet.gz")
+    with pytest.raises(SystemExit, match="Compressed parquet is not supported"):
+        main(["run", "--runs", str(runs_dir / "*.gz"), "--weather", str(weather_dir)])
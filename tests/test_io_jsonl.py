@@ -0,0 +1,64 @@
+import io
+import json
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from runwx.adapters.jsonl.io_jsonl import (
+    iter_runs_jsonl,
+    load_runs_jsonl,
+    load_weather_jsonl,
+    write_pipeline_jsonl,
+)
+from runwx.domain.models import Run
+from runwx.services.pipeline import enrich_runs
+
+
+def _run_line(hour: int, **extra) -> str:
+    record = {"started_at": f"2026-02-01T{hour:02d}:00:00Z", "duration_s": 1800, "distance_m": 5000, **extra}
+    return json.dumps(record) + "\n"
+
+
+def test_iter_runs_jsonl_validates_in_batches_and_skips_blank_lines(tmp_path):
+    path = tmp_path / "runs.jsonl"
+    path.write_text("".join(_run_line(h) for h in range(5)) + "\n" + _run_line(6, location="oslo"), encoding="utf-8")
+
+    batches = list(iter_runs_jsonl(path, batch_size=2))
+
+    assert [len(b) for b in batches] == [2, 2, 2]
+    assert batches[0][0] == Run(started_at=datetime(2026, 2, 1, 0, 0, tzinfo=timezone.utc), duration_s=1800, distance_m=5000)
+    assert batches[-1][-1].location == "oslo"
+
+
+def test_jsonl_errors_report_the_input_line():
+    bad_json = io.StringIO(_run_line(1) + "{not json\n")
+    with pytest.raises(ValueError, match="Invalid runs JSONL line 2"):
+        load_runs_jsonl(bad_json)
+
+    bad_value = io.StringIO(_run_line(1) + _run_line(2) + "\n" + _run_line(3, duration_s=0))
+    with pytest.raises(ValueError, match="Invalid runs JSONL line 4"):
+        list(iter_runs_jsonl(bad_value, batch_size=2))
+
+    bad_domain = io.StringIO(_run_line(1, latitude=59.9))
+    with pytest.raises(ValueError, match="Invalid runs JSONL line 1: latitude and longitude"):
+        load_runs_jsonl(bad_domain)
+
+
+def test_write_pipeline_jsonl_round_trips_runs():
+    weather = load_weather_jsonl(
+        io.StringIO(
+            json.dumps(
+                {"observed_at": "2026-02-01T10:10:00Z", "temp_c": 4.0, "wind_mps": 1.0, "precipitation_mm": 0.0, "humidity_pct": 50.0}
+            )
+        )
+    )
+    runs = load_runs_jsonl(io.StringIO(_run_line(10) + _run_line(14)))
+    result = enrich_runs(runs, weather, max_gap=timedelta(minutes=30))
+
+    stream = io.StringIO()
+    assert write_pipeline_jsonl(result, stream) == 2
+
+    records = [json.loads(line) for line in stream.getvalue().splitlines()]
+    assert [r["status"] for r in records] == ["enriched", "skipped"]
+    assert records[0]["weather"]["observed_at"] == "2026-02-01T10:10:00+00:00"
+    assert load_runs_jsonl(io.StringIO("".join(json.dumps(r["run"]) + "\n" for r in records))) == runs
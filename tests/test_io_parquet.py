@@ -0,0 +1,102 @@
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+pa = pytest.importorskip("pyarrow")
+pq = pytest.importorskip("pyarrow.parquet")
+
+from runwx.adapters.parquet.io_parquet import (  # noqa: E402
+    iter_runs_parquet,
+    load_runs_parquet,
+    load_weather_index_parquet,
+    load_weather_parquet,
+    write_runs_parquet,
+    write_weather_parquet,
+)
+from runwx.domain.align import build_weather_index  # noqa: E402
+from runwx.domain.models import Run, WeatherObs  # noqa: E402
+from runwx.main import main  # noqa: E402
+
+
+def _runs(n):
+    base = datetime(2026, 2, 1, 6, 0, tzinfo=timezone.utc)
+    return [Run(started_at=base + timedelta(hours=i), duration_s=1800 + i, distance_m=5000 + i) for i in range(n)]
+
+
+def _weather(hours):
+    base = datetime(2026, 2, 1, 0, 0, tzinfo=timezone.utc)
+    return [
+        WeatherObs(observed_at=base + timedelta(hours=h), temp_c=float(h), wind_mps=2.0, precipitation_mm=0.0, humidity_pct=60.0)
+        for h in hours
+    ]
+
+
+def test_runs_round_trip_in_record_batches(tmp_path):
+    path = tmp_path / "runs.parquet"
+    runs = _runs(25)
+
+    assert write_runs_parquet(path, runs, batch_size=10) == 25
+    assert pq.ParquetFile(path).num_row_groups == 3
+
+    batches = list(iter_runs_parquet(path, batch_size=10))
+    assert [len(b) for b in batches] == [10, 10, 5]
+    assert load_runs_parquet(path) == runs
+
+
+def test_reader_projects_columns_and_accepts_iso_strings(tmp_path):
+    path = tmp_path / "runs.parquet"
+    pq.write_table(
+        pa.table(
+            {
+                "started_at": ["2026-02-01T10:00:00Z"],
+                "duration_s": [3600],
+                "distance_m": [10000],
+                "heart_rate": [150],
+            }
+        ),
+        path,
+    )
+
+    assert load_runs_parquet(path) == [
+        Run(started_at=datetime(2026, 2, 1, 10, 0, tzinfo=timezone.utc), duration_s=3600, distance_m=10000)
+    ]
+
+
+def test_reader_rejects_missing_columns_nulls_and_naive_timestamps(tmp_path):
+    path = tmp_path / "bad.parquet"
+
+    pq.write_table(pa.table({"started_at": ["2026-02-01T10:00:00Z"], "duration_s": [1]}), path)
+    with pytest.raises(ValueError, match="Missing runs Parquet columns"):
+        load_runs_parquet(path)
+
+    pq.write_table(pa.table({"started_at": ["2026-02-01T10:00:00Z"], "duration_s": [None], "distance_m": [1]}), path)
+    with pytest.raises(ValueError, match="has nulls"):
+        load_runs_parquet(path)
+
+    pq.write_table(pa.table({"started_at": [datetime(2026, 2, 1)], "duration_s": [1], "distance_m": [1]}), path)
+    with pytest.raises(ValueError, match="timezone-aware"):
+        load_runs_parquet(path)
+
+    pq.write_table(pa.table({"started_at": ["2026-02-01T10:00:00Z"], "duration_s": [0], "distance_m": [1]}), path)
+    with pytest.raises(ValueError, match="Invalid runs Parquet row 1"):
+        load_runs_parquet(path)
+
+
+def test_weather_index_is_sorted_in_arrow(tmp_path):
+    path = tmp_path / "weather.parquet"
+    weather = _weather([5, 1, 3])
+    write_weather_parquet(path, weather)
+
+    assert load_weather_parquet(path) == weather
+    assert load_weather_index_parquet(path) == build_weather_index(weather)
+
+
+def test_query_exports_parquet(tmp_path):
+    db = tmp_path / "runwx.db"
+    out = tmp_path / "enriched.parquet"
+    main(["run", "--db", str(db), "--quiet"])
+    main(["query", "--db", str(db), "--all", "--format", "parquet", "--out", str(out), "--quiet"])
+
+    table = pq.read_table(out)
+    assert table.num_rows == 2
+    assert table.schema.field("started_at").type == pa.timestamp("us", tz="UTC")
@@ -0,0 +1,73 @@
+import sqlite3
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from runwx.domain.models import Run, WeatherObs
+from runwx.services.metrics import NO_METRICS, Metrics, count_statements
+from runwx.services.pipeline import enrich_runs
+
+
+def test_metrics_times_stages_and_notifies_hooks():
+    metrics = Metrics()
+    events = []
+    metrics.subscribe(lambda kind, name, value: events.append((kind, name)))
+
+    with metrics.stage("align"):
+        pass
+    with metrics.stage("align"):
+        pass
+    metrics.incr("rows.runs", 3)
+
+    report = metrics.report()
+    assert report["stages"]["align"]["calls"] == 2
+    assert report["stages"]["align"]["seconds"] >= 0.0
+    assert report["counters"] == {"rows.runs": 3}
+    assert events == [("stage", "align"), ("stage", "align"), ("counter", "rows.runs")]
+
+
+def test_enrich_runs_counts_rows_and_skip_reasons():
+    runs = [
+        Run(started_at=datetime(2026, 2, 1, hour, 0, tzinfo=timezone.utc), duration_s=1800, distance_m=5000)
+        for hour in (10, 14, 16)
+    ]
+    obs = WeatherObs(
+        observed_at=datetime(2026, 2, 1, 10, 15, tzinfo=timezone.utc),
+        temp_c=6.0,
+        wind_mps=2.0,
+        precipitation_mm=0.0,
+        humidity_pct=70.0,
+    )
+    metrics = Metrics()
+
+    enrich_runs(runs, [obs], max_gap=timedelta(minutes=30), metrics=metrics)
+
+    report = metrics.report()
+    assert set(report["stages"]) == {"validate", "index", "align", "enrich"}
+    assert report["counters"] == {
+        "rows.enriched": 1,
+        "rows.runs": 3,
+        "rows.skipped": 2,
+        "skipped.no_weather_in_gap": 2,
+    }
+
+
+def test_disabled_metrics_record_nothing():
+    with NO_METRICS.stage("align"):
+        NO_METRICS.incr("rows.runs")
+
+    assert NO_METRICS.report() == {"stages": {}, "counters": {}}
+    with pytest.raises(ValueError):
+        NO_METRICS.subscribe(lambda *_: None)
+
+
+def test_count_statements_counts_round_trips():
+    conn = sqlite3.connect(":memory:")
+    metrics = Metrics()
+    count_statements(conn, metrics)
+
+    conn.execute("SELECT 1")
+    conn.execute("SELECT 2")
+    conn.close()
+
+    assert metrics.counters["db.statements"] == 2
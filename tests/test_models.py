@@ -39,6 +39,19 @@ def test_run_distance_must_be_positive():
         Run(started_at=started_at, duration_s=3600, distance_m=-5)
 
 
+def test_run_coordinates_must_be_paired_and_in_range():
+    started_at = datetime(2026, 1, 15, 10, 30, tzinfo=timezone.utc)
+
+    run = Run(started_at=started_at, duration_s=3600, distance_m=10_000, latitude=59.9, longitude=10.7)
+    assert (run.latitude, run.longitude) == (59.9, 10.7)
+
+    with pytest.raises(ValueError, match="latitude and longitude must be given together"):
+        Run(started_at=started_at, duration_s=3600, distance_m=10_000, latitude=59.9)
+
+    with pytest.raises(ValueError, match="latitude must be between -90 and 90"):
+        Run(started_at=started_at, duration_s=3600, distance_m=10_000, latitude=91.0, longitude=0.0)
+
+
 def test_run_is_frozen():
     started_at = datetime(2026, 1, 15, 10, 30, tzinfo=timezone.utc)
     run = Run(started_at=started_at, duration_s=3600, distance_m=10_000)
@@ -1,7 +1,11 @@
 from datetime import datetime, timedelta, timezone
 
+import pytest
+
+from runwx.domain.align import MultiWeatherIndex, RunBatch, build_weather_index
 from runwx.domain.models import Run, WeatherObs
-from runwx.services.pipeline import enrich_runs
+from runwx.services.bench import synthetic_dataset
+from runwx.services.pipeline import SkipCode, SkipReason, enrich_runs
 
 
 def test_enrich_runs_enriches_when_weather_within_gap():
@@ -45,7 +49,7 @@ def test_enrich_runs_skips_when_no_weather_within_gap():
     assert len(result.enriched) == 0
     assert len(result.skipped) == 1
     assert result.skipped[0].run == run
-    assert "No weather within" in result.skipped[0].reason
+    assert "No weather within" in str(result.skipped[0].reason)
 
 
 def test_enrich_runs_mixed_results():
@@ -120,3 +124,199 @@ def test_enrich_runs_still_works_with_indexed_weather_lookup():
     assert len(result.skipped) == 1
     assert result.enriched[0].run == runs[0]
     assert result.skipped[0].run == runs[1]
+
+
+def test_enrich_runs_interpolate_mode_reduces_skips():
+    run = Run(
+        started_at=datetime(2026, 2, 1, 10, 0, tzinfo=timezone.utc),
+        duration_s=3600,   # midpoint 10:30
+        distance_m=10_000,
+    )
+    weather = [
+        WeatherObs(
+            observed_at=datetime(2026, 2, 1, 10, 0, tzinfo=timezone.utc),
+            temp_c=6.0,
+            wind_mps=2.0,
+            precipitation_mm=0.0,
+            humidity_pct=80.0,
+        ),
+        WeatherObs(
+            observed_at=datetime(2026, 2, 1, 11, 0, tzinfo=timezone.utc),
+            temp_c=8.0,
+            wind_mps=2.0,
+            precipitation_mm=0.0,
+            humidity_pct=80.0,
+        ),
+    ]
+
+    # 30 minutes from either observation: outside max_gap for nearest, but
+    # the two bracket the run within the interpolation span
+    index = build_weather_index(weather)
+    nearest = enrich_runs([run], index, max_gap=timedelta(minutes=20))
+    interpolated = enrich_runs([run], index, max_gap=timedelta(minutes=20), align="interpolate")
+
+    assert len(nearest.skipped) == 1
+    assert len(interpolated.enriched) == 1
+    assert interpolated.enriched[0].weather.temp_c == 7.0
+    assert interpolated.enriched[0].weather.observed_at == datetime(2026, 2, 1, 10, 30, tzinfo=timezone.utc)
+
+
+def test_enrich_runs_window_mode_uses_whole_run_duration():
+    run = Run(
+        started_at=datetime(2026, 2, 1, 9, 0, tzinfo=timezone.utc),
+        duration_s=2 * 3600,
+        distance_m=21_097,
+    )
+    weather = [
+        WeatherObs(
+            observed_at=datetime(2026, 2, 1, hour, 0, tzinfo=timezone.utc),
+            temp_c=temp_c,
+            wind_mps=2.0,
+            precipitation_mm=0.4,
+            humidity_pct=80.0,
+        )
+        for hour, temp_c in [(9, 5.0), (10, 7.0), (11, 12.0)]
+    ]
+
+    result = enrich_runs([run], weather, align="window", window_temp="max")
+
+    assert len(result.enriched) == 1
+    assert result.enriched[0].weather.temp_c == 12.0
+    assert round(result.enriched[0].weather.precipitation_mm, 6) == 1.2
+
+
+def test_enrich_runs_routes_runs_to_their_location_partition():
+    def obs(location: str, temp_c: float) -> WeatherObs:
+        return WeatherObs(
+            observed_at=datetime(2026, 2, 1, 10, 20, tzinfo=timezone.utc),
+            temp_c=temp_c,
+            wind_mps=2.0,
+            precipitation_mm=0.0,
+            humidity_pct=80.0,
+            location=location,
+        )
+
+    def run(location: str | None) -> Run:
+        return Run(
+            started_at=datetime(2026, 2, 1, 10, 0, tzinfo=timezone.utc),
+            duration_s=3600,
+            distance_m=10_000,
+            location=location,
+        )
+
+    weather = MultiWeatherIndex.from_observations([obs("oslo", -3.0), obs("rome", 14.0)])
+    runs = [run("rome"), run("oslo"), run("lima"), run(None), run("rome")]
+
+    result = enrich_runs(runs, weather, max_gap=timedelta(minutes=30))
+
+    assert [e.weather.temp_c for e in result.enriched] == [14.0, -3.0, 14.0]
+    assert [e.run for e in result.enriched] == [runs[0], runs[1], runs[4]]
+    assert [str(s.reason) for s in result.skipped] == ["No weather for location 'lima'", "No location for run"]
+
+    located = enrich_runs(runs[2:4], weather, locate=lambda rs: ["oslo"] * len(rs))
+    assert len(located.enriched) == 2
+
+
+@pytest.mark.parametrize("align", ["nearest", "interpolate", "window"])
+def test_enrich_runs_parallel_shards_match_serial(align):
+    runs, weather = synthetic_dataset(300, seed=11)
+    runs = runs[::-1]  # shards are cut by time, results must come back in input order
+    index = build_weather_index(weather)
+
+    serial = enrich_runs(runs, index, max_gap=timedelta(minutes=20), align=align)
+    parallel = enrich_runs(runs, index, max_gap=timedelta(minutes=20), align=align, workers=3)
+
+    assert parallel.skipped == serial.skipped
+    assert [e.run for e in parallel.enriched] == [e.run for e in serial.enriched]
+    # window sums come from prefix sums over a different slice: equal up to rounding
+    for p, s in zip(parallel.enriched, serial.enriched):
+        assert p.weather.observed_at == s.weather.observed_at
+        assert p.weather.precipitation_mm == pytest.approx(s.weather.precipitation_mm, abs=1e-9)
+        assert p.weather.temp_c == pytest.approx(s.weather.temp_c)
+        assert p.weather.humidity_pct == pytest.approx(s.weather.humidity_pct)
+    assert serial.skipped
+
+
+@pytest.mark.parametrize("align", ["nearest", "interpolate", "window"])
+def test_enrich_runs_parallel_keeps_brackets_reaching_before_a_shard(align):
+    # every shard's first run is bracketed by an observation 90 minutes
+    # before it starts: inside the interpolation span, outside 2 * max_gap
+    t0 = datetime(2026, 2, 1, 6, 0, tzinfo=timezone.utc)
+    runs = [Run(started_at=t0 + timedelta(hours=6 * k), duration_s=1800, distance_m=5_000) for k in range(4)]
+    weather = []
+    for run in runs:
+        for offset, temp_c in ((timedelta(minutes=-90), 6.0), (timedelta(minutes=30), 8.0)):
+            weather.append(
+                WeatherObs(
+                    observed_at=run.started_at + offset,
+                    temp_c=temp_c,
+                    wind_mps=2.0,
+                    precipitation_mm=0.0,
+                    humidity_pct=80.0,
+                )
+            )
+    index = build_weather_index(weather)
+
+    serial = enrich_runs(runs, index, max_gap=timedelta(minutes=30), align=align)
+    parallel = enrich_runs(runs, index, max_gap=timedelta(minutes=30), align=align, workers=2)
+
+    assert parallel == serial
+    if align == "interpolate":
+        assert all(e.weather.derived for e in serial.enriched)
+
+
+def test_weather_index_between_is_inclusive():
+    index = build_weather_index(synthetic_dataset(10, seed=1)[1])
+    start, end = index.observed_at[2], index.observed_at[5]
+
+    assert index.between(start, end).observations == index.observations[2:6]
+    assert index.between(end, start).observations == ()
+
+
+@pytest.mark.parametrize("align", ["nearest", "interpolate", "window"])
+def test_enrich_runs_classifies_invalid_runs_without_aligning_them(align):
+    runs, weather = synthetic_dataset(20, seed=5)
+    index = build_weather_index(weather)
+
+    # frozen dataclass validation is bypassed, as with hand-built or unpickled rows
+    naive = Run(started_at=runs[3].started_at, duration_s=600, distance_m=1000)
+    object.__setattr__(naive, "started_at", runs[3].started_at.replace(tzinfo=None))
+    zero = Run(started_at=runs[5].started_at, duration_s=600, distance_m=1000)
+    object.__setattr__(zero, "duration_s", 0)
+    too_late = Run(started_at=datetime(9999, 12, 31, 23, 0, tzinfo=timezone.utc), duration_s=7200, distance_m=1000)
+
+    dirty = list(runs)
+    dirty[3], dirty[5] = naive, zero
+    dirty.append(too_late)
+
+    clean = enrich_runs([r for i, r in enumerate(runs) if i not in (3, 5)], index, align=align)
+    result = enrich_runs(dirty, index, align=align)
+
+    assert result.enriched == clean.enriched
+    invalid = [s for s in result.skipped if s.reason.code == SkipCode.INVALID_RUN]
+    assert [s.run for s in invalid] == [naive, zero, too_late]
+    assert [str(s.reason) for s in invalid] == [
+        "Invalid run: started_at is not timezone-aware",
+        "Invalid run: duration_s must be a positive number",
+        "Invalid run: run ends past the supported date range",
+    ]
+    assert SkipReason.parse(str(invalid[0].reason)) == invalid[0].reason
+
+
+@pytest.mark.parametrize("align", ["nearest", "interpolate", "window"])
+def test_enrich_runs_reuses_run_batch_anchors_across_gaps(align):
+    runs, weather = synthetic_dataset(50, seed=9)
+    index = build_weather_index(weather)
+    batch = RunBatch(runs)
+
+    for minutes in (5, 15, 60):
+        gap = timedelta(minutes=minutes)
+        assert enrich_runs(batch, index, max_gap=gap, align=align, anchor="end") == enrich_runs(
+            runs, index, max_gap=gap, align=align, anchor="end"
+        )
+    first = batch.anchor_us("end")
+    enrich_runs(batch, index, max_gap=timedelta(minutes=10), align=align, anchor="end")
+    assert batch.anchor_us("end") is first
+
+    with pytest.raises(ValueError, match="anchor"):
+        enrich_runs(runs, index, anchor="finish")
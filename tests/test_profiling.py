@@ -0,0 +1,56 @@
+import io
+import pstats
+import re
+import tracemalloc
+
+from runwx.main import main
+from runwx.services.profiling import profile_call, profile_path, reset_traced_peak
+
+
+def _work() -> int:
+    return sum(len(str(i)) for i in range(2000))
+
+
+def test_profile_call_cprofile_saves_stats_and_prints_hot_functions(tmp_path):
+    output = profile_path(tmp_path / "runwx.db", "cprofile")
+    stream = io.StringIO()
+
+    assert profile_call(_work, mode="cprofile", output=output, stream=stream, top=5) == _work()
+
+    assert output.name == "runwx.db.prof"
+    assert pstats.Stats(str(output)).total_calls > 0
+    assert "_work" in stream.getvalue()
+
+
+def test_profile_call_tracemalloc_saves_snapshot_and_prints_sites(tmp_path):
+    output = profile_path(tmp_path / "out.json", "tracemalloc")
+    stream = io.StringIO()
+
+    profile_call(lambda: [str(i) for i in range(5000)], mode="tracemalloc", output=output, stream=stream, top=3)
+
+    assert not tracemalloc.is_tracing()
+    assert tracemalloc.Snapshot.load(str(output)).traces
+    assert "allocation sites" in stream.getvalue()
+    assert "test_profiling.py" in stream.getvalue()
+
+
+def test_profile_call_tracemalloc_peak_survives_nested_reset(tmp_path):
+    def work():
+        blob = bytearray(20_000_000)
+        del blob
+        reset_traced_peak()  # as a nested bench measurement does
+        return [str(i) for i in range(100)]
+
+    stream = io.StringIO()
+    profile_call(work, mode="tracemalloc", output=tmp_path / "out.tracemalloc", stream=stream, top=1)
+
+    peak_mb = float(re.search(r"peak ([\d.]+)MB", stream.getvalue()).group(1))
+    assert peak_mb >= 20.0
+
+
+def test_main_profile_writes_next_to_db(tmp_path, capsys):
+    db = tmp_path / "runwx.db"
+    main(["--profile", "cprofile", "run", "--db", str(db), "--quiet"])
+
+    assert (tmp_path / "runwx.db.prof").exists()
+    assert "run_command" in capsys.readouterr().err
@@ -1,7 +1,16 @@
+import itertools
 from datetime import datetime, timezone
 
-from runwx.adapters.sqlite.query_sqlite import fetch_latest_enriched
-from runwx.adapters.sqlite.storage_sqlite import connect, write_enriched
+import pytest
+
+from runwx.adapters.sqlite.query_sqlite import (
+    EnrichedFilter,
+    fetch_aggregates,
+    fetch_enriched_page,
+    fetch_latest_enriched,
+    iter_enriched,
+)
+from runwx.adapters.sqlite.storage_sqlite import connect, init_db, write_enriched
 from runwx.domain.enrich import attach_weather
 from runwx.domain.models import Run, WeatherObs
 
@@ -28,3 +37,196 @@ def test_fetch_latest_enriched(tmp_path):
     assert rows[0].distance_m == 10000
     assert rows[0].temp_c == 6.5
     assert rows[0].humidity_pct == 80.0
+
+
+def test_fetch_aggregates_groups_rollups_by_period_and_bucket(tmp_path):
+    conn = connect(tmp_path / "runwx.db")
+
+    def obs(temp_c: float) -> WeatherObs:
+        return WeatherObs(
+            observed_at=datetime(2026, 2, 1, 10, 20, tzinfo=timezone.utc),
+            temp_c=temp_c,
+            wind_mps=1.0,
+            precipitation_mm=0.0,
+            humidity_pct=80.0,
+        )
+
+    rows = [
+        attach_weather(Run(started_at=datetime(2026, 2, 1, 10, 0, tzinfo=timezone.utc), duration_s=3000, distance_m=10000), obs(6.5)),
+        attach_weather(Run(started_at=datetime(2026, 2, 9, 10, 0, tzinfo=timezone.utc), duration_s=1500, distance_m=5000), obs(8.5)),
+        attach_weather(Run(started_at=datetime(2026, 2, 10, 10, 0, tzinfo=timezone.utc), duration_s=1200, distance_m=4000), obs(-1.0)),
+    ]
+    write_enriched(conn, rows)
+    write_enriched(conn, rows)  # re-writing existing links must not double count
+
+    monthly = fetch_aggregates(conn, period="month", by="temp")
+    weekly = fetch_aggregates(conn, period="week", by="temp")
+    conn.close()
+
+    assert [(a.period_start, a.band_start, a.band_end, a.run_count) for a in monthly] == [
+        ("2026-02-01", -5.0, 0.0, 1),
+        ("2026-02-01", 5.0, 10.0, 2),
+    ]
+    assert monthly[1].distance_m == 15000
+    assert monthly[1].avg_pace_s_per_km == 300.0
+    assert monthly[1].avg_temp_c == 7.5
+    assert [a.period_start for a in weekly] == ["2026-01-26", "2026-02-09", "2026-02-09"]
+
+
+def test_init_db_backfills_rollups_for_existing_database(tmp_path):
+    conn = connect(tmp_path / "runwx.db")
+    run = Run(started_at=datetime(2026, 2, 1, 10, 0, tzinfo=timezone.utc), duration_s=3600, distance_m=10000)
+    obs = WeatherObs(
+        observed_at=datetime(2026, 2, 1, 10, 20, tzinfo=timezone.utc),
+        temp_c=6.5,
+        wind_mps=4.2,
+        precipitation_mm=0.0,
+        humidity_pct=80.0,
+    )
+    write_enriched(conn, [attach_weather(run, obs)])
+    conn.execute("DROP TABLE weather_rollups")
+    conn.commit()
+
+    init_db(conn)
+    rows = fetch_aggregates(conn, period="day", by="wind")
+    conn.close()
+
+    assert [(a.period_start, a.band_start, a.run_count) for a in rows] == [("2026-02-01", 4.0, 1)]
+
+
+def test_iter_enriched_pages_through_ties_in_started_at(tmp_path):
+    conn = connect(tmp_path / "runwx.db")
+    obs = WeatherObs(
+        observed_at=datetime(2026, 2, 1, 10, 20, tzinfo=timezone.utc),
+        temp_c=6.5,
+        wind_mps=4.2,
+        precipitation_mm=0.0,
+        humidity_pct=80.0,
+    )
+    rows = [
+        attach_weather(
+            Run(started_at=datetime(2026, 2, 1, 10, hour_offset, tzinfo=timezone.utc), duration_s=1800, distance_m=distance_m),
+            obs,
+        )
+        for hour_offset in (0, 5)
+        for distance_m in (1000, 2000, 3000)
+    ]
+    write_enriched(conn, rows)
+
+    page, cursor = fetch_enriched_page(conn, page_size=4)
+    rest, last_cursor = fetch_enriched_page(conn, after=cursor, page_size=4)
+    streamed = list(iter_enriched(conn, page_size=2))
+    limited = list(iter_enriched(conn, limit=3, page_size=2))
+    unlimited = list(iter_enriched(conn, limit=-1, page_size=2))
+    empty = list(iter_enriched(conn, limit=0, page_size=2))
+    conn.close()
+
+    assert len(page) == 4 and cursor is not None
+    assert len(rest) == 2 and last_cursor is None
+    assert streamed == page + rest
+    assert limited == streamed[:3]
+    assert unlimited == streamed
+    assert empty == []
+    assert len({(r.started_at, r.distance_m) for r in streamed}) == 6
+    assert [r.started_at for r in streamed] == sorted((r.started_at for r in streamed), reverse=True)
+
+
+def test_iter_enriched_applies_filter_predicates(tmp_path):
+    conn = connect(tmp_path / "runwx.db")
+
+    def row(day: int, distance_m: int, temp_c: float, wind_mps: float):
+        return attach_weather(
+            Run(started_at=datetime(2026, 2, day, 10, 0, tzinfo=timezone.utc), duration_s=1800, distance_m=distance_m),
+            WeatherObs(
+                observed_at=datetime(2026, 2, day, 10, 15, tzinfo=timezone.utc),
+                temp_c=temp_c,
+                wind_mps=wind_mps,
+                precipitation_mm=0.0,
+                humidity_pct=70.0,
+            ),
+        )
+
+    write_enriched(conn, [row(1, 5000, 4.0, 1.0), row(2, 10000, 8.0, 6.0), row(3, 10000, 12.0, 2.0)])
+
+    def days(**kwargs) -> list[str]:
+        return [r.started_at[:10] for r in iter_enriched(conn, where=EnrichedFilter(**kwargs))]
+
+    assert days(start=datetime(2026, 2, 2, tzinfo=timezone.utc)) == ["2026-02-03", "2026-02-02"]
+    assert days(end=datetime(2026, 2, 2, 10, 0, tzinfo=timezone.utc)) == ["2026-02-01"]
+    assert days(min_distance_m=6000, max_temp_c=10.0) == ["2026-02-02"]
+    assert days(max_wind_mps=3.0, min_temp_c=5.0) == ["2026-02-03"]
+    assert days(min_precipitation_mm=0.1) == []
+    conn.close()
+
+
+_FILTER_GROUPS = {
+    "time": {"start": datetime(2026, 1, 1, tzinfo=timezone.utc), "end": datetime(2026, 3, 1, tzinfo=timezone.utc)},
+    "distance": {"min_distance_m": 1000, "max_distance_m": 20000},
+    "temp": {"min_temp_c": 0.0, "max_temp_c": 15.0},
+    "wind": {"min_wind_mps": 0.0, "max_wind_mps": 5.0},
+    "precip": {"min_precipitation_mm": 0.0, "max_precipitation_mm": 1.0},
+}
+
+
+_GROUP_INDEXES = {
+    "time": "idx_runs_started_at",
+    "distance": "idx_runs_distance_m",
+    "temp": "idx_weather_obs_temp_c",
+    "wind": "idx_weather_obs_wind_mps",
+    "precip": "idx_weather_obs_precipitation_mm",
+}
+
+
+def _enriched_page_plan(conn, where: EnrichedFilter, after=None) -> list[str]:
+    statements: list[str] = []
+    conn.set_trace_callback(statements.append)
+    fetch_enriched_page(conn, after=after, where=where)
+    conn.set_trace_callback(None)
+
+    sql = next(s for s in statements if "run_with_weather rw" in s)
+    return [row[-1] for row in conn.execute("EXPLAIN QUERY PLAN " + sql).fetchall()]
+
+
+def _assert_no_scan(plan: list[str], *, unfiltered_first_page: bool = False) -> None:
+    if unfiltered_first_page:
+        # nothing to seek on: walk runs(started_at) in ORDER BY order, LIMIT stops it after one page
+        assert plan[0] == "SCAN r USING INDEX idx_runs_started_at", plan
+        assert not any(step.startswith("USE TEMP B-TREE") for step in plan), plan
+        plan = plan[1:]
+    # a USE TEMP B-TREE FOR ORDER BY step is the LIMIT-bounded sorter and allowed
+    assert not any(step.startswith("SCAN") for step in plan), plan
+
+
+@pytest.mark.parametrize("with_cursor", [False, True])
+@pytest.mark.parametrize(
+    "groups",
+    [combo for n in range(len(_FILTER_GROUPS) + 1) for combo in itertools.combinations(_FILTER_GROUPS, n)],
+)
+def test_enriched_filter_combinations_avoid_full_table_scans(tmp_path, groups, with_cursor):
+    conn = connect(tmp_path / "runwx.db")
+    init_db(conn)
+
+    kwargs = {k: v for g in groups for k, v in _FILTER_GROUPS[g].items()}
+    after = ("2026-02-01T00:00:00+00:00", 1) if with_cursor else None
+    plan = _enriched_page_plan(conn, EnrichedFilter(**kwargs), after)
+    conn.close()
+
+    _assert_no_scan(plan, unfiltered_first_page=not groups and not with_cursor)
+
+
+@pytest.mark.parametrize("with_cursor", [False, True])
+@pytest.mark.parametrize("field", [name for bounds in _FILTER_GROUPS.values() for name in bounds])
+def test_enriched_filter_single_bounds_are_served_by_their_index(tmp_path, field, with_cursor):
+    conn = connect(tmp_path / "runwx.db")
+    init_db(conn)
+
+    value = next(bounds[field] for bounds in _FILTER_GROUPS.values() if field in bounds)
+    after = ("2026-02-01T00:00:00+00:00", 1) if with_cursor else None
+    plan = _enriched_page_plan(conn, EnrichedFilter(**{field: value}), after)
+    conn.close()
+
+    _assert_no_scan(plan)
+    if not with_cursor:
+        # the predicate's own index drives the query
+        group = next(g for g, bounds in _FILTER_GROUPS.items() if field in bounds)
+        assert _GROUP_INDEXES[group] in plan[0], plan
@@ -24,6 +24,7 @@ def test_race_result_to_run_uses_event_start_and_distance():
     assert run.started_at == event.started_at
     assert run.distance_m == 5000
     assert run.duration_s == 1500
+    assert (run.latitude, run.longitude) == (51.5, -0.1)
 
 
 def test_race_result_to_run_rejects_event_mismatch():
@@ -0,0 +1,117 @@
+import dataclasses
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from runwx.adapters.sqlite.query_sqlite import fetch_skipped_runs_in_range
+from runwx.adapters.sqlite.storage_sqlite import connect, write_pipeline_result
+from runwx.domain.align import MultiWeatherIndex
+from runwx.domain.models import Run, WeatherObs
+from runwx.services.pipeline import enrich_runs
+from runwx.services.reprocess import reprocess_skipped, weather_time_ranges
+
+
+def _obs(hour: int, minute: int = 0) -> WeatherObs:
+    return WeatherObs(
+        observed_at=datetime(2026, 2, 1, hour, minute, tzinfo=timezone.utc),
+        temp_c=6.0,
+        wind_mps=3.0,
+        precipitation_mm=0.0,
+        humidity_pct=70.0,
+    )
+
+
+def test_weather_time_ranges_splits_on_large_holes():
+    ranges = weather_time_ranges([_obs(10), _obs(11), _obs(15)], max_gap=timedelta(minutes=30))
+
+    assert ranges == [
+        (_obs(10).observed_at, _obs(11).observed_at),
+        (_obs(15).observed_at, _obs(15).observed_at),
+    ]
+
+
+def test_reprocess_skipped_promotes_only_runs_covered_by_new_weather(tmp_path):
+    conn = connect(tmp_path / "runwx.db")
+
+    run_late = Run(started_at=datetime(2026, 2, 1, 15, 0, tzinfo=timezone.utc), duration_s=2400, distance_m=7000)
+    run_other = Run(started_at=datetime(2026, 2, 1, 20, 0, tzinfo=timezone.utc), duration_s=1800, distance_m=5000)
+
+    first = enrich_runs([run_late, run_other], [_obs(10)], max_gap=timedelta(minutes=30))
+    write_pipeline_result(conn, first)
+    assert conn.execute("SELECT COUNT(*) FROM skipped_runs").fetchone()[0] == 2
+
+    rp = reprocess_skipped(conn, [_obs(15, 20)], max_gap=timedelta(minutes=30))
+
+    assert rp.candidates == 1
+    assert rp.promoted == 1
+    assert rp.result.enriched[0].run == run_late
+
+    remaining = conn.execute("SELECT started_at FROM skipped_runs").fetchall()
+    assert remaining == [(run_other.started_at.isoformat(),)]
+    assert conn.execute("SELECT COUNT(*) FROM run_with_weather").fetchone()[0] == 1
+
+    conn.close()
+
+
+def test_reprocess_skipped_window_mode_reaches_weather_late_in_long_runs(tmp_path):
+    conn = connect(tmp_path / "runwx.db")
+    run = Run(started_at=datetime(2026, 2, 1, 10, 0, tzinfo=timezone.utc), duration_s=3 * 3600, distance_m=30_000)
+    write_pipeline_result(conn, enrich_runs([run], [_obs(20)], max_gap=timedelta(minutes=30), align="window"))
+
+    rp = reprocess_skipped(conn, [_obs(12, 30)], max_gap=timedelta(minutes=30), align="window")
+
+    assert rp.candidates == 1
+    assert rp.promoted == 1
+    conn.close()
+
+
+def test_reprocess_skipped_interpolate_mode_bridges_holes_wider_than_two_gaps(tmp_path):
+    conn = connect(tmp_path / "runwx.db")
+    # midpoint 10:55: 55 minutes from both new observations, which are 110 minutes apart
+    run = Run(started_at=datetime(2026, 2, 1, 10, 40, tzinfo=timezone.utc), duration_s=1800, distance_m=5_000)
+    write_pipeline_result(conn, enrich_runs([run], [_obs(20)], max_gap=timedelta(minutes=30)))
+
+    rp = reprocess_skipped(conn, [_obs(10), _obs(11, 50)], max_gap=timedelta(minutes=30), align="interpolate")
+
+    assert len(rp.ranges) == 1
+    assert rp.promoted == 1
+    assert rp.result.enriched[0].weather.derived
+    conn.close()
+
+
+def test_reprocess_skipped_rejects_located_weather(tmp_path):
+    conn = connect(tmp_path / "runwx.db")
+    run = Run(started_at=datetime(2026, 2, 1, 15, 0, tzinfo=timezone.utc), duration_s=2400, distance_m=7000)
+    write_pipeline_result(conn, enrich_runs([run], [_obs(10)], max_gap=timedelta(minutes=30)))
+
+    # stored skipped runs carry no location to route them by
+    weather = MultiWeatherIndex.from_mapping({
+        "north": [dataclasses.replace(_obs(15, 40), location="north")],
+    })
+    with pytest.raises(ValueError, match="without a location"):
+        reprocess_skipped(conn, weather, max_gap=timedelta(minutes=30))
+
+    conn.close()
+
+
+def test_reprocess_skipped_range_query_uses_index(tmp_path):
+    conn = connect(tmp_path / "runwx.db")
+    reprocess_skipped(conn, [], max_gap=timedelta(minutes=30))
+
+    # explain the statement the reader actually runs, with its bound values
+    statements: list[str] = []
+    conn.set_trace_callback(statements.append)
+    fetch_skipped_runs_in_range(
+        conn,
+        start=datetime(2026, 2, 1, tzinfo=timezone.utc),
+        end=datetime(2026, 2, 2, tzinfo=timezone.utc),
+    )
+    conn.set_trace_callback(None)
+    (sql,) = [s for s in statements if "FROM skipped_runs" in s]
+
+    plan = [row[-1] for row in conn.execute(f"EXPLAIN QUERY PLAN {sql}")]
+    conn.close()
+
+    assert any("USING COVERING INDEX" in detail and "started_at>? AND started_at<?" in detail for detail in plan), plan
+    # the index order serves ORDER BY and DISTINCT without a sort
+    assert not any("TEMP B-TREE" in detail for detail in plan), plan
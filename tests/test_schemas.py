@@ -45,3 +45,15 @@ def test_weather_obs_in_rejects_negative_wind():
 
     with pytest.raises(ValidationError):
         WeatherObsIn.model_validate(row)
+
+
+def test_location_column_is_optional_and_blank_means_none():
+    row = {
+        "started_at": "2026-02-01T10:00:00Z",
+        "duration_s": "3600",
+        "distance_m": "10000",
+        "location": "oslo",
+    }
+
+    assert RunIn.model_validate(row).to_domain().location == "oslo"
+    assert RunIn.model_validate({**row, "location": " "}).to_domain().location is None
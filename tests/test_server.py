@@ -0,0 +1,106 @@
+import http.client
+import json
+import socket
+import threading
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from runwx.adapters.http.server import make_server
+from runwx.adapters.sqlite.storage_sqlite import connect
+from runwx.domain.align import build_weather_index
+from runwx.domain.models import WeatherObs
+from runwx.services.serve import WarmService
+
+
+def _weather():
+    return build_weather_index(
+        [
+            WeatherObs(
+                observed_at=datetime(2026, 2, 1, 10, 20, tzinfo=timezone.utc),
+                temp_c=6.5,
+                wind_mps=4.2,
+                precipitation_mm=0.0,
+                humidity_pct=80.0,
+            )
+        ]
+    )
+
+
+@pytest.fixture
+def served(tmp_path):
+    conn = connect(tmp_path / "runwx.db", check_same_thread=False)
+    service = WarmService(_weather(), conn, max_gap=timedelta(minutes=30))
+    server = make_server(service, port=0)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+    service.close()
+
+
+def _request(server, method, path, body=None):
+    conn = http.client.HTTPConnection("127.0.0.1", server.server_address[1], timeout=5)
+    conn.request(method, path, body=None if body is None else json.dumps(body))
+    resp = conn.getresponse()
+    payload = json.loads(resp.read())
+    conn.close()
+    return resp.status, payload
+
+
+RUNS = [
+    {"started_at": "2026-02-01T10:00:00Z", "duration_s": 3600, "distance_m": 10000},
+    {"started_at": "2026-02-03T10:00:00Z", "duration_s": 1800, "distance_m": 5000},
+]
+
+
+def test_enrich_persist_then_query_and_aggregate(served):
+    status, payload = _request(served, "POST", "/enrich", {"runs": RUNS, "persist": True})
+
+    assert status == 200
+    assert payload["enriched"][0]["weather"]["observed_at"] == "2026-02-01T10:20:00+00:00"
+    assert payload["skipped"][0]["reason"] == "No weather within 0:30:00"
+    assert payload["created"] == {"enriched": 1, "skipped": 1}
+
+    status, payload = _request(served, "GET", "/query?limit=all&min_temp=5")
+    assert status == 200
+    assert [r["started_at"] for r in payload["rows"]] == ["2026-02-01T10:00:00+00:00"]
+
+    status, payload = _request(served, "GET", "/aggregates?period=day&by=temp")
+    assert status == 200
+    assert payload["rows"][0]["run_count"] == 1
+    assert payload["rows"][0]["avg_pace_s_per_km"] == 360.0
+
+
+def test_bad_requests_return_json_errors(served):
+    assert _request(served, "POST", "/enrich", {"runs": [{"started_at": "2026-02-01T10:00:00"}]})[0] == 400
+    assert _request(served, "POST", "/enrich", {"runs": RUNS, "align": "bogus"})[0] == 400
+    assert _request(served, "GET", "/aggregates?period=year")[0] == 400
+
+    status, payload = _request(served, "GET", "/missing")
+    assert status == 404
+    assert "No route" in payload["error"]
+
+
+def test_unix_socket_server(tmp_path):
+    path = tmp_path / "runwx.sock"
+    service = WarmService(_weather())
+    server = make_server(service, socket_path=path)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    try:
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+            sock.connect(str(path))
+            sock.sendall(b"GET /health HTTP/1.0\r\n\r\n")
+            response = b""
+            while chunk := sock.recv(4096):
+                response += chunk
+    finally:
+        server.shutdown()
+        server.server_close()
+
+    head, body = response.split(b"\r\n\r\n", 1)
+    assert head.startswith(b"HTTP/1.1 200")
+    assert json.loads(body) == {"status": "ok", "db": False, "align": "nearest"}
+    assert not path.exists()
@@ -0,0 +1,59 @@
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from runwx.domain.align import build_weather_index
+from runwx.domain.models import WeatherObs
+from runwx.services.shared_index import SharedWeatherIndex
+
+
+def _obs(minute: int, *, tz=timezone.utc, location=None) -> WeatherObs:
+    return WeatherObs(
+        observed_at=datetime(2026, 3, 1, 10, minute, tzinfo=timezone.utc).astimezone(tz),
+        temp_c=5.0 + minute / 10,
+        wind_mps=2.5,
+        precipitation_mm=0.1 * minute,
+        humidity_pct=70.0,
+        location=location,
+    )
+
+
+def test_shared_index_round_trips_observations_exactly():
+    cet = timezone(timedelta(hours=1))
+    index = build_weather_index([_obs(0), _obs(15, tz=cet, location="B"), _obs(30, location="A"), _obs(45)])
+
+    shared = SharedWeatherIndex.export(index)
+    try:
+        restored = shared.to_weather_index()
+        assert restored.observations == index.observations
+        # offsets survive, not just the instant
+        assert [o.observed_at.isoformat() for o in restored.observations] == [
+            o.observed_at.isoformat() for o in index.observations
+        ]
+    finally:
+        shared.unlink()
+
+
+def test_attached_index_reads_the_same_block_and_slices_inclusively():
+    index = build_weather_index([_obs(m) for m in range(0, 60, 5)])
+    shared = SharedWeatherIndex.export(index)
+    try:
+        reader = SharedWeatherIndex.attach(shared.handle)
+        start, end = index.observed_at[2], index.observed_at[5]
+
+        assert len(reader) == len(index.observations)
+        assert reader.to_weather_index(start, end).observations == index.between(start, end).observations
+        reader.close()
+    finally:
+        shared.unlink()
+
+    with pytest.raises(FileNotFoundError):
+        SharedWeatherIndex.attach(shared.handle)
+
+
+def test_shared_index_handles_empty_index():
+    shared = SharedWeatherIndex.export(build_weather_index([]))
+    try:
+        assert shared.to_weather_index().observations == ()
+    finally:
+        shared.unlink()
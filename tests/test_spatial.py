@@ -0,0 +1,72 @@
+import math
+import random
+from datetime import datetime, timezone
+
+import pytest
+
+from runwx.domain.models import Run
+from runwx.domain.spatial import EARTH_RADIUS_KM, Station, StationIndex
+
+
+def _haversine_km(lat1: float, lon1: float, lat2: float, lon2: float) -> float:
+    p1, p2 = math.radians(lat1), math.radians(lat2)
+    dp, dl = p2 - p1, math.radians(lon2 - lon1)
+    a = math.sin(dp / 2) ** 2 + math.cos(p1) * math.cos(p2) * math.sin(dl / 2) ** 2
+    return 2 * EARTH_RADIUS_KM * math.asin(math.sqrt(a))
+
+
+def test_station_index_matches_linear_scan():
+    rng = random.Random(7)
+    stations = [
+        Station(key=f"s{i}", latitude=rng.uniform(-90, 90), longitude=rng.uniform(-180, 180))
+        for i in range(500)
+    ]
+    index = StationIndex(stations)
+    points = [(rng.uniform(-90, 90), rng.uniform(-180, 180)) for _ in range(200)]
+
+    found = index.nearest_many(points)
+
+    for (lat, lon), station in zip(points, found):
+        expected = min(stations, key=lambda s: _haversine_km(lat, lon, s.latitude, s.longitude))
+        assert station == expected
+
+
+def test_station_index_handles_antimeridian_and_reports_distance():
+    index = StationIndex([
+        Station(key="fiji", latitude=-17.7, longitude=178.0),
+        Station(key="samoa", latitude=-13.8, longitude=-172.1),
+        Station(key="sydney", latitude=-33.9, longitude=151.2),
+    ])
+
+    result = index.nearest(-16.0, -179.5)
+
+    assert result is not None
+    station, distance_km = result
+    assert station.key == "fiji"
+    assert distance_km == pytest.approx(_haversine_km(-16.0, -179.5, -17.7, 178.0), rel=1e-9)
+
+
+def test_station_index_distance_cap():
+    index = StationIndex([Station(key="oslo", latitude=59.91, longitude=10.75)])
+
+    assert index.nearest(59.95, 10.80, max_distance_km=10) is not None
+    assert index.nearest(60.39, 5.32, max_distance_km=10) is None  # Bergen
+    assert index.nearest_many([(60.39, 5.32)], max_distance_km=10) == [None]
+    assert StationIndex([]).nearest(0.0, 0.0) is None
+
+
+def test_locate_runs_prefers_explicit_location_then_nearest_station():
+    index = StationIndex([
+        Station(key="oslo", latitude=59.91, longitude=10.75),
+        Station(key="bergen", latitude=60.39, longitude=5.32),
+    ])
+    started_at = datetime(2026, 2, 1, 10, 0, tzinfo=timezone.utc)
+    runs = [
+        Run(started_at=started_at, duration_s=1800, distance_m=5000, latitude=60.37, longitude=5.35),
+        Run(started_at=started_at, duration_s=1800, distance_m=5000, location="tromso", latitude=60.37, longitude=5.35),
+        Run(started_at=started_at, duration_s=1800, distance_m=5000),
+        Run(started_at=started_at, duration_s=1800, distance_m=5000, latitude=48.85, longitude=2.35),
+    ]
+
+    assert index.locate_runs(runs, max_distance_km=50) == ["bergen", "tromso", None, None]
+    assert index.locate_runs(runs)[3] == "bergen"
@@ -0,0 +1,53 @@
+import subprocess
+import sys
+
+import pytest
+
+from runwx.main import main
+
+# Generous ceiling for `import runwx.main` (cumulative microseconds as
+# reported by -X importtime); the lazy-import layout takes a small
+# fraction of it, eagerly importing pydantic alone exceeds it on CI.
+IMPORT_BUDGET_US = 150_000
+
+HEAVY_MODULES = ("pydantic", "httpx")
+
+
+def _importtime(code: str) -> dict[str, int]:
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    cumulative: dict[str, int] = {}
+    for line in proc.stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        _, cum, name = (part.strip() for part in line[len("import time:"):].split("|"))
+        if cum.isdigit():
+            cumulative[name] = int(cum)
+    return cumulative
+
+
+def test_cli_import_stays_within_budget_and_skips_heavy_deps():
+    modules = _importtime("import runwx.main")
+
+    assert not [m for m in modules if m.split(".")[0] in HEAVY_MODULES]
+    assert modules["runwx.main"] < IMPORT_BUDGET_US
+
+
+@pytest.mark.parametrize("argv", [["query", "--limit", "1"], ["query", "--aggregate", "month"]])
+def test_query_command_never_imports_pydantic_or_httpx(tmp_path, argv):
+    db = tmp_path / "runwx.db"
+    main(["run", "--db", str(db), "--quiet"])
+
+    code = (
+        "import sys\n"
+        "from runwx.main import main\n"
+        f"main({argv + ['--db', str(db), '--quiet']!r})\n"
+        f"print(sorted(m for m in sys.modules if m.split('.')[0] in {HEAVY_MODULES!r}))\n"
+    )
+    proc = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True)
+
+    assert proc.stdout.strip().splitlines()[-1] == "[]"
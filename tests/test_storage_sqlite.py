@@ -1,9 +1,10 @@
-from datetime import datetime, timezone
+from datetime import datetime, timedelta, timezone
 import sqlite3
 
-from runwx.adapters.sqlite.storage_sqlite import connect, write_enriched
+from runwx.adapters.sqlite.storage_sqlite import connect, init_db, rebuild_rollups, write_enriched
 from runwx.domain.enrich import attach_weather
 from runwx.domain.models import Run, WeatherObs
+from runwx.services.pipeline import enrich_runs
 
 
 def test_write_enriched_creates_tables_and_rows(tmp_path):
@@ -69,3 +70,139 @@ def test_write_enriched_is_idempotent_for_same_row(tmp_path):
     assert link_count == 1
 
     conn.close()
+
+
+def test_interpolated_weather_is_stored_as_derived_and_not_rolled_up(tmp_path):
+    conn = connect(tmp_path / "runwx.db")
+    run = Run(
+        started_at=datetime(2026, 2, 1, 10, 0, tzinfo=timezone.utc),
+        duration_s=3600,
+        distance_m=10_000,
+    )
+    weather = [
+        WeatherObs(
+            observed_at=datetime(2026, 2, 1, hour, 0, tzinfo=timezone.utc),
+            temp_c=temp_c,
+            wind_mps=2.0,
+            precipitation_mm=0.0,
+            humidity_pct=80.0,
+        )
+        for hour, temp_c in ((10, 6.0), (11, 8.0))
+    ]
+
+    result = enrich_runs([run], weather, max_gap=timedelta(minutes=20), align="interpolate")
+    write_enriched(conn, result.enriched)
+
+    rows = conn.execute("SELECT observed_at, temp_c, derived FROM weather_obs").fetchall()
+    assert rows == [("2026-02-01T10:30:00+00:00", 7.0, 1)]
+    assert conn.execute("SELECT COUNT(*) FROM weather_rollups").fetchone()[0] == 0
+
+    rebuild_rollups(conn)
+    assert conn.execute("SELECT COUNT(*) FROM weather_rollups").fetchone()[0] == 0
+
+    # a measured observation with the same values gets a row of its own
+    measured = WeatherObs(
+        observed_at=datetime(2026, 2, 1, 10, 30, tzinfo=timezone.utc),
+        temp_c=7.0,
+        wind_mps=2.0,
+        precipitation_mm=0.0,
+        humidity_pct=80.0,
+    )
+    other = Run(started_at=datetime(2026, 2, 2, 10, 0, tzinfo=timezone.utc), duration_s=3600, distance_m=10_000)
+    write_enriched(conn, [attach_weather(other, measured)])
+
+    assert conn.execute("SELECT COUNT(*), SUM(derived) FROM weather_obs").fetchone() == (2, 1)
+
+    # only the measured run is rolled up, incrementally and on a rebuild
+    incremental = conn.execute("SELECT * FROM weather_rollups ORDER BY 1, 2, 3, 4, 5").fetchall()
+    assert sum(row[5] for row in incremental if row[0] == "day") == 1
+    rebuild_rollups(conn)
+    assert conn.execute("SELECT * FROM weather_rollups ORDER BY 1, 2, 3, 4, 5").fetchall() == incremental
+
+    conn.close()
+
+
+def test_window_aggregates_are_stored_as_derived_next_to_measured_weather(tmp_path):
+    conn = connect(tmp_path / "runwx.db")
+    weather = [
+        WeatherObs(
+            observed_at=datetime(2026, 2, 1, hour, 0, tzinfo=timezone.utc),
+            temp_c=temp_c,
+            wind_mps=2.0,
+            precipitation_mm=0.4,
+            humidity_pct=80.0,
+        )
+        for hour, temp_c in [(9, 5.0), (10, 7.0), (11, 12.0)]
+    ]
+    long_run = Run(started_at=datetime(2026, 2, 1, 9, 0, tzinfo=timezone.utc), duration_s=2 * 3600, distance_m=21_097)
+    short_run = Run(started_at=datetime(2026, 2, 1, 10, 40, tzinfo=timezone.utc), duration_s=600, distance_m=2_000)
+
+    result = enrich_runs([long_run, short_run], weather, align="window")
+    write_enriched(conn, result.enriched)
+
+    # the long run gets a window aggregate, the short one the measured 11:00 observation
+    rows = conn.execute("SELECT observed_at, derived FROM weather_obs ORDER BY observed_at").fetchall()
+    assert rows == [("2026-02-01T10:00:00+00:00", 1), ("2026-02-01T11:00:00+00:00", 0)]
+    assert conn.execute("SELECT SUM(run_count) FROM weather_rollups WHERE period = 'day'").fetchone()[0] == 1
+
+    conn.close()
+
+
+def test_init_db_rekeys_legacy_weather_obs_with_derived(tmp_path):
+    conn = connect(tmp_path / "runwx.db")
+    # tables as created before derived weather was stored
+    conn.executescript(
+        """
+        CREATE TABLE runs (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            started_at TEXT NOT NULL,
+            duration_s INTEGER NOT NULL,
+            distance_m INTEGER NOT NULL,
+            UNIQUE(started_at, duration_s, distance_m)
+        );
+        CREATE TABLE weather_obs (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            observed_at TEXT NOT NULL,
+            temp_c REAL NOT NULL,
+            wind_mps REAL NOT NULL,
+            precipitation_mm REAL NOT NULL,
+            humidity_pct REAL NOT NULL,
+            UNIQUE(observed_at, temp_c, wind_mps, precipitation_mm, humidity_pct)
+        );
+        CREATE TABLE run_with_weather (
+            run_id INTEGER NOT NULL,
+            weather_id INTEGER NOT NULL,
+            PRIMARY KEY(run_id),
+            FOREIGN KEY(run_id) REFERENCES runs(id),
+            FOREIGN KEY(weather_id) REFERENCES weather_obs(id)
+        );
+        INSERT INTO runs (id, started_at, duration_s, distance_m) VALUES (1, '2026-02-01T10:00:00+00:00', 3600, 10000);
+        INSERT INTO weather_obs (id, observed_at, temp_c, wind_mps, precipitation_mm, humidity_pct)
+        VALUES (7, '2026-02-01T10:30:00+00:00', 7.0, 2.0, 0.0, 80.0);
+        INSERT INTO run_with_weather (run_id, weather_id) VALUES (1, 7);
+        """
+    )
+
+    init_db(conn)
+
+    # the old row keeps its id, and the link to it survives the rebuild
+    assert conn.execute("SELECT id, derived FROM weather_obs").fetchall() == [(7, 0)]
+    assert conn.execute("SELECT run_id, weather_id FROM run_with_weather").fetchall() == [(1, 7)]
+    assert conn.execute("PRAGMA foreign_keys").fetchone()[0] == 1
+    assert conn.execute("PRAGMA foreign_key_check").fetchall() == []
+    assert conn.execute("SELECT SUM(run_count) FROM weather_rollups WHERE period = 'day'").fetchone()[0] == 1
+
+    # derived weather with the same values no longer lands on the measured row
+    run = Run(started_at=datetime(2026, 2, 2, 10, 0, tzinfo=timezone.utc), duration_s=3600, distance_m=10_000)
+    derived = WeatherObs(
+        observed_at=datetime(2026, 2, 1, 10, 30, tzinfo=timezone.utc),
+        temp_c=7.0,
+        wind_mps=2.0,
+        precipitation_mm=0.0,
+        humidity_pct=80.0,
+        derived=True,
+    )
+    write_enriched(conn, [attach_weather(run, derived)])
+    assert conn.execute("SELECT derived FROM weather_obs ORDER BY id").fetchall() == [(0,), (1,)]
+
+    conn.close()
@@ -1,8 +1,12 @@
 from datetime import datetime, timedelta, timezone
 
-from runwx.adapters.sqlite.storage_sqlite import connect, write_pipeline_result
+import pytest
+
+from runwx.adapters.sqlite import storage_sqlite
+from runwx.adapters.sqlite.query_sqlite import fetch_skip_counts
+from runwx.adapters.sqlite.storage_sqlite import connect, init_db, write_pipeline_result
 from runwx.domain.models import Run, WeatherObs
-from runwx.services.pipeline import enrich_runs
+from runwx.services.pipeline import SkipCode, SkipReason, enrich_runs
 
 
 def test_write_pipeline_result_persists_skipped(tmp_path):
@@ -29,8 +33,10 @@ def test_write_pipeline_result_persists_skipped(tmp_path):
     skipped_count = conn.execute("SELECT COUNT(*) FROM skipped_runs").fetchone()[0]
     assert skipped_count == 1
 
-    row = conn.execute("SELECT reason FROM skipped_runs").fetchone()[0]
-    assert "No weather within" in row
+    row = conn.execute(
+        "SELECT r.code, r.param FROM skipped_runs s JOIN skip_reasons r ON r.id = s.reason_id"
+    ).fetchone()
+    assert row == (int(SkipCode.NO_WEATHER_IN_GAP), "0:30:00")
 
     conn.close()
 
@@ -52,3 +58,125 @@ def test_write_pipeline_result_idempotent(tmp_path):
     assert c2[1] == 0
 
     conn.close()
+
+
+def test_skip_reasons_are_stored_once_and_counted_per_code(tmp_path):
+    conn = connect(tmp_path / "runwx.db")
+
+    runs = [
+        Run(started_at=datetime(2026, 2, 1, hour, 0, tzinfo=timezone.utc), duration_s=1800, distance_m=5000)
+        for hour in range(8, 20)
+    ]
+    result = enrich_runs(runs, [], max_gap=timedelta(minutes=30))
+    write_pipeline_result(conn, result)
+
+    assert conn.execute("SELECT COUNT(*) FROM skip_reasons").fetchone()[0] == 1
+    assert fetch_skip_counts(conn) == {SkipCode.NO_WEATHER_IN_GAP: 12}
+
+    conn.close()
+
+
+def test_init_db_migrates_free_text_skip_reasons(tmp_path):
+    conn = connect(tmp_path / "runwx.db")
+    conn.execute(
+        """
+        CREATE TABLE skipped_runs (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            started_at TEXT NOT NULL,
+            duration_s INTEGER NOT NULL,
+            distance_m INTEGER NOT NULL,
+            reason TEXT NOT NULL,
+            UNIQUE(started_at, duration_s, distance_m, reason)
+        )
+        """
+    )
+    conn.executemany(
+        "INSERT INTO skipped_runs (started_at, duration_s, distance_m, reason) VALUES (?, ?, ?, ?)",
+        [
+            ("2026-02-01T10:00:00+00:00", 1800, 5000, "No weather within 0:30:00"),
+            ("2026-02-01T11:00:00+00:00", 1800, 5000, "No weather within 0:30:00"),
+            ("2026-02-01T12:00:00+00:00", 1800, 5000, "No weather for location 'lima'"),
+            ("2026-02-01T13:00:00+00:00", 1800, 5000, "ValueError: boom"),
+        ],
+    )
+    conn.commit()
+
+    init_db(conn)
+
+    rows = conn.execute(
+        """
+        SELECT s.started_at, r.code, r.param
+        FROM skipped_runs s JOIN skip_reasons r ON r.id = s.reason_id
+        ORDER BY s.id
+        """
+    ).fetchall()
+    assert [(code, param) for _, code, param in rows] == [
+        (SkipCode.NO_WEATHER_IN_GAP, "0:30:00"),
+        (SkipCode.NO_WEATHER_IN_GAP, "0:30:00"),
+        (SkipCode.NO_WEATHER_FOR_LOCATION, "lima"),
+        (SkipCode.OTHER, "ValueError: boom"),
+    ]
+    assert str(SkipReason.parse("No weather for location 'lima'")) == "No weather for location 'lima'"
+
+    # already migrated: a second init_db is a no-op
+    init_db(conn)
+    assert fetch_skip_counts(conn) == {SkipCode.OTHER: 1, SkipCode.NO_WEATHER_IN_GAP: 2, SkipCode.NO_WEATHER_FOR_LOCATION: 1}
+
+    conn.close()
+
+
+def _legacy_skipped_table(conn, name="skipped_runs"):
+    conn.execute(
+        f"""
+        CREATE TABLE {name} (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            started_at TEXT NOT NULL,
+            duration_s INTEGER NOT NULL,
+            distance_m INTEGER NOT NULL,
+            reason TEXT NOT NULL,
+            UNIQUE(started_at, duration_s, distance_m, reason)
+        )
+        """
+    )
+    conn.execute(
+        f"INSERT INTO {name} (started_at, duration_s, distance_m, reason) VALUES (?, ?, ?, ?)",
+        ("2026-02-01T10:00:00+00:00", 1800, 5000, "No weather within 0:30:00"),
+    )
+    conn.commit()
+
+
+def test_init_db_skip_reason_migration_is_atomic(tmp_path, monkeypatch):
+    db = tmp_path / "runwx.db"
+    conn = connect(db)
+    _legacy_skipped_table(conn)
+
+    def crash(conn):
+        raise RuntimeError("crash mid-migration")
+
+    monkeypatch.setattr(storage_sqlite, "_migrate_skipped_reasons", crash)
+    with pytest.raises(RuntimeError):
+        init_db(conn)
+    conn.close()
+
+    # nothing of the half-done migration is visible: the old table is intact
+    conn = connect(db)
+    tables = {row[0] for row in conn.execute("SELECT name FROM sqlite_master WHERE type = 'table'")}
+    assert "skipped_runs_legacy" not in tables
+    assert conn.execute("SELECT reason FROM skipped_runs").fetchall() == [("No weather within 0:30:00",)]
+
+    monkeypatch.undo()
+    init_db(conn)
+    assert fetch_skip_counts(conn) == {SkipCode.NO_WEATHER_IN_GAP: 1}
+    conn.close()
+
+
+def test_init_db_resumes_interrupted_skip_reason_migration(tmp_path):
+    conn = connect(tmp_path / "runwx.db")
+    # what a crash after the rename left behind: the old rows and an empty coded table
+    _legacy_skipped_table(conn, "skipped_runs_legacy")
+    init_db(conn)
+    assert fetch_skip_counts(conn) == {SkipCode.NO_WEATHER_IN_GAP: 1}
+
+    tables = {row[0] for row in conn.execute("SELECT name FROM sqlite_master WHERE type = 'table'")}
+    assert "skipped_runs_legacy" not in tables
+    conn.close()
@@ -0,0 +1,93 @@
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from runwx.domain.align import MultiWeatherIndex, RunBatch, build_weather_index
+from runwx.domain.models import Run, WeatherObs
+from runwx.services.bench import synthetic_dataset
+from runwx.services.metrics import Metrics
+from runwx.services.pipeline import SkipCode, enrich_runs
+from runwx.services.sweep import format_coverage_table, sweep_gaps
+
+GAPS = [timedelta(minutes=m) for m in (60, 5, 10, 15, 30)]
+
+
+@pytest.mark.parametrize("anchor", ["midpoint", "start"])
+def test_sweep_matches_one_enrich_run_per_gap(anchor):
+    runs, weather = synthetic_dataset(300, seed=4)
+    weather = weather[::3]  # sparse enough that coverage depends on the gap
+    index = build_weather_index(weather)
+    bad = Run(started_at=runs[0].started_at, duration_s=60, distance_m=100)
+    object.__setattr__(bad, "duration_s", -1)
+    runs = [bad, *runs]
+
+    sweep = sweep_gaps(runs, index, GAPS, anchor=anchor)
+
+    assert sweep.max_gaps == tuple(sorted(GAPS))
+    for gap in GAPS:
+        assert sweep.result_for(gap) == enrich_runs(runs, index, max_gap=gap, anchor=anchor)
+
+    coverage = sweep.coverage()
+    assert [c.enriched for c in coverage] == sorted(c.enriched for c in coverage)
+    assert all(c.enriched + c.skipped == len(runs) for c in coverage)
+    assert 0 < coverage[0].coverage < coverage[-1].coverage < 1
+
+
+def test_sweep_routes_runs_by_location():
+    t0 = datetime(2026, 2, 1, 10, 0, tzinfo=timezone.utc)
+
+    def obs(location, minutes):
+        return WeatherObs(
+            observed_at=t0 + timedelta(minutes=minutes),
+            temp_c=5.0,
+            wind_mps=1.0,
+            precipitation_mm=0.0,
+            humidity_pct=70.0,
+            location=location,
+        )
+
+    weather = MultiWeatherIndex.from_observations([obs("oslo", 30), obs("rome", 50)])
+    runs = RunBatch(
+        Run(started_at=t0, duration_s=3600, distance_m=5000, location=location)
+        for location in ("oslo", "rome", "lima", None)
+    )
+    metrics = Metrics()
+
+    sweep = sweep_gaps(runs, weather, [timedelta(minutes=10), timedelta(minutes=30)], metrics=metrics)
+
+    for gap in sweep.max_gaps:
+        assert sweep.result_for(gap) == enrich_runs(runs, weather, max_gap=gap)
+    assert sweep.results[0].skip_counts() == {
+        SkipCode.NO_WEATHER_IN_GAP: 1,
+        SkipCode.NO_LOCATION: 1,
+        SkipCode.NO_WEATHER_FOR_LOCATION: 1,
+    }
+    assert set(metrics.report()["stages"]) == {"validate", "align", "partition"}
+
+    # per threshold, the same row and skip counters enrich_runs emits
+    counters = metrics.report()["counters"]
+    assert counters["rows.runs"] == 4
+    for gap, prefix in zip(sweep.max_gaps, ("max_gap.10m.", "max_gap.30m.")):
+        single = Metrics()
+        enrich_runs(runs, weather, max_gap=gap, metrics=single)
+        expected = {k: v for k, v in single.report()["counters"].items() if k != "rows.runs"}
+        assert {k[len(prefix):]: v for k, v in counters.items() if k.startswith(prefix)} == expected
+    assert counters["max_gap.30m.skipped.no_location"] == 1
+
+
+def test_sweep_rejects_empty_or_negative_gaps():
+    with pytest.raises(ValueError):
+        sweep_gaps([], [], [])
+    with pytest.raises(ValueError):
+        sweep_gaps([], [], [timedelta(minutes=-1)])
+
+
+def test_format_coverage_table():
+    runs, weather = synthetic_dataset(20, seed=2)
+    sweep = sweep_gaps(runs, weather, [timedelta(minutes=15), timedelta(minutes=90)])
+
+    lines = format_coverage_table(sweep.coverage())
+
+    assert lines[0].split() == ["max_gap_min", "enriched", "skipped", "coverage"]
+    assert lines[2].split()[0] == "90"
+    assert lines[2].endswith("%")